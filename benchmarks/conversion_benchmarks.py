@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from conversion import load_gesture_config, render_pdf_pages
+from deck import DeckWriter
+from office_worker import OfficeWorker
+
+import synthetic
+from harness import skipped, throughput_result
+
+
+def _timed_runs(fn, runs: int) -> List[float]:
+    """Run ``fn`` ``runs`` times and return each duration in seconds."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def bench_office(workdir: str, config: Dict, sizes, runs: int) -> Dict[str, Dict]:
+    """PPTX to PDF throughput through the LibreOffice worker, in slides per second."""
+    binary = config.get("office_binary", "libreoffice")
+    names = [f"conversion.pptx_to_pdf[slides={size}]" for size in sizes]
+    if shutil.which(binary) is None:
+        return {name: skipped(f"'{binary}' not found") for name in names}
+
+    worker = OfficeWorker(
+        binary=binary,
+        port=config.get("office_port", 2002) + 1,  # stay clear of a running web app's worker
+        profile_dir=os.path.join(workdir, "office_profile"),
+        job_timeout=config.get("office_job_timeout", 60)
+    )
+    results = {}
+    try:
+        # The first job pays for starting LibreOffice; the web app keeps it running
+        warmup = os.path.join(workdir, "warmup.pptx")
+        synthetic.write_pptx(warmup, 1)
+        worker.convert(warmup, os.path.join(workdir, "warmup.pdf"))
+        for name, size in zip(names, sizes):
+            pptx_path = os.path.join(workdir, f"deck_{size}.pptx")
+            synthetic.write_pptx(pptx_path, size)
+            seconds = _timed_runs(lambda: worker.convert(pptx_path, os.path.join(workdir, f"deck_{size}.pdf")), runs)
+            results[name] = throughput_result(size, seconds, "slides/s")
+    finally:
+        worker.stop()
+    return results
+
+
+def bench_render(workdir: str, config: Dict, sizes, runs: int) -> Dict[str, Dict]:
+    """PDF page rasterization throughput (PNG, thumbnail and deck.bin per page), in pages per second."""
+    names = [f"conversion.render[pages={size}]" for size in sizes]
+    missing = synthetic.missing_pdf_tool()
+    if missing is not None:
+        return {name: skipped(f"Poppler's '{missing}' not found") for name in names}
+
+    results = {}
+    for name, size in zip(names, sizes):
+        pdf_path = os.path.join(workdir, f"render_{size}.pdf")
+        synthetic.write_pdf(pdf_path, size)
+        output = os.path.join(workdir, f"render_{size}")
+
+        def render():
+            shutil.rmtree(output, ignore_errors=True)
+            render_pdf_pages(pdf_path, output, config)
+
+        results[name] = throughput_result(size, _timed_runs(render, runs), "pages/s",
+                                          workers=config.get("render_workers") or os.cpu_count())
+    return results
+
+
+def bench_deck_pack(workdir: str, config: Dict, sizes, runs: int) -> Dict[str, Dict]:
+    """Throughput of packing rendered pages into deck.bin at display resolution, in pages per second."""
+    width, height = config.get("width", 1280), config.get("height", 720)
+    # Pages come out of the renderer larger than the display and in RGB
+    page = np.ascontiguousarray(synthetic.slide_image(1600, 900, 1)[..., ::-1])
+    results = {}
+    for size in sizes:
+        path = os.path.join(workdir, f"pack_{size}.bin")
+
+        def pack():
+            deck = DeckWriter(path, size, width, height)
+            for index in range(size):
+                deck.write(index, page)
+            deck.close()
+
+        results[f"conversion.deck_pack[pages={size}]"] = throughput_result(size, _timed_runs(pack, runs), "pages/s")
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    """Run all conversion benchmarks on generated decks and return their results by name."""
+    config = load_gesture_config()
+    sizes = (3, 10) if quick else (5, 20, 50)
+    runs = 1 if quick else 3
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        results.update(bench_office(workdir, config, sizes, runs))
+        results.update(bench_render(workdir, config, sizes, runs))
+        results.update(bench_deck_pack(workdir, config, sizes, runs))
+    return results
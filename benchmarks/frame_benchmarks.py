@@ -0,0 +1,153 @@
+import os
+import time
+import tempfile
+from typing import Dict
+
+import cv2
+import numpy as np
+
+from annotations import AnnotationStore, AnnotationLayer
+from compositor import SlideCompositor
+from gesture import GestureController
+from gesture_table import compile_gestures, fingers_mask, GestureVoter
+from hand_backends import CvzoneBackend, TasksHandLandmarker
+
+import synthetic
+from harness import skipped, time_calls, timing_result
+
+CONFIG_FILE = "config/gesture_config.json"
+WIDTH, HEIGHT = 1280, 720
+
+
+def _controller(workdir: str, stroke_count: int) -> GestureController:
+    """A headless controller on synthetic slides and frames, driven by a scripted hand."""
+    slides = os.path.join(workdir, "slides")
+    frames = os.path.join(workdir, "frames")
+    if not os.path.isdir(slides):
+        synthetic.write_slides(slides, 5, WIDTH, HEIGHT)
+        os.makedirs(frames)
+        cv2.imwrite(os.path.join(frames, "0.png"), synthetic.camera_frame(WIDTH, HEIGHT))
+    overrides = {
+        "width": WIDTH,
+        "height": HEIGHT,
+        "folder_path": slides,
+        "frame_source": {"type": "images", "path": frames, "pacing": "fast"},
+        "headless": True,
+        "output_mode": "window",
+        "metrics_enabled": False,
+        "annotations_path": "",
+        "inference_governor": {"enabled": False},
+    }
+    controller = GestureController(CONFIG_FILE, overrides, detector=synthetic.ScriptedDetector(WIDTH, HEIGHT))
+    for stroke in synthetic.strokes(stroke_count, WIDTH, HEIGHT):
+        controller.annotations.begin_stroke(0)
+        for point in stroke:
+            controller.annotations.add_point((int(point[0]), int(point[1])))
+        controller.annotations.end_stroke()
+    return controller
+
+
+def bench_pipeline(repeat: int, stroke_counts) -> Dict[str, Dict]:
+    """Per-frame cost of ``_process_frame`` (everything but hand inference) on synthetic input."""
+    results = {}
+    frame = synthetic.camera_frame(WIDTH, HEIGHT)
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in stroke_counts:
+            controller = _controller(workdir, count)
+            try:
+                samples = time_calls(lambda: controller._process_frame(frame, time.perf_counter()), repeat, warmup=10)
+            finally:
+                controller.cleanup()
+            results[f"frame.pipeline[strokes={count}]"] = timing_result(samples, width=WIDTH, height=HEIGHT)
+    return results
+
+
+def bench_detector(repeat: int) -> Dict[str, Dict]:
+    """Cost of one hand detection on a synthetic frame with each backend whose model loads."""
+    results = {}
+    frame = synthetic.camera_frame(WIDTH, HEIGHT)
+    for backend in ("cvzone", "mediapipe_tasks"):
+        name = f"frame.detector[backend={backend}]"
+        try:
+            if backend == "cvzone":
+                detector = CvzoneBackend()
+            else:
+                # Video mode blocks for the result, so the call time is the inference time
+                detector = TasksHandLandmarker(running_mode="video")
+        except Exception as e:
+            results[name] = skipped(f"hand detector unavailable: {e}")
+            continue
+        try:
+            samples = time_calls(lambda: detector.findHands(frame, draw=False), repeat)
+        finally:
+            detector.close()
+        results[name] = timing_result(samples, width=WIDTH, height=HEIGHT)
+    return results
+
+
+def bench_gestures(repeat: int) -> Dict[str, Dict]:
+    """Per-frame cost of gesture classification: finger mask, table lookup and vote."""
+    table = compile_gestures({name: fingers for name, fingers in synthetic.GESTURE_CYCLE if name != "none"})
+    voter = GestureVoter()
+    hands = [np.asarray(synthetic.hand(fingers, (640, 360))["lmList"]) for _, fingers in synthetic.GESTURE_CYCLE]
+    batch = hands * 100
+
+    def classify():
+        for lm in batch:
+            voter.update(table[fingers_mask(lm)])
+
+    samples = time_calls(classify, repeat)
+    per_frame = [sample / len(batch) for sample in samples]
+    return {"gesture.classify": timing_result(per_frame, unit="us")}
+
+
+def bench_annotations(repeat: int, stroke_counts) -> Dict[str, Dict]:
+    """Annotation rendering cost at increasing stroke counts."""
+    results = {}
+    base = synthetic.slide_image(WIDTH, HEIGHT, 1)
+    for count in stroke_counts:
+        store = AnnotationStore()
+        for stroke in synthetic.strokes(count, WIDTH, HEIGHT):
+            store.begin_stroke(0)
+            for point in stroke:
+                store.add_point((int(point[0]), int(point[1])))
+            store.end_stroke()
+
+        # Full re-rasterization, as after an erase
+        samples = time_calls(lambda: AnnotationLayer((HEIGHT, WIDTH), (0, 0, 200), 12).sync(store, 0), repeat)
+        results[f"annotations.rasterize[strokes={count}]"] = timing_result(samples, strokes=count)
+
+        # One frame of drawing on top of the existing strokes
+        layer = AnnotationLayer((HEIGHT, WIDTH), (0, 0, 200), 12)
+        compositor = SlideCompositor()
+        compositor.set_base(base, 0)
+        layer.sync(store, 0)
+        compositor.update_annotations(layer)
+        store.begin_stroke(0)
+        step = [0]
+
+        def draw_frame():
+            step[0] += 1
+            angle = step[0] * 0.05
+            point = (int(WIDTH * (0.5 + 0.3 * np.cos(angle))), int(HEIGHT * (0.5 + 0.3 * np.sin(angle))))
+            store.add_point(point)
+            dirty = layer.sync(store, 0)
+            if dirty is not None:
+                compositor.update_annotations(layer, dirty)
+            compositor.compose(((point, 12, (0, 0, 255)),))
+
+        samples = time_calls(draw_frame, repeat)
+        results[f"annotations.draw_frame[strokes={count}]"] = timing_result(samples, strokes=count)
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict]:
+    """Run all frame-loop benchmarks and return their results by name."""
+    repeat = 50 if quick else 300
+    stroke_counts = (10, 100) if quick else (10, 100, 1000)
+    results = {}
+    results.update(bench_pipeline(repeat, (0, 100) if quick else (0, 100, 1000)))
+    results.update(bench_detector(max(10, repeat // 10)))
+    results.update(bench_gestures(max(10, repeat // 10)))
+    results.update(bench_annotations(repeat, stroke_counts))
+    return results
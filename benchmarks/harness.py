@@ -0,0 +1,76 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+LOWER = "lower"
+HIGHER = "higher"
+
+
+def time_calls(fn: Callable[[], object], repeat: int, warmup: int = 3) -> List[float]:
+    """Call ``fn`` ``warmup`` times untimed, then ``repeat`` times, and return each duration in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def timing_result(samples: List[float], unit: str = "ms", **params) -> Dict:
+    """Summarize per-call durations; ``value`` is the median, lower is better."""
+    scale = {"ms": 1e3, "us": 1e6}[unit]
+    values = np.asarray(samples) * scale
+    return {
+        "value": round(float(np.median(values)), 4),
+        "unit": unit,
+        "better": LOWER,
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "min": round(float(values.min()), 4),
+        "runs": len(samples),
+        "params": params,
+    }
+
+
+def throughput_result(items: int, seconds: List[float], unit: str, **params) -> Dict:
+    """Summarize runs that each processed ``items`` items; ``value`` is the median rate, higher is better."""
+    rates = items / np.asarray(seconds)
+    return {
+        "value": round(float(np.median(rates)), 4),
+        "unit": unit,
+        "better": HIGHER,
+        "min": round(float(rates.min()), 4),
+        "runs": len(seconds),
+        "params": dict(params, items=items),
+    }
+
+
+def skipped(reason: str) -> Dict:
+    """A benchmark that could not run here, e.g. because a tool is not installed."""
+    return {"skipped": reason}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float) -> Tuple[List[Dict], List[str]]:
+    """
+    Compare ``results`` with ``baseline`` benchmark by benchmark.
+
+    A benchmark regresses when its value is worse than the baseline's by more than
+    ``threshold`` (a fraction). Returns one row per benchmark present in both, and the
+    names of the regressed ones.
+    """
+    rows, regressions = [], []
+    for name, result in results.items():
+        base: Optional[Dict] = baseline.get(name)
+        if base is None or "skipped" in result or "skipped" in base or not base["value"]:
+            continue
+        change = result["value"] / base["value"] - 1.0
+        worse = change if result["better"] == LOWER else -change
+        regressed = worse > threshold
+        rows.append({"name": name, "baseline": base["value"], "value": result["value"],
+                     "unit": result["unit"], "change": change, "regressed": regressed})
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
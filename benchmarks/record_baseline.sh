@@ -0,0 +1,23 @@
+#!/bin/sh
+# Record benchmarks/baseline.json inside the Docker image, which has the hand landmarker
+# model, LibreOffice and Poppler, so every benchmark gets a value.
+#
+# Usage: benchmarks/record_baseline.sh [extra run.py options]
+set -eu
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+IMAGE="${IMAGE:-handgesture-recognition-bench}"
+THRESHOLD="${THRESHOLD:-0.5}"
+
+docker build -t "$IMAGE" "$ROOT"
+docker run --rm \
+    --user "$(id -u):$(id -g)" \
+    -e HOME=/tmp \
+    -v "$ROOT/benchmarks:/out" \
+    "$IMAGE" \
+    pdm run python benchmarks/run.py \
+        --save-baseline \
+        --threshold "$THRESHOLD" \
+        --baseline /out/baseline.json \
+        --output /out/results/latest.json \
+        "$@"
@@ -0,0 +1,164 @@
+"""
+Offline benchmarks for the per-frame gesture pipeline and slide conversion.
+
+Run from the repository root:
+
+    python benchmarks/run.py                    # run everything, compare with the baseline
+    python benchmarks/run.py --suite frame --quick
+    python benchmarks/run.py --save-baseline    # record this machine's baseline
+    benchmarks/record_baseline.sh               # record the reference baseline in the Docker image
+
+Results are written as JSON to ``--output``. When a baseline exists, every benchmark is
+compared with it and the run exits with status 1 if any got worse by more than
+``--threshold``, which defaults to the threshold stored with the baseline. A benchmark
+that was skipped, here or in the baseline, cannot be compared; that also fails the run
+(and refuses to save a baseline) unless ``--allow-skipped`` is given, so a missing model
+or tool never passes for a clean result.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import platform
+import subprocess
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from harness import compare
+
+SUITES = ("frame", "conversion")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+
+def _git_commit() -> Optional[str]:
+    """Current commit of the working tree, if git is available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=BENCH_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(suites: List[str], quick: bool) -> Dict[str, Dict]:
+    """Run the selected suites and return all results by benchmark name."""
+    import frame_benchmarks
+    import conversion_benchmarks
+    # The controller logs at INFO; keep the report readable
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    for suite in suites:
+        start = time.perf_counter()
+        if suite == "frame":
+            results.update(frame_benchmarks.run(quick))
+        elif suite == "conversion":
+            results.update(conversion_benchmarks.run(quick))
+        print(f"Suite '{suite}' finished in {time.perf_counter() - start:.1f}s")
+    return results
+
+
+def print_results(results: Dict[str, Dict]):
+    """Print one line per benchmark."""
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"  {name:<{width}}  skipped: {result['skipped']}")
+        else:
+            print(f"  {name:<{width}}  {result['value']:>12.4f} {result['unit']}")
+
+
+def print_comparison(rows: List[Dict], threshold: float):
+    """Print the change of every benchmark against the baseline."""
+    if not rows:
+        print("No benchmarks in common with the baseline")
+        return
+    width = max(len(row["name"]) for row in rows)
+    print(f"Compared with the baseline (threshold {threshold:.0%}):")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"  {row['name']:<{width}}  {row['baseline']:>12.4f} -> {row['value']:>12.4f} "
+              f"{row['unit']} ({row['change']:+.1%}){flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks; returns the process exit status."""
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline and slide conversion")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Suite to run (repeatable); default: all")
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions and smaller inputs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float,
+                        help="Fail when a benchmark is worse than the baseline by more than this fraction "
+                             f"(default: the baseline's own threshold, or {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--allow-skipped", action="store_true",
+                        help="Accept benchmarks that could not run here or in the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.suite or list(SUITES), args.quick)
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "host": socket.gethostname(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    print_results(results)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    skipped_here = [name for name, result in results.items() if "skipped" in result]
+    if args.save_baseline:
+        if skipped_here and not args.allow_skipped:
+            print(f"Not saving a baseline with {len(skipped_here)} skipped benchmark(s): {', '.join(skipped_here)}")
+            print("Install the missing tools (the Docker image has them) or pass --allow-skipped")
+            return 1
+        report["threshold"] = args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold", DEFAULT_THRESHOLD)
+    if baseline["meta"].get("quick") != args.quick:
+        print("Note: the baseline was recorded with" + ("" if baseline["meta"].get("quick") else "out") +
+              " --quick; its inputs differ from this run's")
+    rows, regressions = compare(results, baseline["results"], threshold)
+    print_comparison(rows, threshold)
+    uncompared = len(results) - len(rows) - len(skipped_here)
+    print(f"Compared {len(rows)} of {len(results)} benchmarks; {len(skipped_here)} skipped in this run, "
+          f"{uncompared} skipped or missing in the baseline")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    if len(rows) < len(results) and not args.allow_skipped:
+        print("Some benchmarks were not compared; pass --allow-skipped to accept that")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import os
+import math
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from gesture_table import fingers_mask, mask_to_fingers
+
+# Finger patterns the scripted hand cycles through, with the config's default gestures
+GESTURE_CYCLE = (
+    ("draw", [0, 1, 0, 0, 0]),
+    ("pointer", [0, 1, 1, 0, 0]),
+    ("none", [0, 0, 0, 0, 0]),
+)
+
+
+def camera_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """A camera-like BGR frame: a lit gradient background with sensor noise."""
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(60, 180, width, dtype=np.float32)
+    frame = np.repeat(ramp[None, :, None], height, axis=0).repeat(3, axis=2)
+    frame += rng.normal(0, 6, frame.shape).astype(np.float32)
+    cv2.circle(frame, (width // 3, height // 2), height // 4, (90, 120, 200), cv2.FILLED)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def slide_image(width: int, height: int, number: int) -> np.ndarray:
+    """A slide-like BGR image: white page, title bar, bullet lines and a chart."""
+    img = np.full((height, width, 3), 255, dtype=np.uint8)
+    cv2.rectangle(img, (0, 0), (width, height // 8), (120, 60, 20), cv2.FILLED)
+    cv2.putText(img, f"Slide {number}", (width // 20, height // 12), cv2.FONT_HERSHEY_SIMPLEX,
+                height / 400, (255, 255, 255), 2)
+    for line in range(6):
+        y = height // 4 + line * height // 12
+        cv2.circle(img, (width // 16, y - 8), 6, (60, 60, 60), cv2.FILLED)
+        cv2.putText(img, f"Bullet point {line + 1} of slide {number}", (width // 10, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, height / 900, (40, 40, 40), 2)
+    for bar in range(5):
+        x = width * 11 // 20 + bar * width // 14
+        top = height * (7 - (bar + number) % 5) // 10
+        cv2.rectangle(img, (x, top), (x + width // 20, height * 9 // 10), (40 + 40 * bar, 140, 220), cv2.FILLED)
+    return img
+
+
+def write_slides(folder: str, count: int, width: int, height: int) -> List[str]:
+    """Write ``count`` slides as ``<n>.png`` into ``folder``, the layout the controller reads."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for number in range(1, count + 1):
+        path = os.path.join(folder, f"{number}.png")
+        cv2.imwrite(path, slide_image(width, height, number))
+        paths.append(path)
+    return paths
+
+
+def hand(fingers: List[int], center: Tuple[int, int], size: int = 120) -> Dict:
+    """
+    A cvzone-style right hand at ``center`` with the given ``[thumb, index, ...]`` fingers raised.
+
+    Only the joints the gesture table compares are placed meaningfully; the rest sit on the palm.
+    """
+    cx, cy = center
+    lm = np.tile([cx, cy, 0], (21, 1))
+    lm[3] = [cx - size // 3, cy, 0]
+    lm[4] = [cx - size // 2 + (size if fingers[0] else 0), cy, 0]
+    for finger, tip in enumerate((8, 12, 16, 20), start=1):
+        x = cx - size // 4 + (finger - 1) * size // 6
+        lm[tip - 2] = [x, cy - size // 3, 0]
+        lm[tip - 1] = [x, cy - size // 2 if fingers[finger] else cy - size // 4, 0]
+        lm[tip] = [x, cy - size if fingers[finger] else cy - size // 5, 0]
+    return {
+        "lmList": lm.tolist(),
+        "bbox": (cx - size // 2, cy - size, size, size + size // 2),
+        "center": (cx, cy),
+        "type": "Right",
+    }
+
+
+class ScriptedDetector:
+    """
+    Stand-in for cvzone's ``HandDetector`` that replays a synthetic hand.
+
+    The hand circles through the upper-right quadrant (the drawing area) and cycles through
+    drawing, pointing and no hand every ``phase_frames`` calls, so the per-frame benchmark
+    exercises annotation and pointer paths without a model or a camera.
+    """
+
+    def __init__(self, width: int, height: int, phase_frames: int = 60):
+        self.width = width
+        self.height = height
+        self.phase_frames = phase_frames
+        self.calls = 0
+
+    def findHands(self, img: np.ndarray, draw: bool = True, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        self.calls += 1
+        name, fingers = GESTURE_CYCLE[(self.calls // self.phase_frames) % len(GESTURE_CYCLE)]
+        if name == "none":
+            return [], img
+        angle = self.calls * 0.1
+        center = (int(self.width * (0.75 + 0.15 * math.cos(angle))),
+                  int(self.height * (0.45 + 0.2 * math.sin(angle))))
+        return [hand(fingers, center)], img
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        return mask_to_fingers(fingers_mask(np.asarray(hand["lmList"]), hand["type"]))
+
+
+def strokes(count: int, width: int, height: int, points: int = 24, seed: int = 0) -> List[np.ndarray]:
+    """``count`` random wavy strokes of ``points`` points each, as int16 (N, 2) arrays."""
+    rng = np.random.default_rng(seed)
+    result = []
+    for _ in range(count):
+        x0, y0 = rng.integers(0, width - 200), rng.integers(0, height - 100)
+        t = np.linspace(0, 1, points)
+        xs = x0 + 200 * t
+        ys = y0 + 50 + 40 * np.sin(t * 6 + rng.random() * 6)
+        result.append(np.stack([xs, ys], axis=1).astype(np.int16))
+    return result
+
+
+def write_pptx(path: str, slides: int):
+    """Write a PPTX of ``slides`` slides with a title, bullets and a shape each."""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    presentation = Presentation()
+    presentation.slide_width, presentation.slide_height = Inches(13.333), Inches(7.5)
+    layout = presentation.slide_layouts[1]
+    for number in range(1, slides + 1):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Benchmark slide {number}"
+        body = slide.placeholders[1].text_frame
+        body.text = f"Bullet 1 of slide {number}"
+        for line in range(2, 6):
+            body.add_paragraph().text = f"Bullet {line} of slide {number}"
+        slide.shapes.add_shape(1, Inches(9), Inches(2), Inches(3), Inches(3))
+    presentation.save(path)
+
+
+def write_pdf(path: str, pages: int, width: int = 1280, height: int = 720, dpi: float = 96.0):
+    """Write a PDF of ``pages`` raster slide pages (16:9 at ``dpi``) with Pillow."""
+    from PIL import Image
+
+    images = [Image.fromarray(slide_image(width, height, number)[..., ::-1]) for number in range(1, pages + 1)]
+    images[0].save(path, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+    for image in images:
+        image.close()
+
+
+def missing_pdf_tool() -> Optional[str]:
+    """Name of the missing Poppler tool needed to rasterize PDFs, or None when it is installed."""
+    from shutil import which
+
+    for tool in ("pdfinfo", "pdftocairo"):
+        if which(tool) is None:
+            return tool
+    return None
@@ -1,120 +1,83 @@
 # Import necessary libraries
 import streamlit as st
 import os
+import json
 import subprocess
 import sys
 from pathlib import Path
-import tempfile
 import shutil
+import time
 
 # Add src directory to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
-def convert_pptx_to_pdf(pptx_path, pdf_path):
-    """Convert PowerPoint presentation to PDF using LibreOffice."""
-    try:
-        # Use LibreOffice to convert PPTX to PDF
-        cmd = [
-            'libreoffice', 
-            '--headless', 
-            '--convert-to', 'pdf', 
-            '--outdir', 'data/slides/pdf',
-            pptx_path
-        ]
-        
-        st.info("🔄 Converting PPTX to PDF using LibreOffice...")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        
-        if result.returncode == 0:
-            # LibreOffice saves with the same name but .pdf extension in the output dir
-            pdf_basename = os.path.splitext(os.path.basename(pptx_path))[0] + ".pdf"
-            expected_pdf = os.path.join("data/slides/pdf", pdf_basename)
-            if os.path.exists(expected_pdf):
-                # Move to our desired location
-                shutil.move(expected_pdf, pdf_path)
-                st.success("✅ PPTX converted to PDF successfully!")
-                return True
-            else:
-                st.error(f"❌ PDF file not found at expected location: {expected_pdf}")
-                return False
-        else:
-            st.error(f"❌ LibreOffice conversion failed: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        st.error("❌ LibreOffice conversion timed out")
-        return False
-    except Exception as e:
-        st.error(f"❌ Error converting PPTX to PDF: {e}")
-        return False
+from conversion import build_preview, load_gesture_config
+from conversion_cache import ConversionCache
+from conversion_jobs import ConversionQueue
+from control import ControlClient, DEFAULT_SOCKET_PATH
+from deck import DECK_FILE, DECK_META, THUMBS_DIR, available_pages, read_deck_meta
+from office_worker import OfficeWorker
+from slide_fingerprints import match_slides
 
-def convert_pdf_to_images(pdf_path, output_folder):
-    """Convert PDF to PNG images using pdf2image."""
-    try:
-        from pdf2image import convert_from_path
-        
-        st.info("🔄 Converting PDF to images...")
-        
-        # Check if PDF exists
-        if not os.path.exists(pdf_path):
-            st.error(f"PDF file '{pdf_path}' not found!")
-            return False
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(output_folder, exist_ok=True)
+PREVIEW_COLUMNS = 4
+# Fixed paths used before conversions got their own job folders
+LEGACY_PPTX_PATH = "data/pptx/uploaded_presentation.pptx"
+LEGACY_PDF_PATH = "data/slides/pdf/uploaded_presentation.pdf"
+LEGACY_IMAGES_DIR = "data/slides/images"
 
-        # Convert PDF to images
-        images = convert_from_path(
-            pdf_path,
-            dpi=200,
-            use_cropbox=False,
-            use_pdftocairo=True
-        )
-        
-        # Save each page as an image
-        for i, image in enumerate(images):
-            image_path = os.path.join(output_folder, f"{i + 1}.png")
-            image.save(image_path, "PNG")
-        
-        # Count the generated images
-        image_files = [f for f in os.listdir(output_folder) 
-                     if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-        st.success(f"✅ Converted PDF to {len(image_files)} images")
-        return True
-        
-    except Exception as e:
-        st.error(f"❌ Error converting PDF to images: {e}")
-        return False
+@st.cache_resource
+def get_office_worker():
+    """Return the warm LibreOffice worker shared across reruns and sessions."""
+    config = load_gesture_config()
+    return OfficeWorker(
+        binary=config.get("office_binary", "libreoffice"),
+        port=config.get("office_port", 2002),
+        profile_dir=config.get("office_profile_dir", "data/cache/office_profile"),
+        job_timeout=config.get("office_job_timeout", 60)
+    )
+
+def get_conversion_cache():
+    """Return the conversion cache configured in gesture_config.json."""
+    config = load_gesture_config()
+    return ConversionCache(
+        config.get("conversion_cache_dir", "data/cache/conversions"),
+        int(config.get("conversion_cache_mb", 1024) * 1024 * 1024)
+    )
 
-def convert_ppt_to_png(pptx_path, output_folder):
-    """Convert PowerPoint presentation to PNG images using new workflow."""
+@st.cache_resource
+def get_conversion_queue():
+    """Return the background conversion queue shared across reruns and sessions."""
+    config = load_gesture_config()
+    return ConversionQueue(
+        get_office_worker(),
+        get_conversion_cache(),
+        config,
+        root=config.get("conversion_jobs_dir", "data/jobs"),
+        max_workers=config.get("conversion_workers", 2),
+        retention=config.get("conversion_job_retention_hours", 24) * 3600,
+        max_finished=config.get("conversion_job_limit", 20),
+        in_use=presented_decks
+    )
+
+def presented_decks():
+    """The deck the controller daemon is presenting, so its job folder is never deleted."""
+    client = get_controller_client()
     try:
-        # Create temporary directory for intermediate files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Step 1: Convert PPTX to PDF
-            pdf_path = os.path.join(temp_dir, "presentation.pdf")
-            if not convert_pptx_to_pdf(pptx_path, pdf_path):
-                return False
-            
-            # Step 2: Convert PDF to PNG images
-            if not convert_pdf_to_images(pdf_path, output_folder):
-                return False
-            
-            return True
-            
-    except Exception as e:
-        st.error(f"❌ Error in conversion workflow: {e}")
-        return False
+        deck = client.request("status")["deck"]
+    except (OSError, RuntimeError, ValueError):
+        return set()
+    return {deck} if deck else set()
 
 def cleanup_presentation_files(pptx_path=None, pdf_path=None):
     """Clean up presentation files after completion."""
     try:
         # Clean up images directory
-        images_dir = "data/slides/images"
+        images_dir = LEGACY_IMAGES_DIR
         if os.path.exists(images_dir):
             for file in os.listdir(images_dir):
-                if file.lower().endswith((".png", ".jpg", ".jpeg")):
+                if file.lower().endswith((".png", ".jpg", ".jpeg")) or file in (DECK_FILE, DECK_META):
                     os.remove(os.path.join(images_dir, file))
+            shutil.rmtree(os.path.join(images_dir, THUMBS_DIR), ignore_errors=True)
             st.success("🧹 Cleaned up presentation images")
         
         # Ask user about PPTX file cleanup
@@ -144,6 +107,62 @@ def cleanup_presentation_files(pptx_path=None, pdf_path=None):
         st.error(f"❌ Error during cleanup: {e}")
         return False
 
+def get_controller_client():
+    """Return a client for the gesture controller daemon's control socket."""
+    config = load_gesture_config()
+    return ControlClient(config.get("control_socket", DEFAULT_SOCKET_PATH))
+
+def ensure_controller():
+    """Return a client for the controller daemon, starting the daemon if it is not running."""
+    client = get_controller_client()
+    if client.alive():
+        return client
+    process = subprocess.Popen(
+        ["python", "src/gesture.py", "--daemon"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    # The first start pays for loading the hand model and opening the camera
+    deadline = time.time() + load_gesture_config().get("controller_start_timeout", 30)
+    while time.time() < deadline:
+        if client.alive():
+            return client
+        if process.poll() is not None:
+            raise RuntimeError(f"Gesture controller exited with code {process.returncode}")
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Timed out waiting for the gesture controller to start")
+
+def mjpeg_url(path):
+    """URL of the controller's MJPEG server as seen from the browser."""
+    config = load_gesture_config()
+    host = config.get("mjpeg_host", "127.0.0.1")
+    if host in ("0.0.0.0", "127.0.0.1"):
+        host = "localhost"
+    return f"http://{host}:{config.get('mjpeg_port', 8090)}/{path}"
+
+def get_deck_meta(images_dir):
+    """Return the current deck's metadata, building previews for slides converted without them."""
+    meta = read_deck_meta(images_dir)
+    if meta is not None:
+        return meta
+    if not os.path.isdir(images_dir) or not any(
+        f.lower().endswith((".png", ".jpg", ".jpeg")) for f in os.listdir(images_dir)
+    ):
+        return None
+    return build_preview(images_dir, load_gesture_config())
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_slide_thumbnails(images_dir, deck_id, available):
+    """Read the thumbnails of a deck's first ``available`` slides once; reruns reuse the cached bytes."""
+    meta = read_deck_meta(images_dir) or {}
+    thumbnails = []
+    for thumb in meta.get("thumbnails", [])[:available]:
+        with open(os.path.join(images_dir, thumb), "rb") as f:
+            thumbnails.append(f.read())
+    return thumbnails
+
 def main():
     """Main Streamlit application."""
     
@@ -154,6 +173,9 @@ def main():
         layout="wide"
     )
     
+    # Create the shared LibreOffice worker up front, so a missing UNO bridge is reported once at startup
+    get_office_worker()
+    
     # Header
     st.title("🎤 HandGesture Recognition")
     st.subheader("Control Presentations with Hand Gestures")
@@ -168,6 +190,9 @@ def main():
     if st.sidebar.button("🎮 Gesture Control", use_container_width=True):
         st.session_state.page = "Gesture Control"
     
+    if st.sidebar.button("📈 Performance", use_container_width=True):
+        st.session_state.page = "Performance"
+    
     if st.sidebar.button("⚙️ Settings", use_container_width=True):
         st.session_state.page = "Settings"
     
@@ -179,16 +204,103 @@ def main():
         upload_and_convert_page()
     elif st.session_state.page == "Gesture Control":
         gesture_control_page()
+    elif st.session_state.page == "Performance":
+        performance_page()
     elif st.session_state.page == "Settings":
         settings_page()
 
+def startup_summary(startup):
+    """One line with the controller's startup timings."""
+    parts = [f"imports {startup['imports_ms']:.0f} ms"] if startup.get("imports_ms") is not None else []
+    parts += [f"{name.replace('_', ' ')} {phase['duration_ms']:.0f} ms" for name, phase in startup["phases"].items()]
+    line = f"⏱️ Startup: {', '.join(parts)}; ready in {startup['ready_ms']:.0f} ms"
+    if startup.get("first_frame_ms") is not None:
+        line += f", first frame {startup['first_frame_ms']:.0f} ms after start"
+    return line
+
+def conversion_jobs_panel():
+    """Show this session's conversion jobs, polling while any of them is still running."""
+    jobs = [job for job in map(get_conversion_queue().get, st.session_state.conversion_jobs) if job]
+    if not jobs:
+        return
+    polling = any(job.active for job in jobs)
+
+    @st.fragment(run_every=1.0 if polling else None)
+    def panel():
+        conversion_queue = get_conversion_queue()
+        st.subheader("🗂️ Conversions")
+        for job in jobs:
+            if job.status == "done":
+                source = "cache hit" if job.cache_hit else "converted"
+                if job.pages_reused:
+                    source += f", {job.pages_reused} unchanged"
+                st.progress(1.0, text=f"✅ {job.name}: {job.page_count} slides ({source})")
+                # Switch to a deck as soon as its conversion finishes
+                if st.session_state.get("auto_activate") == job.id:
+                    st.session_state.auto_activate = None
+                    st.session_state.deck_dir = job.images_dir
+                    update_presented_deck(job.images_dir)
+                    st.rerun()
+                use, discard = st.columns(2)
+                with use:
+                    if st.button("▶️ Use this deck", key=f"use_{job.id}",
+                                 disabled=st.session_state.deck_dir == job.images_dir):
+                        st.session_state.deck_dir = job.images_dir
+                        st.rerun()
+                with discard:
+                    if st.button("🗑️ Discard", key=f"discard_{job.id}"):
+                        discard_job(job.id)
+                        st.rerun()
+            elif job.status == "failed":
+                st.error(f"❌ {job.name}: {job.error}")
+                if st.button("🗑️ Dismiss", key=f"discard_{job.id}"):
+                    discard_job(job.id)
+                    st.rerun()
+            else:
+                pages = f" ({job.pages_done}/{job.page_count} pages)" if job.page_count else ""
+                st.progress(job.progress, text=f"🔄 {job.name}: {job.status}{pages}")
+                # Presenting can start on the first slides while the rest are still rendering
+                if (st.session_state.get("auto_activate") == job.id
+                        and st.session_state.deck_dir != job.images_dir
+                        and available_pages(read_deck_meta(job.images_dir) or {"complete": False}) > 0):
+                    st.session_state.deck_dir = job.images_dir
+                    st.rerun()
+        # Rerun the whole page once the last job finishes so the deck becomes usable
+        if polling and not any(conversion_queue.get(job.id).active for job in jobs):
+            st.rerun()
+
+    panel()
+
+def update_presented_deck(images_dir):
+    """Hand a re-uploaded version of the deck being presented to the controller, which keeps its place."""
+    client = get_controller_client()
+    try:
+        status = client.request("status")
+        if status["paused"] or status["deck"] in (None, os.path.abspath(images_dir)):
+            return
+        if match_slides(read_deck_meta(status["deck"]), read_deck_meta(images_dir)):
+            client.request("load", path=os.path.abspath(images_dir))
+    except (OSError, RuntimeError):
+        pass
+
+def discard_job(job_id):
+    """Delete a finished conversion job and forget it in this session."""
+    job = get_conversion_queue().get(job_id)
+    if job is not None and st.session_state.deck_dir == job.images_dir:
+        st.session_state.deck_dir = LEGACY_IMAGES_DIR
+    get_conversion_queue().discard(job_id)
+    st.session_state.conversion_jobs.remove(job_id)
+
 def upload_and_convert_page():
     """Page for uploading and converting presentations."""
     st.header("📤 Upload & Convert Presentation")
-    # Define paths at the top for DRYness
-    pptx_path = "data/pptx/uploaded_presentation.pptx"
-    pdf_path = "data/slides/pdf/uploaded_presentation.pdf"
-    images_dir = "data/slides/images"
+    # Each session presents the deck it picked; conversions live in per-job folders
+    if 'conversion_jobs' not in st.session_state:
+        st.session_state.conversion_jobs = []
+    # A job folder may have expired since this session picked it
+    if 'deck_dir' not in st.session_state or not os.path.isdir(st.session_state.deck_dir):
+        st.session_state.deck_dir = LEGACY_IMAGES_DIR
+    images_dir = st.session_state.deck_dir
     # File upload for presentation
     uploaded_file = st.file_uploader(
         "Upload Presentation File (PPTX)", 
@@ -200,41 +312,41 @@ def upload_and_convert_page():
         # Convert slides button
         if st.button("🔄 Convert Slides", type="primary"):
             if uploaded_file is not None:
-                os.makedirs("data/pptx", exist_ok=True)
-                os.makedirs("data/slides/pdf", exist_ok=True)
-                with open(pptx_path, "wb") as pptx_file:
-                    pptx_file.write(uploaded_file.read())
-                # Convert PPTX to images
-                output_folder = images_dir
-                if convert_ppt_to_png(pptx_path, output_folder):
-                    st.success("✅ Slides converted successfully!")
-                    st.info("💡 You can now use gesture control to navigate through the slides.")
+                # Conversion runs in the background; the page polls its progress below
+                job_id = get_conversion_queue().submit(uploaded_file.name, uploaded_file.getvalue())
+                st.session_state.conversion_jobs.append(job_id)
+                st.session_state.auto_activate = job_id
+                st.success(f"📥 Queued '{uploaded_file.name}' for conversion.")
             else:
                 st.warning("⚠️ Please upload a presentation file first.")
+    # One small metadata read per rerun instead of listing the images folder
+    deck_meta = get_deck_meta(images_dir)
     with col2:
         start, stop = st.columns(2)
-        # Track process state in session_state
-        if 'gesture_process' not in st.session_state:
-            st.session_state.gesture_process = None
-        # Status indicator
-        if st.session_state.gesture_process is not None and st.session_state.gesture_process.poll() is None:
-            st.success("Gesture controller is running.")
-            process_running = True
-        else:
-            process_running = False
-            st.session_state.gesture_process = None
+        # The controller daemon stays resident; Start/Stop only resume and pause it
+        client = get_controller_client()
+        try:
+            status = client.request("status")
+        except (OSError, RuntimeError):
+            status = None
+        process_running = status is not None and not status["paused"]
+        if process_running:
+            rate = status.get("detection_rate")
+            detection = f", hand detection at {rate:.1f}/s" if rate is not None else ""
+            rendering = " (more rendering)" if not status.get("deck_complete", True) else ""
+            st.success(f"Gesture controller is running: slide {status['slide']}/{status['slide_count']}{rendering}, "
+                       f"{status['fps']:.1f} fps{detection}.")
+        if status is not None and status.get("startup"):
+            st.caption(startup_summary(status["startup"]))
         with start:
             if st.button("🎮 Start Gesture Control", disabled=process_running):
-                if os.path.exists(images_dir) and len(os.listdir(images_dir)) > 0:
+                if deck_meta is not None and available_pages(deck_meta) > 0:
                     st.info("🚀 Starting gesture controller...")
                     try:
-                        process = subprocess.Popen(
-                            ["python", "src/gesture.py"], 
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                            start_new_session=True
-                        )
-                        st.session_state.gesture_process = process
+                        client = ensure_controller()
+                        if client.request("status")["deck"] != os.path.abspath(images_dir):
+                            client.request("load", path=os.path.abspath(images_dir))
+                        client.request("start")
                         st.success("✅ Gesture controller started in background!")
                     except Exception as e:
                         st.error(f"❌ Failed to start gesture controller: {e}")
@@ -242,42 +354,53 @@ def upload_and_convert_page():
                     st.warning("⚠️ Please convert slides first before starting gesture control.")
         with stop:
             if st.button("🛑 Stop Presenting", type="secondary", disabled=not process_running):
-                st.info("Attempting to stop gesture controller and clean up camera...")
                 try:
-                    if st.session_state.gesture_process is not None:
-                        st.session_state.gesture_process.terminate()
-                        st.session_state.gesture_process = None
-                    if sys.platform.startswith('linux') or sys.platform == 'darwin':
-                        subprocess.run("pkill -f 'python.*gesture.py'", shell=True)
-                        subprocess.run("fuser -k /dev/video0", shell=True)
-                    elif sys.platform == 'win32':
-                        subprocess.run("taskkill /F /IM python.exe /T", shell=True)
-                    st.success("🛑 Presentation stopped. Camera and windows cleaned up.")
+                    client.request("pause")
+                    st.success("🛑 Presentation paused. The controller stays warm for the next start.")
                 except Exception as e:
                     st.error(f"Error stopping presentation: {e}")
+        if process_running and load_gesture_config().get("output_mode", "window") in ("mjpeg", "both"):
+            with st.expander("📺 Live slide view", expanded=True):
+                st.markdown(f'<img src="{mjpeg_url("slides.mjpg")}" style="width:100%">', unsafe_allow_html=True)
+        if process_running:
+            previous, following, reset = st.columns(3)
+            for column, label, cmd in ((previous, "⬅️ Previous", "prev"), (following, "➡️ Next", "next"),
+                                       (reset, "🧽 Reset annotations", "reset")):
+                with column:
+                    if st.button(label, key=f"remote_{cmd}"):
+                        client.request(cmd)
+    conversion_jobs_panel()
     # Cleanup section
     st.markdown("---")
     st.subheader("🧹 Cleanup After Presentation")
-    if os.path.exists(images_dir) and len(os.listdir(images_dir)) > 0:
+    if deck_meta is not None:
         st.info("💡 After your presentation is complete, you can clean up the files:")
         if st.button("🧹 Clean Up Files", type="primary"):
-            cleanup_presentation_files(pptx_path, pdf_path)
+            job = next((job for job in get_conversion_queue().jobs() if job.images_dir == images_dir), None)
+            if job is not None:
+                # A converted deck lives in its job folder together with its upload and PDF
+                discard_job(job.id)
+                st.success("🧹 Removed the presentation, its PDF and slide images")
+                deck_meta = None
+            else:
+                cleanup_presentation_files(LEGACY_PPTX_PATH, LEGACY_PDF_PATH)
+                deck_meta = read_deck_meta(images_dir)
     else:
         st.info("💡 No presentation files to clean up yet.")
-    # Display current slides
-    if os.path.exists(images_dir):
-        slides_count = len([f for f in os.listdir(images_dir) 
-                          if f.lower().endswith((".png", ".jpg", ".jpeg"))])
-        if slides_count > 0:
-            st.subheader(f"📊 Current Slides ({slides_count} total)")
-            # Show first few slides as preview
-            slide_files = sorted([f for f in os.listdir(images_dir) 
-                                if f.lower().endswith((".png", ".jpg", ".jpeg"))])
-            cols = st.columns(min(3, len(slide_files)))
-            for i, slide_file in enumerate(slide_files[:3]):
-                with cols[i]:
-                    slide_path = os.path.join(images_dir, slide_file)
-                    st.image(slide_path, caption=f"Slide {i+1}", use_container_width=True)
+    # Display current slides as a scrollable grid of thumbnails
+    if deck_meta is not None and deck_meta["page_count"] > 0:
+        available = available_pages(deck_meta)
+        if available < deck_meta["page_count"]:
+            st.subheader(f"📊 Current Slides ({available} of {deck_meta['page_count']} ready)")
+        else:
+            st.subheader(f"📊 Current Slides ({deck_meta['page_count']} total)")
+        thumbnails = load_slide_thumbnails(images_dir, deck_meta["deck_id"], available)
+        with st.container(height=480):
+            for row in range(0, len(thumbnails), PREVIEW_COLUMNS):
+                cols = st.columns(PREVIEW_COLUMNS)
+                for i, thumbnail in enumerate(thumbnails[row:row + PREVIEW_COLUMNS]):
+                    with cols[i]:
+                        st.image(thumbnail, caption=f"Slide {row + i + 1}", use_container_width=True)
 
 def gesture_control_page():
     """Page for gesture control information."""
@@ -299,7 +422,7 @@ def gesture_control_page():
     ### Keyboard Shortcuts
     
     - `q`: Quit the application
-    - `r`: Reset all annotations
+    - `r`: Reset annotations on the current slide
     - `n`: Next slide
     - `p`: Previous slide
     
@@ -312,6 +435,44 @@ def gesture_control_page():
     5. **Position**: Keep hand above the green threshold line
     """)
 
+def performance_page():
+    """Page showing the gesture controller's frame-loop metrics."""
+    st.header("📈 Performance")
+    
+    metrics_path = "data/metrics/gesture_metrics.json"
+    if os.path.exists("config/gesture_config.json"):
+        with open("config/gesture_config.json", "r") as f:
+            metrics_path = json.load(f).get("metrics_path", metrics_path)
+    
+    if not os.path.exists(metrics_path):
+        st.info("💡 No metrics yet. Start gesture control to collect frame timings.")
+        return
+    
+    with open(metrics_path, "r") as f:
+        metrics = json.load(f)
+    
+    age = time.time() - metrics.get("timestamp", 0)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("FPS", f"{metrics.get('fps', 0):.1f}")
+    col2.metric("Frames", metrics.get("frames", 0))
+    col3.metric("Glass-to-slide p95", f"{metrics['end_to_end']['p95_ms']:.1f} ms")
+    col4.metric("Last update", f"{age:.0f} s ago")
+    
+    st.subheader("Per-stage latency (ms)")
+    rows = [
+        {"stage": name, **{k: round(v, 2) for k, v in summary.items()}}
+        for name, summary in metrics.get("stages", {}).items()
+    ]
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    
+    for name in ("startup", "pipeline", "slide_cache", "detector", "inference_governor"):
+        if name in metrics:
+            st.subheader(name.replace("_", " ").title())
+            st.json(metrics[name])
+    
+    if st.button("🔄 Refresh"):
+        st.rerun()
+
 def settings_page():
     """Page for configuration settings."""
     st.header("⚙️ Settings")
@@ -320,11 +481,23 @@ def settings_page():
     
     if os.path.exists("config/gesture_config.json"):
         with open("config/gesture_config.json", "r") as f:
-            import json
             config = json.load(f)
         
         st.json(config)
         
+        st.subheader("LibreOffice Worker")
+        st.json(get_office_worker().status())
+        
+        st.subheader("Gesture Controller")
+        client = get_controller_client()
+        try:
+            st.json(client.request("status"))
+            if st.button("⏹️ Shut Down Controller"):
+                client.request("quit")
+                st.success("Controller is shutting down; the camera is released.")
+        except (OSError, RuntimeError):
+            st.info("💤 The controller is not running. It starts with the first presentation.")
+        
         if st.button("📝 Edit Configuration"):
             st.info("💡 Edit the config/gesture_config.json file to customize settings.")
     else:
@@ -0,0 +1,343 @@
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def simplify_stroke(points: np.ndarray, epsilon: float) -> np.ndarray:
+    """Simplify a polyline with the Ramer-Douglas-Peucker algorithm."""
+    if epsilon <= 0 or len(points) < 3:
+        return points
+
+    pts = points.astype(np.float32)
+    keep = np.zeros(len(pts), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(pts) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = pts[start], pts[end]
+        inner = pts[start + 1:end]
+        dx, dy = b - a
+        norm = np.hypot(dx, dy)
+        if norm == 0:
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > epsilon:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+class _SlideStrokes:
+    """Finished strokes of one slide: one int16 point buffer plus stroke offsets."""
+
+    def __init__(self, points: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None):
+        if points is None:
+            points = np.empty((0, 2), dtype=np.int16)
+            offsets = np.zeros(1, dtype=np.int32)
+        self.points = np.ascontiguousarray(points, dtype=np.int16)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int32)
+        self.count = len(self.points)
+
+    def append(self, stroke: np.ndarray):
+        """Append a finished stroke, growing the point buffer geometrically."""
+        needed = self.count + len(stroke)
+        if needed > len(self.points):
+            grown = np.empty((max(needed, 2 * len(self.points), 64), 2), dtype=np.int16)
+            grown[:self.count] = self.points[:self.count]
+            self.points = grown
+        self.points[self.count:needed] = stroke
+        self.count = needed
+        self.offsets = np.append(self.offsets, np.int32(needed))
+
+    def pop(self) -> bool:
+        """Remove the last stroke."""
+        if len(self.offsets) <= 1:
+            return False
+        self.offsets = self.offsets[:-1]
+        self.count = int(self.offsets[-1])
+        return True
+
+    def strokes(self, start: int = 0) -> List[np.ndarray]:
+        """Return views of the strokes from index ``start`` on, in drawing order."""
+        return [self.points[self.offsets[i]:self.offsets[i + 1]] for i in range(start, len(self.offsets) - 1)]
+
+    def compact(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return trimmed copies of the point buffer and offsets."""
+        return self.points[:self.count].copy(), self.offsets.copy()
+
+
+class AnnotationStore:
+    """
+    Per-slide annotation strokes backed by contiguous NumPy arrays.
+
+    Points are decimated by distance while a stroke is drawn and the finished stroke is
+    simplified with Ramer-Douglas-Peucker, so long drawing sessions stay small.
+    """
+
+    def __init__(self, min_distance: float = 4.0, epsilon: float = 1.5):
+        """Create an empty store with the given decimation and simplification tolerances."""
+        self.min_distance = min_distance
+        self.epsilon = epsilon
+        self._slides: Dict[int, _SlideStrokes] = {}
+        self._revisions: Dict[int, int] = {}
+        self._generation = 0
+
+        self._active = np.empty((256, 2), dtype=np.int16)
+        self._active_len = 0
+        self._active_slide: Optional[int] = None
+
+    @property
+    def drawing(self) -> bool:
+        """Whether a stroke is currently in progress."""
+        return self._active_slide is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored point and offset buffers."""
+        return sum(s.points.nbytes + s.offsets.nbytes for s in self._slides.values()) + self._active.nbytes
+
+    def revision(self, slide: int) -> Tuple[int, int]:
+        """
+        Return a token that changes whenever strokes on ``slide`` are removed.
+
+        Adding points never changes the revision, so renderers can draw new segments
+        incrementally and re-rasterize only when the revision moves.
+        """
+        return self._generation, self._revisions.get(slide, 0)
+
+    def _bump(self, slide: int):
+        """Record a destructive edit on ``slide``."""
+        self._revisions[slide] = self._revisions.get(slide, 0) + 1
+
+    def begin_stroke(self, slide: int):
+        """Start a new stroke on ``slide``, finishing any stroke in progress."""
+        self.end_stroke()
+        self._active_slide = slide
+        self._active_len = 0
+
+    def add_point(self, point: Tuple[int, int]) -> bool:
+        """
+        Add a point to the stroke in progress.
+
+        Points closer than ``min_distance`` to the previous kept point are dropped.
+        Returns True when the point was kept.
+        """
+        if self._active_slide is None:
+            return False
+        if self._active_len:
+            last = self._active[self._active_len - 1]
+            if np.hypot(point[0] - int(last[0]), point[1] - int(last[1])) < self.min_distance:
+                return False
+        if self._active_len == len(self._active):
+            grown = np.empty((2 * len(self._active), 2), dtype=np.int16)
+            grown[:self._active_len] = self._active
+            self._active = grown
+        self._active[self._active_len] = point
+        self._active_len += 1
+        return True
+
+    def end_stroke(self):
+        """Simplify the stroke in progress and commit it to its slide."""
+        if self._active_slide is None:
+            return
+        if self._active_len >= 2:
+            stroke = simplify_stroke(self._active[:self._active_len], self.epsilon)
+            self._slides.setdefault(self._active_slide, _SlideStrokes()).append(stroke)
+        self._active_slide = None
+        self._active_len = 0
+
+    def pop_stroke(self, slide: int) -> bool:
+        """Remove the most recent stroke on ``slide``. Returns True if one was removed."""
+        if self._active_slide == slide:
+            self._active_slide = None
+            self._active_len = 0
+            self._bump(slide)
+            return True
+        strokes = self._slides.get(slide)
+        if strokes is None or not strokes.pop():
+            return False
+        self._bump(slide)
+        return True
+
+    def clear(self, slide: Optional[int] = None):
+        """Remove all strokes on ``slide``, or on every slide."""
+        if slide is None or self._active_slide == slide:
+            self._active_slide = None
+            self._active_len = 0
+        if slide is None:
+            self._slides.clear()
+            self._generation += 1
+        else:
+            self._slides.pop(slide, None)
+            self._bump(slide)
+
+    def remap(self, moves: Dict[int, int]):
+        """Move the strokes of slide ``old`` to slide ``moves[old]``; strokes on other slides are dropped."""
+        self.end_stroke()
+        self._slides = {moves[slide]: strokes for slide, strokes in self._slides.items() if slide in moves}
+        self._revisions.clear()
+        self._generation += 1
+
+    def stroke_count(self, slide: int) -> int:
+        """Number of strokes on ``slide``, including the one in progress."""
+        count = len(self._slides[slide].offsets) - 1 if slide in self._slides else 0
+        if self._active_slide == slide and self._active_len:
+            count += 1
+        return count
+
+    def strokes(self, slide: int, start: int = 0) -> List[np.ndarray]:
+        """Return the strokes on ``slide`` from index ``start`` on, including the one in progress."""
+        strokes = self._slides[slide].strokes(start) if slide in self._slides else []
+        if self._active_slide == slide and self._active_len:
+            strokes.append(self._active[:self._active_len])
+        return strokes
+
+    def save(self, path: str, deck_id: str = ""):
+        """Write all finished strokes to ``path`` as a binary ``.npz`` archive."""
+        self.end_stroke()
+        arrays = {"deck_id": np.array(deck_id)}
+        for slide, strokes in self._slides.items():
+            if len(strokes.offsets) > 1:
+                points, offsets = strokes.compact()
+                arrays[f"points_{slide}"] = points
+                arrays[f"offsets_{slide}"] = offsets
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, deck_id: str = "") -> bool:
+        """
+        Replace the stored strokes with those saved at ``path``.
+
+        Annotations saved for a different deck are ignored. Returns True if anything was loaded.
+        """
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            if str(data["deck_id"]) != deck_id:
+                logger.info(f"Ignoring annotations in {path}: saved for a different deck")
+                return False
+            self.clear()
+            for key in data.files:
+                if key.startswith("points_"):
+                    slide = int(key[len("points_"):])
+                    self._slides[slide] = _SlideStrokes(data[key], data[f"offsets_{slide}"])
+        return True
+
+
+class AnnotationLayer:
+    """
+    Persistent raster of one slide's annotations.
+
+    New segments are drawn into the layer as strokes grow. The whole layer is
+    re-rasterized, with one batched ``cv2.polylines`` call, only after strokes are removed.
+    """
+
+    def __init__(self, shape: Tuple[int, int], color: Tuple[int, int, int], thickness: int):
+        """Create an empty layer for slides of ``shape`` (height, width)."""
+        self.color = color
+        self.thickness = thickness
+        self.image = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
+        self.mask = np.zeros(shape, dtype=np.uint8)
+        self._revision: Optional[Tuple[int, int]] = None
+        self._stroke = 0
+        self._points = 0
+        self._bbox: Optional[List[int]] = None
+
+    @property
+    def bbox(self) -> Optional[Tuple[int, int, int, int]]:
+        """Bounding box (x0, y0, x1, y1) of everything drawn on the layer."""
+        return tuple(self._bbox) if self._bbox is not None else None
+
+    def sync(self, store: AnnotationStore, slide: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Bring the layer up to date with ``store``.
+
+        Returns the region (x0, y0, x1, y1) that changed, or None when nothing did.
+        """
+        revision = store.revision(slide)
+        if revision != self._revision:
+            self._revision = revision
+            self._stroke = self._points = 0
+            return self._rasterize(store.strokes(slide))
+
+        # Only strokes from the last partially drawn one onwards can have new points
+        strokes = store.strokes(slide, self._stroke)
+        segments = []
+        for i, stroke in enumerate(strokes):
+            start = max(self._points - 1, 0) if i == 0 else 0
+            if len(stroke) - start >= 2:
+                segments.append(stroke[start:].astype(np.int32))
+        self._mark(strokes)
+        if not segments:
+            return None
+        cv2.polylines(self.image, segments, False, self.color, self.thickness)
+        cv2.polylines(self.mask, segments, False, 255, self.thickness)
+        return self._grow_bbox(segments)
+
+    def composite(self, img: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None):
+        """Draw the layer onto ``img`` in place, touching only the annotated part of ``region``."""
+        if self._bbox is None:
+            return
+        x0, y0, x1, y1 = self._bbox
+        if region is not None:
+            x0, y0 = max(x0, region[0]), max(y0, region[1])
+            x1, y1 = min(x1, region[2]), min(y1, region[3])
+            if x0 >= x1 or y0 >= y1:
+                return
+        cv2.copyTo(self.image[y0:y1, x0:x1], self.mask[y0:y1, x0:x1], img[y0:y1, x0:x1])
+
+    def _rasterize(self, strokes: List[np.ndarray]) -> Optional[Tuple[int, int, int, int]]:
+        """Redraw every stroke from scratch."""
+        old_bbox = self.bbox
+        self.image[:] = 0
+        self.mask[:] = 0
+        self._bbox = None
+        self._mark(strokes)
+        polylines = [stroke.astype(np.int32) for stroke in strokes if len(stroke) >= 2]
+        if polylines:
+            cv2.polylines(self.image, polylines, False, self.color, self.thickness)
+            cv2.polylines(self.mask, polylines, False, 255, self.thickness)
+            self._grow_bbox(polylines)
+        if old_bbox is None:
+            return self.bbox
+        if self._bbox is None:
+            return old_bbox
+        return (min(old_bbox[0], self._bbox[0]), min(old_bbox[1], self._bbox[1]),
+                max(old_bbox[2], self._bbox[2]), max(old_bbox[3], self._bbox[3]))
+
+    def _mark(self, strokes: List[np.ndarray]):
+        """Remember how much of the stroke list (starting at ``self._stroke``) has been drawn."""
+        if strokes:
+            self._stroke += len(strokes) - 1
+            self._points = len(strokes[-1])
+
+    def _grow_bbox(self, polylines: List[np.ndarray]) -> Tuple[int, int, int, int]:
+        """Extend the drawn bounding box by ``polylines`` and return their own box."""
+        h, w = self.mask.shape
+        pad = self.thickness // 2 + 1
+        pts = np.concatenate(polylines)
+        x0 = max(int(pts[:, 0].min()) - pad, 0)
+        y0 = max(int(pts[:, 1].min()) - pad, 0)
+        x1 = min(int(pts[:, 0].max()) + pad + 1, w)
+        y1 = min(int(pts[:, 1].max()) + pad + 1, h)
+        if self._bbox is None:
+            self._bbox = [x0, y0, x1, y1]
+        else:
+            self._bbox = [min(self._bbox[0], x0), min(self._bbox[1], y0),
+                          max(self._bbox[2], x1), max(self._bbox[3], y1)]
+        return x0, y0, x1, y1
@@ -0,0 +1,148 @@
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+Rect = Tuple[int, int, int, int]
+# Transient mark drawn over the slide: (center, radius, color)
+Mark = Tuple[Tuple[int, int], int, Tuple[int, int, int]]
+
+
+class _Output:
+    """One preallocated output image and what it was last composed from."""
+
+    __slots__ = ("image", "generation", "transient")
+
+    def __init__(self, shape: Tuple[int, ...]):
+        self.image = np.empty(shape, dtype=np.uint8)
+        self.generation = -1
+        self.transient: List[Rect] = []
+
+
+class SlideCompositor:
+    """
+    Layered compositor for the slide view.
+
+    The canvas holds the base slide with its annotation layer and is only updated, in place,
+    in regions that changed. Each frame is composed into one of ``buffers`` preallocated
+    output images: regions changed since that image was last used are copied from the
+    canvas, the previous frame's transient marks are erased the same way, and the pointer
+    marks and camera overlay are drawn on top. Outputs are reused round-robin so frames
+    still queued for display are never overwritten. Steady-state frames allocate nothing.
+    """
+
+    def __init__(self, buffers: int = 1, overlay_size: Tuple[int, int] = (213, 120), history: int = 64):
+        """Create a compositor with ``buffers`` outputs and an ``overlay_size`` (w, h) camera inset."""
+        self.buffers = max(1, buffers)
+        self.overlay_size = overlay_size
+        self.base: Optional[np.ndarray] = None
+        self.base_key = None
+        self.canvas: Optional[np.ndarray] = None
+        self.view_changed = True
+
+        self._outputs: List[_Output] = []
+        self._next = 0
+        self._current: Optional[_Output] = None
+        self._overlay = np.empty((overlay_size[1], overlay_size[0], 3), dtype=np.uint8)
+        self._overlay_unmirrored = np.empty_like(self._overlay)
+        self._generation = 0
+        self._full_generation = 0
+        self._dirty: deque = deque(maxlen=history)
+        self._changed = True
+        self._last_marks: Sequence[Mark] = ()
+
+    def set_base(self, base: np.ndarray, key) -> bool:
+        """Use ``base`` as the slide; returns False (and does nothing) when ``key`` is unchanged."""
+        if key == self.base_key and self.canvas is not None:
+            return False
+        self.base = base
+        self.base_key = key
+        if self.canvas is None or self.canvas.shape != base.shape:
+            self.canvas = np.empty_like(base)
+            self._outputs = [_Output(base.shape) for _ in range(self.buffers)]
+        np.copyto(self.canvas, base)
+        self._generation += 1
+        self._full_generation = self._generation
+        self._dirty.clear()
+        self._changed = True
+        return True
+
+    def update_annotations(self, layer, region: Optional[Rect] = None):
+        """Recomposite ``region`` (default: the whole layer) from the base slide and ``layer``."""
+        if region is None:
+            region = layer.bbox if layer is not None else None
+            if region is None:
+                return
+        x0, y0, x1, y1 = region
+        self.canvas[y0:y1, x0:x1] = self.base[y0:y1, x0:x1]
+        if layer is not None:
+            layer.composite(self.canvas, region)
+        self._generation += 1
+        self._dirty.append((self._generation, region))
+        self._changed = True
+
+    def compose(self, marks: Sequence[Mark] = ()) -> np.ndarray:
+        """Compose the next output image from the canvas and ``marks`` and return it."""
+        out = self._outputs[self._next]
+        self._next = (self._next + 1) % len(self._outputs)
+        self._current = out
+
+        if self._needs_full_copy(out):
+            np.copyto(out.image, self.canvas)
+        else:
+            for generation, rect in self._dirty:
+                if generation > out.generation:
+                    self._restore(out, rect)
+            for rect in out.transient:
+                self._restore(out, rect)
+        out.generation = self._generation
+        out.transient.clear()
+
+        h, w = out.image.shape[:2]
+        for center, radius, color in marks:
+            cv2.circle(out.image, center, radius, color, cv2.FILLED)
+            x, y = center
+            rect = (max(x - radius - 1, 0), max(y - radius - 1, 0), min(x + radius + 2, w), min(y + radius + 2, h))
+            if rect[0] < rect[2] and rect[1] < rect[3]:
+                out.transient.append(rect)
+
+        self.view_changed = self._changed or marks != self._last_marks
+        self._changed = False
+        self._last_marks = marks
+        return out.image
+
+    def draw_overlay(self, img: np.ndarray, mirror: bool = False, line_y: Optional[int] = None):
+        """
+        Draw ``img`` scaled down (and flipped if ``mirror``) into the top-right corner of the last output.
+
+        ``line_y`` draws the gesture threshold line at that row of ``img`` onto the thumbnail,
+        for frames that must not be drawn on themselves. ``img`` is only read.
+        """
+        out = self._current
+        h, w = out.image.shape[:2]
+        ow, oh = self.overlay_size
+        if mirror:
+            # Flipping the thumbnail is much cheaper than flipping the camera frame
+            cv2.resize(img, (ow, oh), dst=self._overlay_unmirrored)
+            cv2.flip(self._overlay_unmirrored, 1, self._overlay)
+        else:
+            cv2.resize(img, (ow, oh), dst=self._overlay)
+        if line_y is not None:
+            scale = oh / img.shape[0]
+            y = round(line_y * scale)
+            cv2.line(self._overlay, (0, y), (ow, y), (0, 255, 0), max(1, round(10 * scale)))
+        out.image[0:oh, w - ow:w] = self._overlay
+        out.transient.append((w - ow, 0, w, oh))
+
+    def _needs_full_copy(self, out: _Output) -> bool:
+        """Whether ``out`` is too far behind the canvas to be patched from the dirty history."""
+        if out.generation < self._full_generation:
+            return True
+        if out.generation >= self._generation:
+            return False
+        return not self._dirty or self._dirty[0][0] > out.generation + 1
+
+    def _restore(self, out: _Output, rect: Rect):
+        x0, y0, x1, y1 = rect
+        out.image[y0:y1, x0:x1] = self.canvas[y0:y1, x0:x1]
@@ -0,0 +1,136 @@
+import os
+import json
+import socket
+import socketserver
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "data/run/gesture.sock"
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve newline-delimited JSON requests on one connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = {"ok": True, "result": self.server.dispatch(json.loads(line))}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    Local control socket for a running GestureController.
+
+    Clients send one JSON object per line, e.g. ``{"cmd": "next"}`` or
+    ``{"cmd": "load", "path": "data/jobs/<id>/images"}``, and get back
+    ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``. Commands that
+    change controller state are run on the frame-loop thread through
+    ``controller.call``; ``status`` and ``fps`` only read and answer immediately.
+    """
+
+    COMMANDS = ("status", "fps", "load", "start", "pause", "next", "prev", "reset", "quit")
+
+    def __init__(self, controller, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        """Create a server for ``controller``; it listens once ``start`` is called."""
+        self.controller = controller
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._server: Optional[_UnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Bind the socket and serve requests on a background thread."""
+        if ControlClient(self.socket_path).alive():
+            raise RuntimeError(f"Another controller is already listening on {self.socket_path}")
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.dispatch = self.dispatch
+        os.chmod(self.socket_path, 0o600)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Control socket listening on {self.socket_path}")
+
+    def stop(self):
+        """Stop serving and remove the socket file."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def dispatch(self, request: Dict) -> Any:
+        """Run one request against the controller and return its result."""
+        cmd = request.get("cmd")
+        controller = self.controller
+        if cmd == "status":
+            return controller.status()
+        if cmd == "fps":
+            return {"fps": round(controller.metrics.fps, 2), "end_to_end": controller.metrics.end_to_end.summary()}
+        if cmd == "load":
+            path = request.get("path")
+            if not path:
+                raise ValueError("'load' needs a 'path'")
+            return controller.call(lambda: controller.load_deck(path), self.timeout)
+        if cmd == "start":
+            return controller.call(controller.resume, self.timeout)
+        if cmd == "pause":
+            return controller.call(controller.pause, self.timeout)
+        if cmd == "next":
+            return controller.call(controller._next_slide, self.timeout)
+        if cmd == "prev":
+            return controller.call(controller._previous_slide, self.timeout)
+        if cmd == "reset":
+            return controller.call(controller._reset_annotations, self.timeout)
+        if cmd == "quit":
+            controller.submit(controller.request_quit)
+            return None
+        raise ValueError(f"Unknown command {cmd!r}; expected one of {', '.join(self.COMMANDS)}")
+
+
+class ControlClient:
+    """Client for the controller's control socket."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 10.0):
+        """Create a client; each request opens a short-lived connection."""
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, cmd: str, **params) -> Any:
+        """Send ``cmd`` and return its result; raises RuntimeError when the controller reports an error."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(dict(params, cmd=cmd)).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        if not line:
+            raise RuntimeError("Controller closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "unknown error"))
+        return response.get("result")
+
+    def alive(self) -> bool:
+        """Whether a controller answers on the socket."""
+        try:
+            self.request("status")
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
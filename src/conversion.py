@@ -0,0 +1,303 @@
+import os
+import re
+import math
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from deck import DECK_FILE, DECK_META, THUMBS_DIR, DeckReader, DeckWriter, read_deck_meta, write_deck_meta
+from slide_fingerprints import match_slides, pdf_page_fingerprints
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_FILE = "config/gesture_config.json"
+DEFAULT_RENDER_DPI = 200
+DEFAULT_THUMBNAIL_WIDTH = 320
+SLIDE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def load_gesture_config(config_file: str = DEFAULT_CONFIG_FILE) -> Dict:
+    """Load the gesture configuration, or an empty dict when it is missing."""
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, "r") as f:
+        return json.load(f)
+
+
+def render_settings(config: Dict) -> Dict:
+    """Return the config values that affect rendered slide images and their thumbnails."""
+    settings = {key: config.get(key) for key in ("render_dpi", "width", "height")}
+    settings["thumbnail_width"] = config.get("thumbnail_width", DEFAULT_THUMBNAIL_WIDTH)
+    return settings
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def page_size_points(pdf_info: Dict) -> Optional[Tuple[float, float]]:
+    """Parse the ``Page size`` entry of ``pdfinfo`` output into (width, height) in points."""
+    match = re.match(r"\s*([\d.]+) x ([\d.]+)", str(pdf_info.get("Page size", "")))
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def render_dpi(config: Dict, page_size: Optional[Tuple[float, float]]) -> int:
+    """
+    Choose the rasterization DPI.
+
+    With ``render_dpi`` set to ``"auto"`` the DPI is the smallest one at which a page covers
+    the controller's display ``width`` x ``height``.
+    """
+    dpi = config.get("render_dpi", "auto")
+    if dpi != "auto":
+        return int(dpi)
+    if page_size is None:
+        return DEFAULT_RENDER_DPI
+    width = config.get("width", 1280)
+    height = config.get("height", 720)
+    return max(1, math.ceil(72 * max(width / page_size[0], height / page_size[1])))
+
+
+def save_thumbnail(image, path: str, width: int):
+    """Save a JPEG preview of a PIL page image, ``width`` pixels wide."""
+    thumb = image.convert("RGB")
+    thumb.thumbnail((width, width * 4), resample=3)  # 3 = bicubic
+    tmp_path = path + ".tmp"
+    thumb.save(tmp_path, "JPEG", quality=80)
+    os.replace(tmp_path, path)
+
+
+def _page_key(name: str):
+    """Sort key that orders ``2.png`` before ``10.png``."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def page_chunks(pages: List[int], chunk_pages: int) -> List[List[int]]:
+    """Split sorted ``pages`` into runs of consecutive pages, at most ``chunk_pages`` long."""
+    chunk_pages = max(1, chunk_pages)
+    chunks: List[List[int]] = []
+    for page in pages:
+        if chunks and len(chunks[-1]) < chunk_pages and chunks[-1][-1] == page - 1:
+            chunks[-1].append(page)
+        else:
+            chunks.append([page])
+    return chunks
+
+
+def _link_page(src: str, dst: str):
+    """Hard-link (or copy) ``src`` to ``dst``, replacing ``dst`` atomically."""
+    tmp_path = dst + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def _reuse_page(previous: str, old_page: int, output_folder: str, page: int,
+                deck: Optional[DeckWriter], old_deck: Optional[DeckReader]):
+    """Take page ``page`` from page ``old_page`` of the conversion in ``previous``."""
+    _link_page(os.path.join(previous, THUMBS_DIR, f"{old_page}.jpg"),
+               os.path.join(output_folder, THUMBS_DIR, f"{page}.jpg"))
+    if deck is not None:
+        slide = old_deck.slide(old_page - 1) if old_deck is not None else None
+        if slide is not None:
+            deck.copy(page - 1, slide)
+        else:
+            from PIL import Image
+
+            with Image.open(os.path.join(previous, f"{old_page}.png")) as image:
+                deck.write(page - 1, np.asarray(image.convert("RGB")))
+    _link_page(os.path.join(previous, f"{old_page}.png"), os.path.join(output_folder, f"{page}.png"))
+
+
+def render_pdf_pages(pdf_path: str, output_folder: str, config: Dict,
+                     on_page: Optional[Callable[[int, int], None]] = None,
+                     write_deck: bool = True,
+                     slide_fingerprints: Optional[List[str]] = None,
+                     previous: Optional[str] = None) -> int:
+    """
+    Rasterize every page of ``pdf_path`` into ``output_folder`` as ``<page>.png``.
+
+    Page ranges of ``render_chunk_pages`` are rendered on a pool of ``render_workers``
+    threads (pdftocairo runs as a subprocess, so threads render in parallel). Each page is
+    written as soon as it is rendered and then released, so memory use does not grow with
+    the page count. ``on_page(page, page_count)`` is called from the worker threads.
+
+    With ``write_deck`` the pages are also packed, pre-decoded at the display resolution,
+    into ``output_folder/deck.bin`` for the controller to memory-map.
+    A ``thumbnail_width`` JPEG preview of each page goes to ``output_folder/thumbs`` and
+    ``deck.json`` records the page count and thumbnail paths for the web app.
+
+    ``deck.json`` doubles as the manifest of a deck in progress: it is rewritten atomically
+    after every page with ``complete`` false, the finished ``ready_pages`` and the
+    ``deck_file`` being filled in, so slides can be shown before the last page is done.
+
+    ``slide_fingerprints`` (see ``pptx_slide_fingerprints``) are stored in ``deck.json``
+    together with a fingerprint of every rendered page. Pages whose fingerprints match a
+    page of the earlier conversion in ``previous`` are linked from there instead of being
+    rasterized again. Returns the number of pages.
+    """
+    from pdf2image import convert_from_path, pdfinfo_from_path
+
+    info = pdfinfo_from_path(pdf_path)
+    page_count = int(info["Pages"])
+    dpi = render_dpi(config, page_size_points(info))
+    workers = config.get("render_workers") or os.cpu_count() or 1
+    thumbnail_width = config.get("thumbnail_width", DEFAULT_THUMBNAIL_WIDTH)
+    os.makedirs(os.path.join(output_folder, THUMBS_DIR), exist_ok=True)
+    # Metadata of a previous deck must not outlive it; the manifest of this one replaces it
+    if os.path.exists(os.path.join(output_folder, DECK_META)):
+        os.remove(os.path.join(output_folder, DECK_META))
+    deck_id = file_digest(pdf_path)
+    meta = {
+        "deck_id": deck_id,
+        "page_count": page_count,
+        "thumbnails": [f"{THUMBS_DIR}/{page}.jpg" for page in range(1, page_count + 1)],
+        "settings": render_settings(config),
+    }
+    reuse: Dict[int, int] = {}
+    if slide_fingerprints is not None:
+        if len(slide_fingerprints) == page_count:
+            meta["slide_fingerprints"] = slide_fingerprints
+            meta["page_fingerprints"] = pdf_page_fingerprints(pdf_path)
+            previous_meta = read_deck_meta(previous) if previous and previous != output_folder else None
+            if previous_meta is not None and previous_meta.get("settings") == meta["settings"]:
+                matches = match_slides(previous_meta, meta) or {}
+                reuse = {page + 1: old + 1 for page, old in matches.items()}
+        else:
+            logger.warning(f"Presentation has {len(slide_fingerprints)} visible slides but the PDF "
+                           f"has {page_count} pages; not fingerprinting its pages")
+
+    deck = None
+    if write_deck:
+        deck = DeckWriter(
+            os.path.join(output_folder, DECK_FILE), page_count,
+            config.get("width", 1280), config.get("height", 720),
+            deck_id=deck_id
+        )
+
+    ready: List[int] = []
+    manifest_lock = threading.Lock()
+
+    def publish(page: Optional[int] = None):
+        """Rewrite the manifest with ``page`` added to the finished pages."""
+        with manifest_lock:
+            if page is not None:
+                ready.append(page)
+            write_deck_meta(output_folder, dict(
+                meta, complete=False, ready_pages=sorted(ready),
+                deck_file=os.path.basename(deck.tmp_path) if deck is not None else None
+            ))
+        if page is not None and on_page is not None:
+            on_page(page, page_count)
+
+    publish()
+    pending = [page for page in range(1, page_count + 1) if page not in reuse]
+    old_deck = None
+    if reuse and deck is not None:
+        try:
+            old_deck = DeckReader(os.path.join(previous, DECK_FILE))
+        except (OSError, ValueError):
+            pass
+        if old_deck is not None and (old_deck.width, old_deck.height) != (deck.width, deck.height):
+            old_deck = None
+
+    def render_chunk(pages: List[int]):
+        # One pdftocairo run per chunk; chunks are consecutive pages, so they form one range
+        images = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=pages[0],
+            last_page=pages[-1],
+            use_cropbox=False,
+            use_pdftocairo=True
+        )
+        for page, image in zip(pages, images):
+            image_path = os.path.join(output_folder, f"{page}.png")
+            # Write to a new file and rename it into place, so the page appears atomically and
+            # files hard-linked elsewhere (e.g. into the conversion cache) are never rewritten
+            tmp_path = image_path + ".tmp"
+            image.save(tmp_path, "PNG")
+            if deck is not None:
+                deck.write(page - 1, np.asarray(image.convert("RGB")))
+            save_thumbnail(image, os.path.join(output_folder, THUMBS_DIR, f"{page}.jpg"), thumbnail_width)
+            image.close()
+            os.replace(tmp_path, image_path)
+            publish(page)
+
+    try:
+        for page, old_page in sorted(reuse.items()):
+            try:
+                _reuse_page(previous, old_page, output_folder, page, deck, old_deck)
+            except OSError as e:
+                # The earlier conversion may have been discarded meanwhile
+                logger.warning(f"Could not reuse page {old_page} of '{previous}': {e}")
+                pending.append(page)
+                continue
+            publish(page)
+        if reuse:
+            logger.info(f"Reused {page_count - len(pending)} unchanged pages from '{previous}'")
+        pending.sort()
+        chunks = page_chunks(pending, config.get("render_chunk_pages", 4))
+        logger.info(f"Rendering {len(pending)} pages at {dpi} dpi with {workers} workers")
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks)) or 1) as pool:
+            futures = [pool.submit(render_chunk, pages) for pages in chunks]
+            for future in futures:
+                future.result()
+    except Exception:
+        if deck is not None:
+            deck.abort()
+        # A failed deck must not look like one still in progress
+        os.remove(os.path.join(output_folder, DECK_META))
+        raise
+    if deck is not None:
+        deck.close()
+    meta["reused_pages"] = page_count - len(pending)
+    meta["complete"] = True
+    write_deck_meta(output_folder, meta)
+    return page_count
+
+
+def build_preview(images_folder: str, config: Dict) -> Dict:
+    """
+    Create thumbnails and ``deck.json`` for a folder of slide images that has none.
+
+    Used for slides that were not produced by ``render_pdf_pages``, e.g. older cache entries.
+    Returns the metadata that was written.
+    """
+    from PIL import Image
+
+    names = sorted(
+        (f for f in os.listdir(images_folder) if f.lower().endswith(SLIDE_EXTENSIONS)),
+        key=_page_key
+    )
+    thumbnail_width = config.get("thumbnail_width", DEFAULT_THUMBNAIL_WIDTH)
+    os.makedirs(os.path.join(images_folder, THUMBS_DIR), exist_ok=True)
+    digest = hashlib.sha256()
+    thumbnails = []
+    for page, name in enumerate(names, start=1):
+        path = os.path.join(images_folder, name)
+        digest.update(f"{name}:{os.path.getsize(path)};".encode())
+        with Image.open(path) as image:
+            save_thumbnail(image, os.path.join(images_folder, THUMBS_DIR, f"{page}.jpg"), thumbnail_width)
+        thumbnails.append(f"{THUMBS_DIR}/{page}.jpg")
+
+    meta = {"deck_id": digest.hexdigest(), "page_count": len(names), "thumbnails": thumbnails}
+    write_deck_meta(images_folder, meta)
+    return meta
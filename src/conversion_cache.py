@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are kept apart
+    fcntl = None
+
+from deck import DECK_FILE, DECK_META, THUMBS_DIR
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+ENTRY_FILE = "entry.json"
+PDF_FILE = "presentation.pdf"
+IMAGES_DIR = "images"
+LOCK_FILE = ".lock"
+TMP_MARK = ".tmp-"
+
+
+class ConversionCache:
+    """
+    Content-addressed cache of converted decks.
+
+    Entries are keyed by the hash of the uploaded file bytes plus the render settings and
+    hold the PDF and the rendered slide images. The cache is capped at ``max_bytes``; the
+    least recently used entries are evicted first.
+
+    Storing, restoring and evicting hold a lock, a thread lock plus a file lock in ``root``
+    where the platform has ``fcntl``, so conversion workers and other app processes sharing
+    the directory never see or delete an entry that is being written or read.
+    """
+
+    def __init__(self, root: str = "data/cache/conversions", max_bytes: int = 1024 * 1024 * 1024):
+        """Create (or reopen) a cache rooted at ``root``."""
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cache lock across threads and, where possible, processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def key_for(data: bytes, settings: Dict) -> str:
+        """Return the cache key for a file's bytes rendered with ``settings``."""
+        digest = hashlib.sha256(data)
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the entry directory for ``key`` and mark it as recently used, or None."""
+        entry = os.path.join(self.root, key)
+        marker = os.path.join(entry, ENTRY_FILE)
+        if not os.path.exists(marker):
+            return None
+        os.utime(marker)
+        return entry
+
+    def restore(self, key: str, images_dir: str, pdf_path: Optional[str] = None) -> bool:
+        """
+        Populate ``images_dir`` (and optionally ``pdf_path``) from the entry for ``key``.
+
+        Images are hard-linked when possible, so a hit costs no copying. Returns False on a miss.
+        """
+        with self._locked():
+            entry = self.lookup(key)
+            if entry is None:
+                return False
+
+            os.makedirs(images_dir, exist_ok=True)
+            for name in os.listdir(images_dir):
+                if _is_slide_file(name):
+                    os.remove(os.path.join(images_dir, name))
+            shutil.rmtree(os.path.join(images_dir, THUMBS_DIR), ignore_errors=True)
+            _link_tree(os.path.join(entry, IMAGES_DIR), images_dir)
+            if pdf_path:
+                os.makedirs(os.path.dirname(pdf_path) or ".", exist_ok=True)
+                shutil.copyfile(os.path.join(entry, PDF_FILE), pdf_path)
+        logger.info(f"Restored conversion {key[:12]} from cache")
+        return True
+
+    def store(self, key: str, pdf_path: str, images_dir: str, metadata: Optional[Dict] = None):
+        """Add a finished conversion to the cache, then evict entries over the size cap."""
+        entry = os.path.join(self.root, key)
+        with self._locked():
+            if os.path.exists(os.path.join(entry, ENTRY_FILE)):
+                return
+
+            # Build the entry under a temporary name and write its marker last, once it is in
+            # place, so a half-written entry is never listed, restored or evicted
+            tmp_entry = f"{entry}{TMP_MARK}{os.getpid()}"
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            os.makedirs(os.path.join(tmp_entry, IMAGES_DIR))
+            shutil.copyfile(pdf_path, os.path.join(tmp_entry, PDF_FILE))
+            _link_tree(images_dir, os.path.join(tmp_entry, IMAGES_DIR))
+
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp_entry, entry)
+            marker = os.path.join(entry, ENTRY_FILE)
+            with open(marker + ".tmp", "w") as f:
+                json.dump(dict(metadata or {}, key=key, created=time.time()), f)
+            os.replace(marker + ".tmp", marker)
+            logger.info(f"Stored conversion {key[:12]} in cache")
+            self._evict(keep=key)
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """Return (last used, size in bytes, key) for every complete entry."""
+        result = []
+        for key in os.listdir(self.root):
+            if TMP_MARK in key:
+                continue
+            marker = os.path.join(self.root, key, ENTRY_FILE)
+            if os.path.exists(marker):
+                result.append((os.path.getmtime(marker), _dir_size(os.path.join(self.root, key)), key))
+        return result
+
+    def images_dirs(self) -> List[str]:
+        """Return the slide images folder of every complete entry."""
+        return [os.path.join(self.root, key, IMAGES_DIR) for _, _, key in self.entries()]
+
+    def _evict(self, keep: str = ""):
+        """Remove least recently used entries until the cache fits ``max_bytes``; call with the lock held."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted conversion {key[:12]} from cache")
+
+
+def _is_slide_file(name: str) -> bool:
+    """Whether ``name`` is a rendered slide image, the packed deck or its metadata."""
+    return name.lower().endswith(IMAGE_EXTENSIONS) or name in (DECK_FILE, DECK_META)
+
+
+def _link_tree(src_dir: str, dst_dir: str):
+    """Link the slide files of ``src_dir`` and its thumbnails into ``dst_dir``."""
+    for name in os.listdir(src_dir):
+        if _is_slide_file(name):
+            _link_or_copy(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+    thumbs = os.path.join(src_dir, THUMBS_DIR)
+    if os.path.isdir(thumbs):
+        os.makedirs(os.path.join(dst_dir, THUMBS_DIR), exist_ok=True)
+        for name in os.listdir(thumbs):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                _link_or_copy(os.path.join(thumbs, name), os.path.join(dst_dir, THUMBS_DIR, name))
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hard-link ``src`` to ``dst``, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _dir_size(path: str) -> int:
+    """Total size of the files under ``path``."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            total += os.path.getsize(os.path.join(dirpath, name))
+    return total
@@ -0,0 +1,248 @@
+import os
+import time
+import uuid
+import shutil
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+from conversion import render_pdf_pages, render_settings
+from conversion_cache import ConversionCache
+from deck import read_deck_meta
+from office_worker import OfficeWorker
+from slide_fingerprints import pptx_slide_fingerprints
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FILE = "source.pptx"
+PDF_FILE = "presentation.pdf"
+IMAGES_DIR = "images"
+
+QUEUED = "queued"
+CONVERTING = "converting"
+RENDERING = "rendering"
+DONE = "done"
+FAILED = "failed"
+
+
+class ConversionJob:
+    """State of one upload being converted in its own working directory."""
+
+    def __init__(self, job_id: str, name: str, workdir: str):
+        """Create a queued job for the upload ``name``."""
+        self.id = job_id
+        self.name = name
+        self.workdir = workdir
+        self.status = QUEUED
+        self.pages_done = 0
+        self.page_count = 0
+        self.pages_reused = 0
+        self.cache_hit = False
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+
+    @property
+    def source_path(self) -> str:
+        return os.path.join(self.workdir, SOURCE_FILE)
+
+    @property
+    def pdf_path(self) -> str:
+        return os.path.join(self.workdir, PDF_FILE)
+
+    @property
+    def images_dir(self) -> str:
+        return os.path.join(self.workdir, IMAGES_DIR)
+
+    @property
+    def active(self) -> bool:
+        """Whether the job is still queued or running."""
+        return self.status not in (DONE, FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the job completed, for progress bars."""
+        if self.status == DONE:
+            return 1.0
+        if self.status == RENDERING and self.page_count:
+            # LibreOffice takes roughly the first tenth of a job, rendering the rest
+            return 0.1 + 0.9 * self.pages_done / self.page_count
+        return 0.0 if self.status == QUEUED else 0.05
+
+
+class ConversionQueue:
+    """
+    Bounded pool of background conversion jobs.
+
+    Every upload becomes a job with its own ID and working directory under ``root``, so
+    concurrent uploads never share files. Jobs run on ``max_workers`` threads: the PPTX goes
+    through the shared LibreOffice worker, then its pages are rendered into the job's
+    ``images`` folder. Finished conversions are stored in the conversion cache, and an
+    upload that is already cached completes immediately. With ``incremental_conversion``
+    only the slides that changed since the most similar earlier conversion are rendered;
+    the others are linked from it. Callers poll ``get`` for status.
+
+    Finished jobs are kept for ``retention`` seconds, and only the ``max_finished`` most
+    recent ones; older job folders are deleted. Folders left by an earlier run of the app,
+    whose jobs this queue never knew, are deleted when it starts. Folders whose slides are
+    listed by ``in_use`` (e.g. the deck the controller is presenting) are always kept.
+    """
+
+    def __init__(self, worker: OfficeWorker, cache: ConversionCache, config: Dict,
+                 root: str = "data/jobs", max_workers: int = 2, retention: float = 24 * 3600,
+                 max_finished: int = 20, in_use: Optional[Callable[[], Set[str]]] = None):
+        """Create the queue; jobs are run by up to ``max_workers`` threads."""
+        self.worker = worker
+        self.cache = cache
+        self.config = config
+        self.root = root
+        self.retention = retention
+        self.max_finished = max_finished
+        self.in_use = in_use or set
+        self._jobs: Dict[str, ConversionJob] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="convert")
+        os.makedirs(self.root, exist_ok=True)
+        self._sweep_orphans()
+
+    def submit(self, name: str, data: bytes) -> str:
+        """Queue the conversion of an uploaded PPTX and return its job ID."""
+        job_id = uuid.uuid4().hex[:12]
+        job = ConversionJob(job_id, name, os.path.join(self.root, job_id))
+        os.makedirs(job.workdir)
+        with open(job.source_path, "wb") as f:
+            f.write(data)
+        cache_key = ConversionCache.key_for(data, render_settings(self.config))
+
+        with self._lock:
+            self._jobs[job_id] = job
+        if self.cache.restore(cache_key, job.images_dir, job.pdf_path):
+            job.cache_hit = True
+            job.page_count = (read_deck_meta(job.images_dir) or {}).get("page_count", 0)
+            self._finish(job, DONE)
+        else:
+            self._pool.submit(self._run, job, cache_key)
+        logger.info(f"Queued conversion job {job_id} for '{name}'")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[ConversionJob]:
+        """Return the job with ``job_id``, or None if it is unknown."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ConversionJob]:
+        """Return all known jobs, oldest first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created)
+
+    def discard(self, job_id: str):
+        """Forget a finished job and delete its working directory."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.active:
+                return
+            del self._jobs[job_id]
+        shutil.rmtree(job.workdir, ignore_errors=True)
+        logger.info(f"Discarded conversion job {job_id}")
+
+    def prune(self):
+        """Delete the folders of finished jobs past ``retention`` or beyond the newest ``max_finished``."""
+        keep = self._kept_folders()
+        cutoff = time.time() - self.retention
+        with self._lock:
+            finished = sorted((job for job in self._jobs.values() if not job.active),
+                              key=lambda job: job.finished, reverse=True)
+            expired = [job for index, job in enumerate(finished)
+                       if (index >= self.max_finished or job.finished < cutoff)
+                       and os.path.abspath(job.images_dir) not in keep]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.workdir, ignore_errors=True)
+            logger.info(f"Removed expired conversion job {job.id}")
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for running ones."""
+        self._pool.shutdown(wait=True)
+
+    def _run(self, job: ConversionJob, cache_key: str):
+        """Convert one job: PPTX to PDF, PDF to slides, then cache the result."""
+        try:
+            job.status = CONVERTING
+            fingerprints, previous = None, None
+            if self.config.get("incremental_conversion", True):
+                try:
+                    fingerprints = pptx_slide_fingerprints(job.source_path)
+                    previous = self._previous_conversion(job, fingerprints)
+                except Exception as e:
+                    logger.warning(f"Could not fingerprint the slides of job {job.id}, rendering all pages: {e}")
+            self.worker.convert(job.source_path, job.pdf_path)
+
+            job.status = RENDERING
+
+            def on_page(page: int, page_count: int):
+                # Called from the render threads
+                with self._lock:
+                    job.page_count = page_count
+                    job.pages_done += 1
+
+            job.page_count = render_pdf_pages(job.pdf_path, job.images_dir, self.config, on_page,
+                                              slide_fingerprints=fingerprints, previous=previous)
+            job.pages_reused = (read_deck_meta(job.images_dir) or {}).get("reused_pages", 0)
+            try:
+                self.cache.store(cache_key, job.pdf_path, job.images_dir, {"name": job.name})
+            except Exception as e:
+                logger.warning(f"Could not cache conversion job {job.id}: {e}")
+            self._finish(job, DONE)
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"Conversion job {job.id} failed: {e}")
+            self._finish(job, FAILED)
+
+    def _previous_conversion(self, job: ConversionJob, fingerprints: List[str]) -> Optional[str]:
+        """
+        Return the images folder of the finished conversion sharing the most slides with
+        ``fingerprints``, looking at this queue's jobs and the conversion cache.
+        """
+        wanted = set(fingerprints)
+        settings = render_settings(self.config)
+        folders = [other.images_dir for other in self.jobs() if other is not job and other.status == DONE]
+        best, best_shared = None, 0
+        for folder in folders + self.cache.images_dirs():
+            meta = read_deck_meta(folder)
+            if meta is None or meta.get("settings") != settings:
+                continue
+            shared = len(wanted.intersection(meta.get("slide_fingerprints") or ()))
+            if shared > best_shared:
+                best, best_shared = folder, shared
+        if best is not None:
+            logger.info(f"Job {job.id} shares {best_shared} of {len(fingerprints)} slides with '{best}'")
+        return best
+
+    def _finish(self, job: ConversionJob, status: str):
+        """Mark ``job`` as finished with ``status``, then prune old jobs."""
+        job.finished = time.time()
+        job.status = status
+        if status == DONE:
+            logger.info(f"Conversion job {job.id} finished")
+        self.prune()
+
+    def _kept_folders(self) -> Set[str]:
+        """Absolute paths of the slide folders ``in_use`` reports; none if it fails."""
+        try:
+            return {os.path.abspath(folder) for folder in self.in_use()}
+        except Exception as e:
+            logger.warning(f"Could not tell which decks are in use: {e}")
+            return set()
+
+    def _sweep_orphans(self):
+        """Delete job folders left by an earlier run; their jobs are unknown to this queue."""
+        keep = self._kept_folders()
+        for job_id in os.listdir(self.root):
+            workdir = os.path.join(self.root, job_id)
+            if (not os.path.isdir(workdir) or job_id in self._jobs
+                    or os.path.abspath(os.path.join(workdir, IMAGES_DIR)) in keep):
+                continue
+            shutil.rmtree(workdir, ignore_errors=True)
+            logger.info(f"Removed orphaned conversion job folder {workdir}")
@@ -0,0 +1,164 @@
+import os
+import json
+import struct
+import logging
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DECK_FILE = "deck.bin"
+DECK_META = "deck.json"
+THUMBS_DIR = "thumbs"
+MAGIC = b"HGDECK01"
+VERSION = 1
+# magic, version, slide count, height, width, channels, data offset, deck id
+_HEADER = struct.Struct("<8sIIIIIQ32s")
+_ALIGN = 4096
+
+
+def _data_offset(count: int) -> int:
+    """Offset of the first slide: header plus one ready flag per slide, page aligned."""
+    size = _HEADER.size + count
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def fit_to_display(rgb: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize an RGB page to fit ``width`` x ``height``, letterboxed, and return it as BGR."""
+    h, w = rgb.shape[:2]
+    scale = min(width / w, height / h)
+    new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+    resized = cv2.resize(rgb, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+    x0, y0 = (width - new_w) // 2, (height - new_h) // 2
+    canvas[y0:y0 + new_h, x0:x0 + new_w] = resized[..., ::-1]
+    return canvas
+
+
+class DeckWriter:
+    """
+    Writes a packed deck: every slide pre-decoded as BGR at display resolution.
+
+    The file is a small header (with one ready flag per slide) followed by the slides as
+    one contiguous ``(count, height, width, 3)`` uint8 array. It is built under a temporary
+    name and renamed into place by ``close``. Slides may be written from several threads.
+    """
+
+    def __init__(self, path: str, count: int, width: int, height: int, deck_id: str = ""):
+        """Create a deck file for ``count`` slides of ``width`` x ``height``."""
+        self.path = path
+        self.count = count
+        self.width = width
+        self.height = height
+        self.tmp_path = path + ".tmp"
+
+        offset = _data_offset(count)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(self.tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, count, height, width, 3, offset,
+                                 deck_id.encode()[:32]))
+            f.truncate(offset + count * height * width * 3)
+
+        self._flags = np.memmap(self.tmp_path, dtype=np.uint8, mode="r+", offset=_HEADER.size, shape=(count,))
+        self._slides = np.memmap(self.tmp_path, dtype=np.uint8, mode="r+", offset=offset,
+                                 shape=(count, height, width, 3))
+
+    def write(self, index: int, rgb: np.ndarray):
+        """Store slide ``index`` from an RGB page image of any size."""
+        self._slides[index] = fit_to_display(rgb, self.width, self.height)
+        self._flags[index] = 1
+
+    def copy(self, index: int, bgr: np.ndarray):
+        """Store slide ``index`` from a slide already at display resolution, e.g. one of another deck."""
+        self._slides[index] = bgr
+        self._flags[index] = 1
+
+    def close(self):
+        """Flush the deck and atomically replace any previous deck at ``path``."""
+        self._slides.flush()
+        self._flags.flush()
+        del self._slides, self._flags
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Discard a partially written deck."""
+        del self._slides, self._flags
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class DeckReader:
+    """
+    Read-only, memory-mapped view of a packed deck.
+
+    Opening a deck reads only the header, so it costs the same regardless of slide count.
+    ``slide(i)`` is a zero-copy view; its pages are read from disk on first access.
+    """
+
+    def __init__(self, path: str):
+        """Open the deck at ``path``; raises ValueError when it is not a deck file."""
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a slide deck")
+        magic, version, count, height, width, channels, offset, deck_id = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a version {VERSION} slide deck")
+
+        self.count = count
+        self.height = height
+        self.width = width
+        self.deck_id = deck_id.rstrip(b"\0").decode()
+        self._flags = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size, shape=(count,))
+        self._slides = np.memmap(path, dtype=np.uint8, mode="r", offset=offset,
+                                 shape=(count, height, width, channels))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def ready(self, index: int) -> bool:
+        """Whether slide ``index`` has been written."""
+        return bool(self._flags[index])
+
+    def slide(self, index: int) -> Optional[np.ndarray]:
+        """Return a read-only view of slide ``index``, or None if it was never written."""
+        if not 0 <= index < self.count or not self._flags[index]:
+            return None
+        return self._slides[index]
+
+
+def write_deck_meta(folder: str, meta: Dict):
+    """Atomically write the deck metadata (page count, thumbnails, ...) into ``folder``."""
+    path = os.path.join(folder, DECK_META)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+
+
+def available_pages(meta: Dict) -> int:
+    """
+    Number of leading pages of a deck that can be shown.
+
+    A deck still being rendered lists its finished pages in ``ready_pages``; pages are only
+    available up to the first gap. A complete deck has all ``page_count`` pages available.
+    """
+    if meta.get("complete", True):
+        return meta.get("page_count", 0)
+    ready = set(meta.get("ready_pages", ()))
+    count = 0
+    while count + 1 in ready:
+        count += 1
+    return count
+
+
+def read_deck_meta(folder: str) -> Optional[Dict]:
+    """Return the deck metadata stored in ``folder``, or None when there is none."""
+    try:
+        with open(os.path.join(folder, DECK_META), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
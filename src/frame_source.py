@@ -0,0 +1,196 @@
+import os
+import re
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """
+    Source of BGR frames for the gesture loop.
+
+    The interface mirrors ``cv2.VideoCapture`` (``read``/``isOpened``/``release``) so a
+    source can be used wherever the controller previously used the camera directly.
+    """
+
+    # True once a finite source (video file, frame directory) has delivered its last frame
+    exhausted = False
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return ``(success, frame)`` for the next frame."""
+        raise NotImplementedError
+
+    def isOpened(self) -> bool:
+        """Whether the source can deliver frames."""
+        raise NotImplementedError
+
+    def release(self):
+        """Release any underlying device or file handle."""
+
+
+class _Pacer:
+    """Sleeps between frames so replay runs at the source's native frame rate."""
+
+    def __init__(self, fps: float, realtime: bool):
+        self.interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self._next = None
+
+    def wait(self):
+        """Block until the next frame is due."""
+        if not self.interval:
+            return
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        else:
+            # Running behind: don't try to catch up with a burst of frames
+            self._next = now
+        self._next += self.interval
+
+
+class CameraSource(FrameSource):
+    """Live camera, falling back through a list of device indices."""
+
+    def __init__(self, indices: List[int], width: int, height: int, fps: int = 30):
+        """Open the first camera in ``indices`` that is available."""
+        self.cap = None
+        for index in indices:
+            cap = cv2.VideoCapture(index)
+            if cap.isOpened():
+                self.cap = cap
+                self.index = index
+                break
+            logger.error(f"Failed to open camera {index}. Trying alternative camera index...")
+        if self.cap is None:
+            raise RuntimeError("No camera available")
+
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.cap.read()
+
+    def isOpened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource(FrameSource):
+    """Replays a recorded video file, in real time or as fast as possible."""
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False, fps: Optional[float] = None):
+        """Open ``path``; ``fps`` overrides the frame rate stored in the file."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Video file '{path}' not found")
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Failed to open video file '{path}'")
+        self.pacer = _Pacer(fps or self.cap.get(cv2.CAP_PROP_FPS) or 30, realtime)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        self.pacer.wait()
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        if not success:
+            self.exhausted = True
+        return success, frame
+
+    def isOpened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageSequenceSource(FrameSource):
+    """Replays a directory of frame images in natural filename order."""
+
+    def __init__(self, folder: str, realtime: bool = True, loop: bool = False, fps: float = 30,
+                 preload: bool = False):
+        """List the frames in ``folder``; with ``preload`` they are all decoded up front."""
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Frame directory '{folder}' not found")
+        self.paths = [
+            os.path.join(folder, f)
+            for f in sorted(os.listdir(folder), key=_natural_key)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        if not self.paths:
+            raise FileNotFoundError(f"No frame images found in '{folder}'")
+        self.loop = loop
+        self.pacer = _Pacer(fps, realtime)
+        self.position = 0
+        self.frames = [cv2.imread(p) for p in self.paths] if preload else None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        self.pacer.wait()
+        if self.position >= len(self.paths):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.position = 0
+        index = self.position
+        self.position += 1
+        if self.frames is not None:
+            # The controller only draws on its own flipped copy of a frame, never on the frame
+            # it is given, so sharing the preloaded one is safe
+            frame = self.frames[index]
+        else:
+            frame = cv2.imread(self.paths[index])
+        return frame is not None, frame
+
+    def isOpened(self) -> bool:
+        return True
+
+
+def _natural_key(name: str):
+    """Sort key that orders ``2.png`` before ``10.png``."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def create_frame_source(spec: Dict, width: int, height: int) -> FrameSource:
+    """
+    Build a frame source from a ``frame_source`` config block.
+
+    ``type`` is ``camera`` (default), ``video`` or ``images``. File sources take ``path``,
+    ``pacing`` (``realtime`` or ``fast``), ``loop`` and ``fps``.
+    """
+    source_type = spec.get('type', 'camera')
+    realtime = spec.get('pacing', 'realtime') == 'realtime'
+    if source_type == 'camera':
+        return CameraSource(spec.get('indices', [0, 1]), width, height, spec.get('fps', 30))
+    if source_type == 'video':
+        return VideoFileSource(spec['path'], realtime, spec.get('loop', False), spec.get('fps'))
+    if source_type == 'images':
+        return ImageSequenceSource(spec['path'], realtime, spec.get('loop', False),
+                                   spec.get('fps', 30), spec.get('preload', False))
+    raise ValueError(f"Unknown frame source type: {source_type}")
+
+
+def parse_source_argument(value: str) -> Dict:
+    """Turn a ``--source`` command-line value (camera index, video file or directory) into a spec."""
+    if value.isdigit():
+        return {'type': 'camera', 'indices': [int(value)]}
+    if os.path.isdir(value):
+        return {'type': 'images', 'path': value}
+    return {'type': 'video', 'path': value}
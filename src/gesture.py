@@ -1,14 +1,50 @@
+import time
+# Taken before the imports below, so the startup timings include them
+_IMPORT_START = time.perf_counter()
 import cv2
 import os
 import numpy as np
 import json
-import time
-from cvzone.HandTrackingModule import HandDetector
-from typing import List, Tuple, Optional, Dict
+import hashlib
+import signal
+import sys
+import argparse
+import atexit
+import queue
+from typing import Callable, List, Tuple, Optional, Dict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
+
+from slide_cache import SlideCache
+from deck import DECK_FILE, DeckReader, available_pages, read_deck_meta
+from pipeline import PipelinedRunner
+from annotations import AnnotationStore, AnnotationLayer
+from frame_source import create_frame_source, parse_source_argument
+from metrics import FrameMetrics
+from roi_detector import RoiHandDetector
+from hand_backends import HandBackend, create_hand_detector, draw_hands, DEFAULT_MODEL_PATH
+from inference_governor import InferenceGovernor
+from gesture_table import compile_gestures, fingers_mask, GestureVoter
+from control import ControlServer, DEFAULT_SOCKET_PATH
+from compositor import SlideCompositor
+from landmark_filter import LandmarkPredictor
+from slide_fingerprints import match_slides
+from startup import StartupPhases
+
+_IMPORTS_MS = 1000 * (time.perf_counter() - _IMPORT_START)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging through a queue so console I/O happens off the frame loop
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 class GestureController:
@@ -16,36 +52,125 @@ class GestureController:
     Hand gesture recognition controller for presentation navigation and annotation.
     """
     
-    def __init__(self, config_file: str = "config/gesture_config.json"):
-        """Initialize the gesture controller with configuration."""
+    MAX_ANNOTATION_LAYERS = 8
+    
+    def __init__(self, config_file: str = "config/gesture_config.json",
+                 config_overrides: Optional[Dict] = None, require_deck: bool = True,
+                 detector=None):
+        """
+        Initialize the gesture controller with configuration.
+        
+        With ``require_deck=False`` a missing deck is not an error: the controller starts
+        paused and waits for ``load_deck``. ``detector`` replaces the controller's own
+        ``HandDetector``, e.g. with a handle on a shared inference scheduler.
+        The camera, the hand model and the deck are opened concurrently.
+        """
+        self.startup = StartupPhases(round(_IMPORTS_MS, 2))
         self.config = self._load_config(config_file)
+        self.config.update(config_overrides or {})
         
         # Camera and display parameters
         self.width = self.config.get('width', 1280)
         self.height = self.config.get('height', 720)
         self.gesture_threshold = self.config.get('gesture_threshold', 600)
         self.folder_path = self.config.get('folder_path', 'data/slides/images')
+        self.frame_source = self.config.get('frame_source', {'type': 'camera'})
+        self.headless = self.config.get('headless', False)
+        
+        # Output parameters: OpenCV windows, an MJPEG/HTTP stream, or both
+        self.output_mode = self.config.get('output_mode', 'window')
+        self.show_windows = not self.headless and self.output_mode in ('window', 'both')
+        self.mjpeg_host = self.config.get('mjpeg_host', '127.0.0.1')
+        self.mjpeg_port = self.config.get('mjpeg_port', 8090)
+        self.mjpeg_quality = self.config.get('mjpeg_quality', 80)
+        self.mjpeg_max_fps = self.config.get('mjpeg_max_fps', 15)
+        self.mjpeg_camera = self.config.get('mjpeg_camera', False)
+        self.mjpeg_camera_overlay = self.config.get('mjpeg_camera_overlay', False)
         
         # Hand detection parameters
+        self.hand_backend = self.config.get('hand_backend', 'mediapipe_tasks')
+        self.hand_landmarker_model = self.config.get('hand_landmarker_model', DEFAULT_MODEL_PATH)
+        self.hand_running_mode = self.config.get('hand_running_mode', 'live_stream')
+        self.draw_landmarks = self.config.get('draw_landmarks', False)
         self.detection_confidence = self.config.get('detection_confidence', 0.8)
         self.max_hands = self.config.get('max_hands', 1)
+        self.detection_mode = self.config.get('detection_mode', 'full')
+        self.inference_scale = self.config.get('inference_scale', 0.5)
+        self.roi_margin = self.config.get('roi_margin', 0.5)
+        self.inference_governor = self.config.get('inference_governor', {})
         
         # Gesture control parameters
-        self.delay = self.config.get('delay', 7)
+        self.gesture_table = compile_gestures(self.config.get('gestures', {}))
+        self.gesture_vote_window = self.config.get('gesture_vote_window', 5)
+        self.gesture_vote_min = self.config.get('gesture_vote_min', 3)
+        self.landmark_filter = LandmarkPredictor(self.config.get('landmark_filter', {}))
         self.annotation_color = tuple(self.config.get('annotation_color', [0, 0, 255]))
         self.annotation_thickness = self.config.get('annotation_thickness', 12)
+        self.annotation_min_distance = self.config.get('annotation_min_distance', 4)
+        self.annotation_simplify_epsilon = self.config.get('annotation_simplify_epsilon', 1.5)
+        self.annotations_path = self.config.get('annotations_path', 'data/slides/annotations.npz')
+        
+        # Slide cache parameters
+        self.slide_cache_mb = self.config.get('slide_cache_mb', 256)
+        self.slide_prefetch = self.config.get('slide_prefetch', 2)
+        self.deck_watch_interval = self.config.get('deck_watch_interval', 0.5)
+        self.deck_complete = True
+        self._next_deck_check = 0.0
+        
+        # Frame loop parameters
+        self.pipeline_mode = self.config.get('pipeline_mode', 'sequential')
+        self.pipeline_buffer_size = self.config.get('pipeline_buffer_size', 1)
+        self.pipeline_stats_interval = self.config.get('pipeline_stats_interval', 5.0)
+        # Frames can be queued for display while the next one is composed, so threaded mode
+        # rotates through enough preallocated buffers that none is overwritten while in use
+        self._render_buffers = self.pipeline_buffer_size + 2 if self.pipeline_mode == 'threaded' else 1
+        self._flip_buffers: List[Optional[np.ndarray]] = [None] * self._render_buffers
+        self._flip_next = 0
+        
+        # Metrics parameters
+        self.metrics = FrameMetrics(
+            json_path=self.config.get('metrics_path', 'data/metrics/gesture_metrics.json'),
+            prometheus_path=self.config.get('metrics_prometheus_path', ''),
+            interval=self.config.get('metrics_interval', 5.0),
+            enabled=self.config.get('metrics_enabled', True)
+        )
+        self.control_socket = self.config.get('control_socket', DEFAULT_SOCKET_PATH)
+        
+        # Commands from other threads (control socket, pipelined key presses) run on the frame loop
+        self.commands: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self.paused = False
+        self.quit_requested = False
+        self._windows_shown = False
         
         # Initialize components
-        # The following methods are defined as private methods within this class:
+        # Opening the camera, loading the hand model (which imports MediaPipe) and opening
+        # the deck are independent and mostly wait on devices, files or native code, so
+        # they run on their own threads:
         # - self._setup_camera(): Initializes the camera for capturing video frames.
         # - self._setup_hand_detector(): Sets up the hand detection module.
-        # - self._load_presentation_images(): Loads images used for the presentation.
-        self._setup_camera()
-        self._setup_hand_detector()
-        self._load_presentation_images()
+        # - self._open_deck(): Loads images used for the presentation.
+        self.startup.run('camera', self._setup_camera)
+        self.startup.run('hand_model', self._setup_hand_detector, detector)
+        self.startup.run('deck', self._open_deck, require_deck)
+        try:
+            try:
+                self.startup.call('output', self._setup_output)
+            finally:
+                # Even after a failure, let every phase finish so what it opened can be closed
+                self.startup.wait()
+        except Exception:
+            # Close the camera, hand model and slide cache of the phases that did succeed,
+            # or each retry would leak their devices and threads
+            self.cleanup()
+            raise
+        self.metrics.add_source('startup', self.startup.report)
+        # With a mirroring backend, a full flipped camera image is only made when it is shown
+        self.flip_camera_view = (not self.mirror_landmarks or self.show_windows or
+                                 self.camera_stream is not None or self.draw_landmarks)
         
         # State variables
         self.reset_state()
+        self._load_annotations()
         
     def _load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file."""
@@ -63,252 +188,597 @@ class GestureController:
             raise RuntimeError(f"Failed to load configuration: {e}")
     
     def _setup_camera(self):
-        """Initialize camera with error handling."""
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            logger.error("Failed to open camera. Trying alternative camera index...")
-            self.cap = cv2.VideoCapture(1)
-            if not self.cap.isOpened():
-                raise RuntimeError("No camera available")
-        
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
-        logger.info("Camera initialized successfully")
-    
-    def _setup_hand_detector(self):
-        """Initialize hand detector."""
+        """Open the configured frame source (live camera, video file or frame directory)."""
+        self.cap = create_frame_source(self.frame_source, self.width, self.height)
+        logger.info(f"Frame source '{self.frame_source.get('type', 'camera')}' initialized successfully")
+    
+    def _setup_hand_detector(self, detector=None):
+        """Initialize hand detector, or wrap the given one."""
         try:
-            self.detector = HandDetector(
-                detectionCon=self.detection_confidence,
-                maxHands=self.max_hands
-            )
+            if detector is None:
+                detector = create_hand_detector(
+                    self.hand_backend,
+                    model_path=self.hand_landmarker_model,
+                    running_mode=self.hand_running_mode,
+                    max_hands=self.max_hands,
+                    detection_confidence=self.detection_confidence
+                )
+            self._hand_backend = detector
+            self.detector = detector
+            # Such backends take the frame as captured, so only a displayed camera view is flipped
+            self.mirror_landmarks = getattr(detector, 'mirrors_landmarks', False)
+            if isinstance(detector, HandBackend):
+                self.metrics.add_source('hand_backend', detector.stats)
+            if self.detection_mode != 'full' and self.mirror_landmarks:
+                # Crops would be taken from the unflipped frame; the landmarker tracks hands itself
+                logger.warning(f"detection_mode '{self.detection_mode}' needs the cvzone backend; using full frames")
+                self.detection_mode = 'full'
+            if self.detection_mode != 'full':
+                self.detector = RoiHandDetector(
+                    self.detector,
+                    mode=self.detection_mode,
+                    scale=self.inference_scale,
+                    margin=self.roi_margin
+                )
+                self.metrics.add_source('detector', self.detector.stats)
+            governor = self.inference_governor
+            if governor.get('enabled', True):
+                self.detector = InferenceGovernor(
+                    self.detector,
+                    idle_after_frames=governor.get('idle_after_frames', 30),
+                    min_rate=governor.get('min_rate', 2.0),
+                    max_rate=governor.get('max_rate', 0.0),
+                    motion_width=governor.get('motion_width', 64),
+                    motion_threshold=governor.get('motion_threshold', 0.02),
+                    motion_pixel_delta=governor.get('motion_pixel_delta', 25)
+                )
+                self.metrics.add_source('inference_governor', self.detector.stats)
             logger.info("Hand detector initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize hand detector: {e}")
             raise
     
+    def _setup_output(self):
+        """Create the MJPEG streams when the output mode asks for them."""
+        self.slide_stream: Optional["MjpegStream"] = None
+        self.camera_stream: Optional["MjpegStream"] = None
+        self.mjpeg_server: Optional["MjpegServer"] = None
+        if self.output_mode not in ('mjpeg', 'both'):
+            return
+        # Only imported when streaming, as it pulls in the HTTP server
+        from mjpeg import MjpegStream, MjpegServer
+        
+        streams = {'slides': MjpegStream('slides', self.mjpeg_quality, self.mjpeg_max_fps)}
+        if self.mjpeg_camera:
+            streams['camera'] = MjpegStream('camera', self.mjpeg_quality, self.mjpeg_max_fps)
+        self.slide_stream = streams['slides']
+        self.camera_stream = streams.get('camera')
+        self.mjpeg_server = MjpegServer(streams, self.mjpeg_host, self.mjpeg_port)
+        self.metrics.add_source('mjpeg', self.mjpeg_server.stats)
+    
+    def _open_deck(self, require_deck: bool):
+        """Load the configured deck; without ``require_deck`` a missing one leaves the controller paused."""
+        try:
+            self._load_presentation_images()
+        except FileNotFoundError:
+            if require_deck:
+                raise
+            logger.info("No slides to present yet; waiting for a deck to be loaded")
+            self._clear_deck()
+            self.paused = True
+    
     def _load_presentation_images(self):
-        """Load and validate presentation images."""
+        """Open the packed slide deck, or fall back to the loose presentation images."""
         if not os.path.exists(self.folder_path):
             logger.error(f"Presentation folder '{self.folder_path}' not found")
             raise FileNotFoundError(f"Folder '{self.folder_path}' not found")
         
+        self.deck = None
+        self.path_images = []
+        # A deck still being converted has a manifest listing its finished pages
+        meta = read_deck_meta(self.folder_path)
+        self.deck_complete = meta is None or meta.get("complete", True)
+        deck_files = [DECK_FILE] if self.deck_complete else [meta.get("deck_file"), DECK_FILE]
+        for deck_file in filter(None, deck_files):
+            deck_path = os.path.join(self.folder_path, deck_file)
+            if not os.path.exists(deck_path):
+                continue
+            try:
+                # The converter renames its deck into place when done; this mapping stays valid
+                self.deck = DeckReader(deck_path)
+                break
+            except ValueError as e:
+                logger.warning(f"Ignoring unreadable deck: {e}")
+        
+        if self.deck is not None:
+            if (self.deck.width, self.deck.height) != (self.width, self.height):
+                logger.warning(
+                    f"Deck was packed at {self.deck.width}x{self.deck.height}, "
+                    f"display is {self.width}x{self.height}"
+                )
+            # Deck slides are memory-mapped views, so there is nothing to decode ahead of time
+            loader, prefetch_radius = self.deck.slide, 0
+        else:
+            loader, prefetch_radius = self._read_slide, self.slide_prefetch
+        
+        if not self.deck_complete:
+            self.slide_count = available_pages(meta)
+            if self.slide_count == 0:
+                raise FileNotFoundError(f"No slides of '{self.folder_path}' are rendered yet")
+            if self.deck is None:
+                self.path_images = [f"{page}.png" for page in range(1, self.slide_count + 1)]
+            logger.info(f"Opened deck in progress: {self.slide_count} of {meta['page_count']} slides ready")
+        elif self.deck is not None:
+            self.slide_count = len(self.deck)
+            logger.info(f"Opened slide deck with {self.slide_count} slides")
+        else:
+            try:
+                self.path_images = sorted(
+                    [f for f in os.listdir(self.folder_path) 
+                     if f.lower().endswith(('.png', '.jpg', '.jpeg'))],
+                    key=len
+                )
+                if not self.path_images:
+                    logger.error(f"No image files found in '{self.folder_path}'")
+                    raise FileNotFoundError("No presentation images found")
+                
+                self.slide_count = len(self.path_images)
+                logger.info(f"Loaded {self.slide_count} presentation images")
+            except Exception as e:
+                logger.error(f"Error loading presentation images: {e}")
+                raise
+        
+        self.slide_cache = SlideCache(
+            loader,
+            max_bytes=int(self.slide_cache_mb * 1024 * 1024),
+            prefetch_radius=prefetch_radius
+        )
+        self.slide_cache.prefetch(0, self.slide_count)
+        self.metrics.add_source('slide_cache', lambda: {
+            'hits': self.slide_cache.hits,
+            'misses': self.slide_cache.misses,
+            'bytes': self.slide_cache.nbytes
+        })
+    
+    def _clear_deck(self):
+        """Forget the loaded deck."""
+        self.deck = None
+        self.path_images = []
+        self.slide_count = 0
+        self.slide_cache = None
+    
+    def load_deck(self, folder_path: str) -> Dict:
+        """
+        Switch to the slides in ``folder_path``; the camera and hand detector stay open.
+
+        When the new deck is a re-conversion of the loaded one, it is updated in place: the
+        current slide and the annotations of unchanged slides carry over.
+        """
+        previous_meta = None
+        if self.slide_count:
+            self._end_annotation()
+            self._save_annotations()
+            previous_meta = read_deck_meta(self.folder_path)
+        previous = (self.folder_path, self.deck, self.path_images, self.slide_count, self.slide_cache,
+                    self.deck_complete)
+        self.folder_path = folder_path
         try:
-            self.path_images = sorted(
-                [f for f in os.listdir(self.folder_path) 
-                 if f.lower().endswith(('.png', '.jpg', '.jpeg'))],
-                key=len
-            )
-            if not self.path_images:
-                logger.error(f"No image files found in '{self.folder_path}'")
-                raise FileNotFoundError("No presentation images found")
-            
-            logger.info(f"Loaded {len(self.path_images)} presentation images")
-        except Exception as e:
-            logger.error(f"Error loading presentation images: {e}")
+            self._load_presentation_images()
+        except Exception:
+            (self.folder_path, self.deck, self.path_images, self.slide_count, self.slide_cache,
+             self.deck_complete) = previous
             raise
+        if previous[4] is not None:
+            previous[4].close()
+        
+        matches = match_slides(previous_meta, read_deck_meta(folder_path)) if previous_meta else None
+        if matches:
+            self._update_deck_in_place(matches)
+            logger.info(f"Updated deck in place from '{folder_path}': {len(matches)} of {self.slide_count} slides unchanged")
+        else:
+            self.reset_state()
+            self._load_annotations()
+            logger.info(f"Loaded deck from '{folder_path}'")
+        return self.status()
+    
+    def _update_deck_in_place(self, matches: Dict[int, int]):
+        """Carry the current slide and annotations over to a new version of the deck."""
+        moves = {}
+        for new_index, old_index in matches.items():
+            moves.setdefault(old_index, new_index)
+        self.img_number = min(moves.get(self.img_number, self.img_number), self.slide_count - 1)
+        self.annotations.remap(moves)
+        self.annotation_layers.clear()
+        self.slide_cache.prefetch(self.img_number, self.slide_count)
+        self._save_annotations()
+    
+    def _refresh_deck(self):
+        """Pick up the slides of a deck in progress that were rendered since the last check."""
+        self._next_deck_check = time.perf_counter() + self.deck_watch_interval
+        meta = read_deck_meta(self.folder_path)
+        if meta is None:
+            # The conversion failed; keep presenting the slides that made it
+            logger.warning(f"Deck '{self.folder_path}' lost its manifest; no more slides will arrive")
+            self.deck_complete = True
+            return
+        self.deck_complete = meta.get("complete", True)
+        available = available_pages(meta)
+        if available > self.slide_count:
+            if self.deck is None:
+                self.path_images = [f"{page}.png" for page in range(1, available + 1)]
+            logger.info(f"Slides ready: {available} of {meta['page_count']}")
+            self.slide_count = available
+            self.slide_cache.prefetch(self.img_number, self.slide_count)
+    
+    def pause(self):
+        """Stop processing frames, keeping the camera, detector and deck loaded."""
+        self._end_annotation()
+        self.paused = True
+        logger.info("Paused")
+    
+    def resume(self):
+        """Resume processing frames."""
+        if not self.slide_count:
+            raise RuntimeError("No deck loaded")
+        self.gesture_voter.reset()
+        self.paused = False
+        self.startup.expect_frame()
+        logger.info("Resumed")
+    
+    def request_quit(self):
+        """Ask the frame loop to exit."""
+        self.quit_requested = True
+    
+    def status(self) -> Dict:
+        """Return a summary of the controller state."""
+        return {
+            "deck": os.path.abspath(self.folder_path) if self.slide_count else None,
+            "slide": self.img_number + 1 if self.slide_count else 0,
+            "slide_count": self.slide_count,
+            "deck_complete": self.deck_complete,
+            "paused": self.paused,
+            "fps": round(self.metrics.fps, 2),
+            "frames": self.metrics.frames,
+            "detection_mode": self.detection_mode,
+            "detection_rate": round(self.detector.rate, 2) if isinstance(self.detector, InferenceGovernor) else None,
+            "startup": self.startup.report(),
+        }
+    
+    def submit(self, command: Callable[[], None]):
+        """Run ``command`` on the frame-loop thread before its next frame."""
+        self.commands.put(command)
+    
+    def call(self, command: Callable, timeout: float = 5.0):
+        """Run ``command`` on the frame-loop thread and return its result."""
+        future: Future = Future()
+        
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(command())
+                except Exception as e:
+                    future.set_exception(e)
+        
+        self.submit(run)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Controller did not respond within {timeout:.0f}s")
+    
+    def _run_commands(self):
+        """Run the commands queued by other threads."""
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                command()
+            except Exception as e:
+                logger.error(f"Error running controller command: {e}")
+    
+    def _hide_windows(self):
+        """Close the slide and camera windows while paused (call from the display thread)."""
+        if self._windows_shown:
+            cv2.destroyAllWindows()
+            self._windows_shown = False
+    
+    def _read_slide(self, index: int) -> Optional[np.ndarray]:
+        """Decode a single slide image from disk."""
+        path_full_image = os.path.join(self.folder_path, self.path_images[index])
+        img = cv2.imread(path_full_image)
+        if img is None:
+            logger.error(f"Failed to load image: {path_full_image}")
+        return img
     
     def reset_state(self):
         """Reset all state variables."""
-        self.button_pressed = False
-        self.counter = 0
+        self.gesture_voter = GestureVoter(self.gesture_vote_window, self.gesture_vote_min)
         self.img_number = 0
-        self.annotations = [[]]
-        self.annotation_number = -1
+        self.annotations = AnnotationStore(
+            min_distance=self.annotation_min_distance,
+            epsilon=self.annotation_simplify_epsilon
+        )
+        self.annotation_layers: "OrderedDict[int, AnnotationLayer]" = OrderedDict()
         self.annotation_start = False
-        self.last_gesture_time = 0
-        self.gesture_cooldown = 0.5  # seconds
         
         # Small image dimensions for overlay
         self.hs, self.ws = int(120 * 1), int(213 * 1)
+        self.compositor = SlideCompositor(self._render_buffers, (self.ws, self.hs))
     
-    def _get_gesture_name(self, fingers: List[int]) -> Optional[str]:
+    def _get_gesture_name(self, finger_mask: int) -> Optional[str]:
         """Identify gesture based on finger configuration."""
-        gestures = self.config.get('gestures', {})
-        for gesture_name, finger_pattern in gestures.items():
-            if fingers == finger_pattern:
-                return gesture_name
-        return None
+        return self.gesture_table[finger_mask]
     
-    def _handle_gesture(self, gesture_name: str, hand_center: Tuple[int, int]):
-        """Handle recognized gestures."""
-        current_time = time.time()
-        
-        # Prevent rapid gesture triggering
-        if current_time - self.last_gesture_time < self.gesture_cooldown:
-            return
-        
-        cy = hand_center[1]
-        
-        if cy <= self.gesture_threshold:  # Hand is at face level
-            if gesture_name == 'next_slide':
-                self._next_slide()
-            elif gesture_name == 'previous_slide':
-                self._previous_slide()
-            elif gesture_name == 'erase':
-                self._erase_last_annotation()
-        
-        self.last_gesture_time = current_time
+    def _handle_gesture(self, gesture_name: str):
+        """Handle a gesture triggered by the voting state machine."""
+        if gesture_name == 'next_slide':
+            self._next_slide()
+        elif gesture_name == 'previous_slide':
+            self._previous_slide()
+        elif gesture_name == 'erase':
+            self._erase_last_annotation()
     
     def _next_slide(self):
         """Navigate to next slide."""
-        if self.img_number < len(self.path_images) - 1:
+        if self.img_number < self.slide_count - 1:
             self.img_number += 1
-            self._reset_annotations()
-            logger.info(f"Next slide: {self.img_number + 1}/{len(self.path_images)}")
+            self.slide_cache.prefetch(self.img_number, self.slide_count)
+            self._end_annotation()
+            logger.info(f"Next slide: {self.img_number + 1}/{self.slide_count}")
     
     def _previous_slide(self):
         """Navigate to previous slide."""
         if self.img_number > 0:
             self.img_number -= 1
-            self._reset_annotations()
-            logger.info(f"Previous slide: {self.img_number + 1}/{len(self.path_images)}")
+            self.slide_cache.prefetch(self.img_number, self.slide_count)
+            self._end_annotation()
+            logger.info(f"Previous slide: {self.img_number + 1}/{self.slide_count}")
     
     def _reset_annotations(self):
-        """Reset annotations for new slide."""
-        self.annotations = [[]]
-        self.annotation_number = -1
+        """Remove all annotations from the current slide."""
+        self.annotations.clear(self.img_number)
         self.annotation_start = False
     
+    def _end_annotation(self):
+        """Finish the stroke in progress, if any."""
+        if self.annotation_start:
+            self.annotations.end_stroke()
+            self.annotation_start = False
+    
     def _erase_last_annotation(self):
         """Erase the last annotation."""
-        if self.annotations:
-            self.annotations.pop(-1)
-            self.annotation_number -= 1
-            self.button_pressed = True
+        self.annotation_start = False
+        if self.annotations.pop_stroke(self.img_number):
             logger.info("Erased last annotation")
     
-    def _handle_drawing(self, index_finger: Tuple[int, int], fingers: List[int]):
+    def _deck_id(self) -> str:
+        """Fingerprint the loaded slide files so annotations are matched to their deck."""
+        if self.deck is not None and self.deck.deck_id:
+            return self.deck.deck_id
+        digest = hashlib.sha1()
+        for name in self.path_images:
+            size = os.path.getsize(os.path.join(self.folder_path, name))
+            digest.update(f"{name}:{size};".encode())
+        return digest.hexdigest()
+    
+    def _annotations_file(self) -> str:
+        """Where this deck's annotations are kept: ``annotations_path`` with the deck ID appended."""
+        root, extension = os.path.splitext(self.annotations_path)
+        return f"{root}_{self._deck_id()[:16]}{extension}"
+    
+    def _load_annotations(self):
+        """Restore annotations saved for this deck by a previous session."""
+        if not self.annotations_path:
+            return
+        path = self._annotations_file()
+        try:
+            # Earlier versions kept the annotations of the last deck in annotations_path itself
+            for candidate in (path, self.annotations_path):
+                if self.annotations.load(candidate, self._deck_id()):
+                    logger.info(f"Loaded annotations from {candidate}")
+                    break
+        except Exception as e:
+            logger.error(f"Error loading annotations: {e}")
+    
+    def _save_annotations(self):
+        """Persist annotations so they survive a controller restart or a switch to another deck."""
+        if not self.annotations_path:
+            return
+        path = self._annotations_file()
+        try:
+            self.annotations.save(path, self._deck_id())
+            logger.info(f"Saved annotations to {path}")
+        except Exception as e:
+            logger.error(f"Error saving annotations: {e}")
+    
+    def _handle_drawing(self, index_finger: Tuple[int, int], gesture_name: Optional[str]):
         """Handle drawing/annotation functionality."""
-        if fingers == [0, 1, 0, 0, 0]:  # Index finger only
+        if gesture_name == 'draw':
             if not self.annotation_start:
                 self.annotation_start = True
-                self.annotation_number += 1
-                self.annotations.append([])
+                self.annotations.begin_stroke(self.img_number)
             
-            self.annotations[self.annotation_number].append(index_finger)
+            self.annotations.add_point(index_finger)
         else:
-            self.annotation_start = False
+            self._end_annotation()
     
-    def _handle_pointer(self, index_finger: Tuple[int, int], fingers: List[int]):
+    def _handle_pointer(self, index_finger: Tuple[int, int], gesture_name: Optional[str]):
         """Handle pointer functionality."""
-        if fingers == [0, 1, 1, 0, 0]:  # Two fingers
+        if gesture_name == 'pointer':
             return index_finger
         return None
     
-    def _process_frame(self, img: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Process a single frame and return processed images."""
-        # Flip image horizontally for mirror effect
-        img = cv2.flip(img, 1)
+    def _process_frame(self, img: np.ndarray,
+                       capture_time: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Process a frame captured at ``capture_time`` (``perf_counter``) and return processed images."""
+        t = time.perf_counter()
+        if capture_time is None:
+            capture_time = t
+        if not self.deck_complete and t >= self._next_deck_check:
+            self._refresh_deck()
         
-        # Load current slide
-        try:
-            path_full_image = os.path.join(self.folder_path, self.path_images[self.img_number])
-            img_current = cv2.imread(path_full_image)
-            if img_current is None:
-                logger.error(f"Failed to load image: {path_full_image}")
-                return img, img
-        except Exception as e:
-            logger.error(f"Error loading slide: {e}")
-            return img, img
-        
-        # Find hands
-        hands, img = self.detector.findHands(img)
+        if self.mirror_landmarks:
+            # The backend mirrors the landmarks, so the frame is only flipped for display
+            hands, _ = self.detector.findHands(img, draw=False)
+            t = self.metrics.lap('detect', t)
+            if self.flip_camera_view:
+                img = self._flip(img)
+                if self.draw_landmarks:
+                    draw_hands(img, hands)
+            t = self.metrics.lap('flip', t)
+        else:
+            # Flip image horizontally for mirror effect, into a preallocated buffer
+            img = self._flip(img)
+            t = self.metrics.lap('flip', t)
+            hands, img = self.detector.findHands(img, draw=self.draw_landmarks)
+            t = self.metrics.lap('detect', t)
         
-        # Draw gesture threshold line
-        cv2.line(img, (0, self.gesture_threshold), (self.width, self.gesture_threshold), (0, 255, 0), 10)
+        # Draw gesture threshold line; an unflipped frame is still the frame source's own
+        # array, so it is never drawn on and the line goes on the overlay thumbnail instead
+        if self.flip_camera_view:
+            cv2.line(img, (0, self.gesture_threshold), (self.width, self.gesture_threshold), (0, 255, 0), 10)
         
-        if hands and not self.button_pressed:
+        gesture_name = None
+        marks = ()
+        if hands:
             hand = hands[0]
             cx, cy = hand["center"]
-            lm_list = hand["lmList"]
-            fingers = self.detector.fingersUp(hand)
+            lm = np.asarray(hand["lmList"])
+            
+            # Identify gestures from the compiled finger-mask table
+            gesture_name = self._get_gesture_name(fingers_mask(lm, hand.get("type", "Right")))
+            
+            # Smooth and latency-compensate the landmarks as configured for this gesture. An
+            # asynchronous backend's hands come from an earlier frame and say when it was submitted,
+            # so they are timed from then, including the inference delay
+            sample_time = hand.get("timestamp", capture_time)
+            points = self.landmark_filter.update(
+                lm[:, :2], sample_time, gesture_name, time.perf_counter() - sample_time
+            )
             
             # Map index finger position to slide coordinates
-            x_val = int(np.interp(lm_list[8][0], [self.width // 2, self.width], [0, self.width]))
-            y_val = int(np.interp(lm_list[8][1], [150, self.height-150], [0, self.height]))
+            x_val = int(np.interp(points[8][0], [self.width // 2, self.width], [0, self.width]))
+            y_val = int(np.interp(points[8][1], [150, self.height-150], [0, self.height]))
             index_finger = (x_val, y_val)
             
-            # Identify and handle gestures
-            gesture_name = self._get_gesture_name(fingers)
-            if gesture_name:
-                self._handle_gesture(gesture_name, (cx, cy))
-            
             # Handle drawing
-            self._handle_drawing(index_finger, fingers)
+            self._handle_drawing(index_finger, gesture_name)
             
-            # Handle pointer
-            pointer_pos = self._handle_pointer(index_finger, fingers)
+            # Pointer and drawing position are transient marks over the slide
+            pointer_pos = self._handle_pointer(index_finger, gesture_name)
             if pointer_pos:
-                cv2.circle(img_current, pointer_pos, 12, self.annotation_color, cv2.FILLED)
+                marks = ((pointer_pos, 12, self.annotation_color),)
+            elif gesture_name == 'draw':
+                marks = ((index_finger, 12, self.annotation_color),)
             
-            # Draw annotation points
-            if fingers == [0, 1, 0, 0, 0]:
-                cv2.circle(img_current, index_finger, 12, self.annotation_color, cv2.FILLED)
+            # Slide and erase gestures only count with the hand at face level
+            if cy > self.gesture_threshold:
+                gesture_name = None
         else:
-            self.annotation_start = False
+            self._end_annotation()
+            self.landmark_filter.reset()
+        
+        # Discrete gestures fire once they win the N-frame vote
+        triggered = self.gesture_voter.update(gesture_name)
+        if triggered:
+            self._handle_gesture(triggered)
+        
+        t = self.metrics.lap('gesture', t)
+        
+        # Switch the compositor's base to the current slide (a read-only view, never copied)
+        base_changed = False
+        key = (self.slide_cache, self.img_number)
+        if key != self.compositor.base_key:
+            try:
+                slide = self.slide_cache.get(self.img_number, copy=False)
+            except Exception as e:
+                logger.error(f"Error loading slide: {e}")
+                slide = None
+            if slide is None:
+                return img, img
+            base_changed = self.compositor.set_base(slide, key)
+        t = self.metrics.lap('slide', t)
         
-        # Handle button press delay
-        if self.button_pressed:
-            self.counter += 1
-            if self.counter > self.delay:
-                self.counter = 0
-                self.button_pressed = False
+        # Recomposite only the annotation regions that changed
+        self._draw_annotations(base_changed)
+        t = self.metrics.lap('annotations', t)
         
-        # Draw annotations
-        self._draw_annotations(img_current)
+        img_current = self.compositor.compose(marks)
+        if self.slide_stream is not None and not self.mjpeg_camera_overlay:
+            self.slide_stream.publish(img_current, self.compositor.view_changed)
         
         # Add camera overlay
-        self._add_camera_overlay(img_current, img)
+        self.compositor.draw_overlay(img, mirror=not self.flip_camera_view,
+                                     line_y=None if self.flip_camera_view else self.gesture_threshold)
+        if self.slide_stream is not None and self.mjpeg_camera_overlay:
+            self.slide_stream.publish(img_current)
+        if self.camera_stream is not None:
+            self.camera_stream.publish(img)
+        self.metrics.lap('overlay', t)
+        if self.startup.awaiting_frame:
+            self.startup.frame_done()
         
         return img_current, img
     
-    def _draw_annotations(self, img_current: np.ndarray):
-        """Draw all annotations on the current slide."""
-        for annotation in self.annotations:
-            for j in range(len(annotation)):
-                if j != 0:
-                    cv2.line(img_current, annotation[j - 1], annotation[j], 
-                            (0, 0, 200), self.annotation_thickness)
+    def _flip(self, img: np.ndarray) -> np.ndarray:
+        """Mirror ``img`` into the next buffer of a preallocated ring."""
+        buffer = self._flip_buffers[self._flip_next]
+        if buffer is None or buffer.shape != img.shape:
+            buffer = self._flip_buffers[self._flip_next] = np.empty_like(img)
+        self._flip_next = (self._flip_next + 1) % len(self._flip_buffers)
+        return cv2.flip(img, 1, buffer)
+    
+    def _draw_annotations(self, base_changed: bool):
+        """Bring the compositor's annotation layer up to date with the current slide."""
+        layer = self._annotation_layer(self.compositor.canvas.shape[:2])
+        if layer is None:
+            return
+        dirty = layer.sync(self.annotations, self.img_number)
+        if base_changed:
+            # A fresh base needs the whole layer, not just what changed since the last frame
+            self.compositor.update_annotations(layer)
+        elif dirty is not None:
+            self.compositor.update_annotations(layer, dirty)
     
-    def _add_camera_overlay(self, img_current: np.ndarray, img: np.ndarray):
-        """Add camera feed as overlay on slide."""
-        h, w, _ = img_current.shape
-        img_small = cv2.resize(img, (self.ws, self.hs))
-        img_current[0:self.hs, w - self.ws: w] = img_small
+    def _annotation_layer(self, shape: Tuple[int, int]) -> Optional[AnnotationLayer]:
+        """Return the raster layer for the current slide, creating it once it has strokes."""
+        layer = self.annotation_layers.get(self.img_number)
+        if layer is not None and layer.mask.shape == shape:
+            self.annotation_layers.move_to_end(self.img_number)
+            return layer
+        if self.annotations.stroke_count(self.img_number) == 0:
+            return None
+        
+        layer = AnnotationLayer(shape, (0, 0, 200), self.annotation_thickness)
+        self.annotation_layers[self.img_number] = layer
+        # Layers are cheap to re-rasterize, so only keep those of recently shown slides
+        while len(self.annotation_layers) > self.MAX_ANNOTATION_LAYERS:
+            self.annotation_layers.popitem(last=False)
+        return layer
     
     def run(self):
         """Main loop for gesture recognition."""
         logger.info("Starting gesture recognition...")
         logger.info("Press 'q' to quit, 'r' to reset annotations")
         
+        self.metrics.start()
+        if self.mjpeg_server is not None:
+            self.mjpeg_server.start()
         try:
-            while True:
-                success, img = self.cap.read()
-                if not success:
-                    logger.error("Failed to read frame from camera")
-                    break
-                
-                # Process frame
-                img_current, img = self._process_frame(img)
-                
-                # Display images
-                cv2.imshow("Slides", img_current)
-                cv2.imshow("Camera Feed", img)
-                
-                # Handle key presses
-                key = cv2.waitKey(1)
-                if key == ord('q'):
-                    logger.info("Quitting...")
-                    break
-                elif key == ord('r'):
-                    self._reset_annotations()
-                    logger.info("Reset annotations")
-                elif key == ord('n'):
-                    self._next_slide()
-                elif key == ord('p'):
-                    self._previous_slide()
+            if self.pipeline_mode == 'threaded':
+                logger.info("Using threaded capture/inference/render pipeline")
+                runner = PipelinedRunner(
+                    self,
+                    buffer_size=self.pipeline_buffer_size,
+                    stats_interval=self.pipeline_stats_interval,
+                    headless=not self.show_windows
+                )
+                self.metrics.add_source('pipeline', runner.stats)
+                runner.run()
+            else:
+                self._run_sequential()
         
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
@@ -317,26 +787,160 @@ class GestureController:
         finally:
             self.cleanup()
     
+    def _run_sequential(self):
+        """Capture, process and display frames one after another on one thread."""
+        frames = 0
+        start_time = time.perf_counter()
+        while True:
+            self._run_commands()
+            if self.quit_requested:
+                break
+            if self.paused:
+                self._hide_windows()
+                time.sleep(0.05)
+                continue
+            
+            t = time.perf_counter()
+            success, img = self.cap.read()
+            capture_time = self.metrics.lap('capture', t)
+            if not success:
+                if self.cap.exhausted:
+                    logger.info("Frame source exhausted")
+                else:
+                    logger.error("Failed to read frame from camera")
+                break
+            
+            # Process frame
+            img_current, img = self._process_frame(img, capture_time)
+            frames += 1
+            
+            if not self.show_windows:
+                self.metrics.frame_done(capture_time)
+                continue
+            
+            # Display images
+            t = time.perf_counter()
+            cv2.imshow("Slides", img_current)
+            cv2.imshow("Camera Feed", img)
+            self._windows_shown = True
+            key = cv2.waitKey(1)
+            self.metrics.lap('display', t)
+            self.metrics.frame_done(capture_time)
+            
+            # Handle key presses
+            if not self._handle_key(key):
+                break
+        
+        elapsed = time.perf_counter() - start_time
+        if frames and elapsed > 0:
+            logger.info(f"Processed {frames} frames in {elapsed:.2f}s ({frames / elapsed:.1f} fps)")
+    
+    def _handle_key(self, key: int) -> bool:
+        """Handle a keyboard shortcut. Returns False when the user asked to quit."""
+        if key == ord('q'):
+            logger.info("Quitting...")
+            return False
+        elif key == ord('r'):
+            self._reset_annotations()
+            logger.info("Reset annotations")
+        elif key == ord('n'):
+            self._next_slide()
+        elif key == ord('p'):
+            self._previous_slide()
+        return True
+    
     def stop_presentation(self):
         """Stop the presentation and clean up all resources (camera, windows)."""
         self.cleanup()
     
     def cleanup(self):
         """Clean up resources."""
+        if hasattr(self, 'annotations') and self.slide_count:
+            self._save_annotations()
+        if hasattr(self, 'metrics'):
+            self.metrics.stop()
+        if getattr(self, 'mjpeg_server', None) is not None:
+            self.mjpeg_server.stop()
+            self.mjpeg_server = None
+        if isinstance(getattr(self, '_hand_backend', None), HandBackend):
+            self._hand_backend.close()
+            self._hand_backend = None
         if hasattr(self, 'cap') and self.cap is not None:
             self.cap.release()
             self.cap = None
+        if hasattr(self, 'slide_cache') and self.slide_cache is not None:
+            self.slide_cache.close()
+            self.slide_cache = None
         try:
             cv2.destroyAllWindows()
         except Exception as e:
             logger.error(f"Error closing OpenCV windows: {e}")
         logger.info("Cleanup completed")
 
-def main():
-    """Main entry point."""
+def run_daemon(config_file: str, overrides: Dict):
+    """Run a resident controller that is driven through its control socket."""
+    controller = GestureController(config_file, overrides, require_deck=False)
+    controller.paused = True
+    server = ControlServer(controller, controller.control_socket)
+    try:
+        server.start()
+    except Exception:
+        controller.cleanup()
+        raise
     try:
-        controller = GestureController()
         controller.run()
+    finally:
+        server.stop()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options for running the controller."""
+    parser = argparse.ArgumentParser(description="Hand gesture presentation controller")
+    parser.add_argument("--config", default="config/gesture_config.json",
+                        help="Path to the gesture configuration file")
+    parser.add_argument("--slides",
+                        help="Folder with the converted slides (overrides folder_path)")
+    parser.add_argument("--source",
+                        help="Camera index, video file or directory of frames to read from")
+    parser.add_argument("--pacing", choices=["realtime", "fast"],
+                        help="Replay file sources at their frame rate or as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="Loop file sources")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without opening any windows")
+    parser.add_argument("--output", choices=["window", "mjpeg", "both"],
+                        help="Show windows, serve an MJPEG stream over HTTP, or both")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay resident, start paused and take commands on the control socket")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    args = parse_args(argv)
+    overrides = {}
+    if args.slides is not None:
+        overrides['folder_path'] = args.slides
+    if args.source is not None:
+        overrides['frame_source'] = parse_source_argument(args.source)
+    if args.pacing or args.loop:
+        with open(args.config, 'r') as f:
+            source = overrides.get('frame_source', json.load(f).get('frame_source', {}))
+        if args.pacing:
+            source['pacing'] = args.pacing
+        if args.loop:
+            source['loop'] = True
+        overrides['frame_source'] = source
+    if args.headless:
+        overrides['headless'] = True
+    if args.output:
+        overrides['output_mode'] = args.output
+    
+    # Turn SIGTERM (sent by the Streamlit app's stop button) into a normal exit so cleanup runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        if args.daemon:
+            run_daemon(args.config, overrides)
+        else:
+            controller = GestureController(args.config, overrides)
+            controller.run()
     except Exception as e:
         logger.error(f"Failed to start gesture controller: {e}")
         print(f"Error: {e}")
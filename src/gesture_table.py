@@ -0,0 +1,85 @@
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Landmark indices of the finger tips and of the joints they are compared against
+# (thumb: IP joint on x, other fingers: PIP joint on y), thumb first
+_TIPS = np.array([8, 12, 16, 20])
+_PIPS = _TIPS - 2
+_BIT_WEIGHTS = np.array([2, 4, 8, 16])
+
+
+def fingers_to_mask(fingers: Sequence[int]) -> int:
+    """Pack a ``[thumb, index, middle, ring, pinky]`` list into a 5-bit mask (thumb is bit 0)."""
+    mask = 0
+    for i, up in enumerate(fingers):
+        if up:
+            mask |= 1 << i
+    return mask
+
+
+def mask_to_fingers(mask: int) -> List[int]:
+    """Unpack a 5-bit mask into a ``[thumb, index, middle, ring, pinky]`` list."""
+    return [(mask >> i) & 1 for i in range(5)]
+
+
+def compile_gestures(gestures: Dict[str, Sequence[int]]) -> List[Optional[str]]:
+    """
+    Compile finger patterns into a 32-entry lookup table indexed by finger mask.
+
+    When two gestures share a pattern the one listed first wins, as with a linear scan.
+    """
+    table: List[Optional[str]] = [None] * 32
+    for name, pattern in gestures.items():
+        if len(pattern) != 5:
+            raise ValueError(f"Gesture '{name}' must list 5 finger states, got {list(pattern)}")
+        mask = fingers_to_mask(pattern)
+        if table[mask] is None:
+            table[mask] = name
+    return table
+
+
+def fingers_mask(lm: np.ndarray, hand_type: str = "Right") -> int:
+    """
+    Compute the raised-finger mask from a (21, 2+) landmark array.
+
+    Same rule as cvzone's ``fingersUp``: the thumb is up when its tip is outside the IP
+    joint along x, other fingers when their tip is above the PIP joint.
+    """
+    if hand_type == "Right":
+        thumb = lm[4, 0] > lm[3, 0]
+    else:
+        thumb = lm[4, 0] < lm[3, 0]
+    fingers = lm[_TIPS, 1] < lm[_PIPS, 1]
+    return int(thumb) | int(_BIT_WEIGHTS @ fingers)
+
+
+class GestureVoter:
+    """
+    N-frame voting state machine for discrete gestures.
+
+    A gesture becomes active once it wins ``min_votes`` of the last ``window`` frames.
+    ``update`` reports it once, on activation. It fires again only after another gesture,
+    or no gesture, has become active in between.
+    """
+
+    def __init__(self, window: int = 5, min_votes: int = 3):
+        """Create a voter over ``window`` frames needing ``min_votes`` agreeing frames."""
+        self.window = window
+        self.min_votes = min(min_votes, window)
+        self._votes: deque = deque(maxlen=window)
+        self.active: Optional[str] = None
+
+    def update(self, gesture: Optional[str]) -> Optional[str]:
+        """Add this frame's gesture and return a gesture name when one is triggered."""
+        self._votes.append(gesture)
+        if self._votes.count(gesture) < self.min_votes or gesture == self.active:
+            return None
+        self.active = gesture
+        return gesture
+
+    def reset(self):
+        """Forget all votes and the active gesture."""
+        self._votes.clear()
+        self.active = None
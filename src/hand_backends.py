@@ -0,0 +1,222 @@
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from gesture_table import fingers_mask, mask_to_fingers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = "models/hand_landmarker.task"
+MODEL_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+
+
+def draw_hands(img: np.ndarray, hands: List[Dict]):
+    """Draw the bounding box and landmarks of ``hands`` onto ``img`` for debugging."""
+    for hand in hands:
+        x, y, bw, bh = hand["bbox"]
+        cv2.rectangle(img, (x - 20, y - 20), (x + bw + 20, y + bh + 20), (255, 0, 255), 2)
+        for lx, ly, _ in hand["lmList"]:
+            cv2.circle(img, (lx, ly), 4, (0, 0, 255), cv2.FILLED)
+
+
+class HandBackend:
+    """
+    Interface of a hand detector, shaped after cvzone's ``HandDetector``.
+
+    ``findHands`` returns cvzone-style hand dicts (``lmList`` in pixels, ``bbox``, ``center``
+    and ``type``) in mirrored-view coordinates. Backends with ``mirrors_landmarks`` take the
+    camera frame as captured and mirror the landmarks themselves; the others expect a frame
+    that was already flipped. Backends that may return the result of an earlier frame add
+    that frame's submit time (``perf_counter`` seconds) to each hand as ``timestamp``.
+    """
+
+    mirrors_landmarks = False
+
+    def findHands(self, img: np.ndarray, draw: bool = False, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        raise NotImplementedError
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        """Return ``[thumb, index, middle, ring, pinky]`` raised states of ``hand``."""
+        return mask_to_fingers(fingers_mask(np.asarray(hand["lmList"]), hand.get("type", "Right")))
+
+    def stats(self) -> Dict:
+        """Backend-specific counters for the metrics file."""
+        return {}
+
+    def close(self):
+        """Release the model."""
+
+
+class CvzoneBackend(HandBackend):
+    """cvzone's ``HandDetector``: synchronous inference on the flipped frame."""
+
+    def __init__(self, max_hands: int = 1, detection_confidence: float = 0.8):
+        """Load cvzone's MediaPipe hand model."""
+        from cvzone.HandTrackingModule import HandDetector
+
+        self.detector = HandDetector(detectionCon=detection_confidence, maxHands=max_hands)
+
+    def findHands(self, img: np.ndarray, draw: bool = False, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        return self.detector.findHands(img, draw=draw, flipType=flipType)
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        return self.detector.fingersUp(hand)
+
+
+class TasksHandLandmarker(HandBackend):
+    """
+    MediaPipe Tasks ``HandLandmarker`` running on the unflipped camera frame.
+
+    In ``live_stream`` mode frames are submitted with ``detect_async`` and results arrive on
+    MediaPipe's thread through a callback, so inference overlaps with the rest of the frame
+    loop; ``findHands`` returns the newest result, usually that of the previous frame.
+    MediaPipe drops frames that arrive while it is busy. In ``video`` mode ``findHands``
+    blocks on ``detect_for_video``. Both modes track hands between frames, so the palm
+    detector only runs when a hand is lost. Landmark x coordinates are mirrored instead of
+    flipping the pixels, and nothing is drawn unless ``draw`` is set.
+    """
+
+    mirrors_landmarks = True
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, running_mode: str = "live_stream",
+                 max_hands: int = 1, detection_confidence: float = 0.8,
+                 presence_confidence: float = 0.5, tracking_confidence: float = 0.5):
+        """Load the ``.task`` model at ``model_path``."""
+        if running_mode not in ("live_stream", "video"):
+            raise ValueError(f"Unknown running mode: {running_mode}")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Hand landmarker model '{model_path}' not found; download it from {MODEL_URL}")
+        # Imported here once rather than on every frame
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self._mp = mp
+        self.running_mode = running_mode
+        self._live = running_mode == "live_stream"
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM if self._live else vision.RunningMode.VIDEO,
+            num_hands=max_hands,
+            min_hand_detection_confidence=detection_confidence,
+            min_hand_presence_confidence=presence_confidence,
+            min_tracking_confidence=tracking_confidence,
+            result_callback=self._on_result if self._live else None
+        )
+        self._landmarker = vision.HandLandmarker.create_from_options(options)
+
+        self._lock = threading.Lock()
+        self._hands: List[Dict] = []
+        self._last_timestamp = -1
+        self._submitted: "OrderedDict[int, float]" = OrderedDict()
+        self._counts = {"submitted": 0, "results": 0}
+        self._latency_total = 0.0
+
+    def findHands(self, img: np.ndarray, draw: bool = False, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        """Submit the unflipped frame ``img`` and return the newest hands in mirrored coordinates."""
+        mp = self._mp
+        timestamp = max(int(time.perf_counter() * 1000), self._last_timestamp + 1)
+        self._last_timestamp = timestamp
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
+        if self._live:
+            with self._lock:
+                self._counts["submitted"] += 1
+                self._submitted[timestamp] = time.perf_counter()
+            self._landmarker.detect_async(image, timestamp)
+            with self._lock:
+                hands = self._hands
+        else:
+            start = time.perf_counter()
+            result = self._landmarker.detect_for_video(image, timestamp)
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._counts["submitted"] += 1
+                self._counts["results"] += 1
+                self._latency_total += latency
+            hands = self._to_hands(result, img.shape[1], img.shape[0], start)
+
+        if draw:
+            draw_hands(img, hands)
+        return hands, img
+
+    def stats(self) -> Dict:
+        """Report submitted frames, results received and mean inference latency."""
+        # The counters move on MediaPipe's thread too; read them all at one point in time
+        with self._lock:
+            counts = dict(self._counts)
+            latency_total = self._latency_total
+        results = counts["results"]
+        return {
+            "running_mode": self.running_mode,
+            **counts,
+            "dropped": counts["submitted"] - results,
+            "mean_latency_ms": 1000 * latency_total / results if results else 0.0,
+        }
+
+    def close(self):
+        """Close the landmarker and its MediaPipe graph."""
+        self._landmarker.close()
+
+    def _on_result(self, result, image, timestamp: int):
+        """Callback from MediaPipe's thread with the result for the frame at ``timestamp``."""
+        now = time.perf_counter()
+        with self._lock:
+            self._counts["results"] += 1
+            submitted_at = self._submitted.pop(timestamp, None)
+            if submitted_at is not None:
+                self._latency_total += now - submitted_at
+            # Frames MediaPipe skipped while busy never get a callback
+            while self._submitted and next(iter(self._submitted)) < timestamp:
+                self._submitted.popitem(last=False)
+        # The hands describe the frame submitted back then, not the one being processed now
+        hands = self._to_hands(result, image.width, image.height, submitted_at if submitted_at is not None else now)
+        with self._lock:
+            self._hands = hands
+
+    @staticmethod
+    def _to_hands(result, width: int, height: int, submitted_at: float) -> List[Dict]:
+        """
+        Convert a ``HandLandmarkerResult`` into cvzone-style hands, mirrored along x.
+
+        Each hand carries ``submitted_at``, when its frame was submitted, as ``timestamp``.
+        """
+        hands = []
+        for landmarks, handedness in zip(result.hand_landmarks, result.handedness):
+            lm_list = [[int((1.0 - lm.x) * width), int(lm.y * height), int(lm.z * width)] for lm in landmarks]
+            points = np.asarray(lm_list)
+            x0, y0 = points[:, :2].min(axis=0)
+            x1, y1 = points[:, :2].max(axis=0)
+            hands.append({
+                "lmList": lm_list,
+                "bbox": (int(x0), int(y0), int(x1 - x0), int(y1 - y0)),
+                "center": (int(x0 + (x1 - x0) // 2), int(y0 + (y1 - y0) // 2)),
+                # On the unflipped frame MediaPipe's label matches what cvzone reports for the flipped one
+                "type": handedness[0].category_name if handedness else "Right",
+                "timestamp": submitted_at,
+            })
+        return hands
+
+
+def create_hand_detector(backend: str = "mediapipe_tasks", model_path: str = DEFAULT_MODEL_PATH,
+                         running_mode: str = "live_stream", max_hands: int = 1,
+                         detection_confidence: float = 0.8) -> HandBackend:
+    """
+    Create the configured hand detector backend.
+
+    ``mediapipe_tasks`` falls back to ``cvzone`` when its model file has not been downloaded.
+    """
+    if backend == "mediapipe_tasks":
+        try:
+            return TasksHandLandmarker(model_path, running_mode, max_hands, detection_confidence)
+        except FileNotFoundError as e:
+            logger.warning(f"{e}. Falling back to the cvzone backend")
+            backend = "cvzone"
+    if backend == "cvzone":
+        return CvzoneBackend(max_hands, detection_confidence)
+    raise ValueError(f"Unknown hand backend: {backend}")
@@ -0,0 +1,148 @@
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from hand_backends import draw_hands
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+class InferenceGovernor:
+    """
+    Wraps a hand detector and adapts how often it actually runs.
+
+    While hands are around, detection runs on every frame, or at most ``max_rate`` times a
+    second. Once no hand has been seen for ``idle_after_frames`` frames, the governor goes
+    idle and detects only ``min_rate`` times a second. Idle frames instead go through a
+    cheap motion check on a ``motion_width``-pixel-wide grayscale thumbnail: when more than
+    ``motion_threshold`` of its pixels change by over ``motion_pixel_delta`` levels, the
+    governor runs detection on that frame and returns to full rate.
+    """
+
+    RATE_WINDOW = 2.0
+
+    def __init__(self, detector, idle_after_frames: int = 30, min_rate: float = 2.0,
+                 max_rate: float = 0.0, motion_width: int = 64, motion_threshold: float = 0.02,
+                 motion_pixel_delta: int = 25):
+        """Wrap ``detector``; rates are detections per second, ``max_rate=0`` means every frame."""
+        self.detector = detector
+        self.idle_after_frames = idle_after_frames
+        self.min_interval = 1.0 / min_rate if min_rate > 0 else float("inf")
+        self.max_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.motion_width = motion_width
+        self.motion_threshold = motion_threshold
+        self.motion_pixel_delta = motion_pixel_delta
+
+        self.state = ACTIVE
+        self._misses = 0
+        self._last_detection = float("-inf")
+        self._last_hands: List[Dict] = []
+        # Appended by the detecting thread, counted by whoever asks for the rate
+        self._detections: deque = deque()
+        self._detections_lock = threading.Lock()
+        # Preallocated motion-check buffers, sized on the first idle frame
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._counts = {"frames": 0, "detections": 0, "reused": 0, "idle_skipped": 0, "motion_wakeups": 0}
+
+    def findHands(self, img: np.ndarray, draw: bool = True, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        """Detect hands in ``img`` if the governor allows it, like cvzone's ``findHands``."""
+        now = time.perf_counter()
+        self._counts["frames"] += 1
+        since_last = now - self._last_detection
+
+        if self.state == IDLE:
+            if self._moved(img):
+                self._counts["motion_wakeups"] += 1
+                self._wake()
+            elif since_last < self.min_interval:
+                self._counts["idle_skipped"] += 1
+                return [], img
+        elif since_last < self.max_interval:
+            # Between rate-capped detections the last hands stand in for the new ones
+            self._counts["reused"] += 1
+            if draw:
+                draw_hands(img, self._last_hands)
+            return self._last_hands, img
+
+        hands, img = self.detector.findHands(img, draw=draw, flipType=flipType)
+        # Reused hands must keep the time of the frame they were detected in
+        for hand in hands:
+            hand.setdefault("timestamp", now)
+        self._last_detection = now
+        self._last_hands = hands
+        with self._detections_lock:
+            self._detections.append(now)
+            self._expire(now)
+        self._counts["detections"] += 1
+
+        if hands:
+            self._misses = 0
+            if self.state == IDLE:
+                self._wake()
+        else:
+            self._misses += 1
+            if self.state == ACTIVE and self._misses >= self.idle_after_frames:
+                self.state = IDLE
+                self._previous = None
+                logger.info(f"No hands for {self._misses} frames; detecting at {1 / self.min_interval:g} Hz")
+        return hands, img
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        """Delegate to the wrapped detector."""
+        return self.detector.fingersUp(hand)
+
+    @property
+    def rate(self) -> float:
+        """Detections per second over the last ``RATE_WINDOW`` seconds."""
+        cutoff = time.perf_counter() - self.RATE_WINDOW
+        with self._detections_lock:
+            # Read-only: only the detecting thread drops old timestamps
+            recent = sum(1 for t in self._detections if t >= cutoff)
+        return recent / self.RATE_WINDOW
+
+    def stats(self) -> Dict:
+        """Report the governor state, current detection rate and frame counts."""
+        return {"state": self.state, "rate": round(self.rate, 2), **self._counts}
+
+    def _expire(self, now: float):
+        """Drop detection timestamps that fell out of the rate window; call with the lock held."""
+        while self._detections and self._detections[0] < now - self.RATE_WINDOW:
+            self._detections.popleft()
+
+    def _wake(self):
+        """Return to full-rate detection."""
+        if self.state == IDLE:
+            logger.info("Hand activity detected; back to full-rate detection")
+        self.state = ACTIVE
+        self._misses = 0
+
+    def _moved(self, img: np.ndarray) -> bool:
+        """Compare a downsampled grayscale copy of ``img`` with the previous idle frame."""
+        h, w = img.shape[:2]
+        size = (self.motion_width, max(1, self.motion_width * h // w))
+        if self._small is None or self._small.shape[:2] != size[::-1]:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty(size[::-1], dtype=np.uint8)
+            self._previous = None
+        cv2.resize(img, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._previous is None:
+            self._previous = self._gray.copy()
+            self._diff = np.empty_like(self._gray)
+            return False
+
+        cv2.absdiff(self._gray, self._previous, dst=self._diff)
+        changed = np.count_nonzero(self._diff > self.motion_pixel_delta) / self._diff.size
+        self._previous, self._gray = self._gray, self._previous
+        return changed > self.motion_threshold
@@ -0,0 +1,108 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def _smoothing_factor(cutoff, dt: float):
+    """Exponential smoothing factor of a first-order low-pass filter at ``cutoff`` Hz."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One Euro filter over an array of 2D points (Casiez et al., CHI 2012).
+
+    A low-pass filter whose cutoff rises with speed: slow movements are smoothed heavily
+    (no jitter), fast ones barely (little lag). ``velocity`` is the filtered derivative in
+    units per second, used for prediction.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.01, d_cutoff: float = 1.0):
+        """Create a filter; ``min_cutoff`` and ``d_cutoff`` are in Hz, ``beta`` in 1/speed."""
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget the filter state; the next sample passes through unchanged."""
+        self.value: Optional[np.ndarray] = None
+        self.velocity: Optional[np.ndarray] = None
+        self._t: Optional[float] = None
+
+    def __call__(self, points: np.ndarray, t: float) -> np.ndarray:
+        """Filter ``points`` (N, 2) sampled at time ``t`` seconds and return the estimate."""
+        points = np.asarray(points, dtype=np.float64)
+        if self.value is None or self.value.shape != points.shape:
+            self.value = points.copy()
+            self.velocity = np.zeros_like(points)
+            self._t = t
+            return self.value
+        dt = t - self._t
+        if dt <= 0:
+            return self.value
+        self._t = t
+
+        a_d = _smoothing_factor(self.d_cutoff, dt)
+        self.velocity += a_d * ((points - self.value) / dt - self.velocity)
+        speed = np.linalg.norm(self.velocity, axis=-1, keepdims=True)
+        a = _smoothing_factor(self.min_cutoff + self.beta * speed, dt)
+        self.value += a * (points - self.value)
+        return self.value
+
+
+class LandmarkPredictor:
+    """
+    Per-gesture smoothing and latency compensation for hand landmarks.
+
+    Each configured gesture has a profile: ``smooth`` runs the landmarks through a One Euro
+    filter, ``predict`` extrapolates them at constant velocity by the time elapsed since
+    capture (plus ``extra_lead_ms`` for display), capped at ``max_lead_ms``. Profiles may
+    override ``min_cutoff``, ``beta`` and ``d_cutoff``. All profiles are updated every
+    frame, so switching gestures never starts from a cold filter. Gestures without a
+    profile get the raw landmarks.
+    """
+
+    def __init__(self, settings: Dict):
+        """Build the profiles from the ``landmark_filter`` config section."""
+        self.enabled = settings.get("enabled", False)
+        self.max_lead = settings.get("max_lead_ms", 100) / 1000.0
+        self.extra_lead = settings.get("extra_lead_ms", 0) / 1000.0
+        self.profiles: Dict[str, Dict] = {}
+        for gesture, profile in settings.get("gestures", {}).items():
+            self.profiles[gesture] = {
+                "smooth": profile.get("smooth", True),
+                "predict": profile.get("predict", False),
+                "filter": OneEuroFilter(
+                    profile.get("min_cutoff", settings.get("min_cutoff", 1.0)),
+                    profile.get("beta", settings.get("beta", 0.01)),
+                    profile.get("d_cutoff", settings.get("d_cutoff", 1.0)),
+                ),
+            }
+
+    def update(self, points: np.ndarray, t: float, gesture: Optional[str], latency: float) -> np.ndarray:
+        """
+        Feed the landmarks ``points`` captured at ``t`` and return those to use for ``gesture``.
+
+        ``latency`` is how long ago, in seconds, the frame was captured.
+        """
+        if not self.enabled:
+            return points
+        for profile in self.profiles.values():
+            profile["filter"](points, t)
+        profile = self.profiles.get(gesture)
+        if profile is None:
+            return points
+
+        one_euro = profile["filter"]
+        estimate = one_euro.value if profile["smooth"] else points
+        if profile["predict"]:
+            estimate = estimate + one_euro.velocity * min(latency + self.extra_lead, self.max_lead)
+        return estimate
+
+    def reset(self):
+        """Forget all filter state, e.g. when the hand leaves the frame."""
+        for profile in self.profiles.values():
+            profile["filter"].reset()
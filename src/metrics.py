@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import bisect
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds from 10 us to ~30 s, growing by 25% per bucket
+_BUCKET_BOUNDS: List[float] = []
+_bound = 10e-6
+while _bound < 30.0:
+    _BUCKET_BOUNDS.append(_bound)
+    _bound *= 1.25
+
+
+class LatencyHistogram:
+    """
+    Fixed log-bucketed histogram of durations in seconds.
+
+    Recording is a bisect plus a counter increment, so it is cheap enough for the frame loop.
+    Percentiles are accurate to the bucket width (25%).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add one duration."""
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the ``q`` quantile (0-1)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return min(_BUCKET_BOUNDS[i], self.max) if i < len(_BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, p50/p95/p99 and max, in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1000 * self.percentile(0.50),
+            "p95_ms": 1000 * self.percentile(0.95),
+            "p99_ms": 1000 * self.percentile(0.99),
+            "max_ms": 1000 * self.max,
+        }
+
+
+class FrameMetrics:
+    """
+    Per-stage timings, fps and end-to-end latency for the gesture loop.
+
+    The loop calls ``lap`` between stages and ``frame_done`` once a frame is on screen.
+    A background thread periodically writes a snapshot as JSON and, optionally, in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, json_path: str = "", prometheus_path: str = "", interval: float = 5.0,
+                 enabled: bool = True):
+        """Create the recorder; exporting starts with ``start``."""
+        self.enabled = enabled
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.end_to_end = LatencyHistogram()
+        self.frames = 0
+        self.started = time.time()
+        self._window_start = time.perf_counter()
+        self._window_frames = 0
+        self.fps = 0.0
+        self.extra: Dict[str, Callable[[], Dict]] = {}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def lap(self, stage: str, start: float) -> float:
+        """Record the time since ``start`` under ``stage`` and return the current time."""
+        now = time.perf_counter()
+        if self.enabled:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.record(now - start)
+        return now
+
+    def frame_done(self, capture_time: float):
+        """Record a displayed frame captured at ``capture_time`` (a ``perf_counter`` value)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.end_to_end.record(now - capture_time)
+        self.frames += 1
+        self._window_frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+
+    def add_source(self, name: str, snapshot: Callable[[], Dict]):
+        """Include the dict returned by ``snapshot()`` under ``name`` in every export."""
+        self.extra[name] = snapshot
+
+    def snapshot(self) -> Dict:
+        """Return the current metrics as a JSON-serialisable dict."""
+        data = {
+            "timestamp": time.time(),
+            "uptime_s": time.time() - self.started,
+            "frames": self.frames,
+            "fps": round(self.fps, 2),
+            "end_to_end": self.end_to_end.summary(),
+            "stages": {name: h.summary() for name, h in list(self.stages.items())},
+        }
+        for name, source in list(self.extra.items()):
+            try:
+                data[name] = source()
+            except Exception as e:
+                logger.error(f"Error collecting '{name}' metrics: {e}")
+        return data
+
+    def start(self):
+        """Start the background exporter thread."""
+        if not self.enabled or not (self.json_path or self.prometheus_path) or self._thread:
+            return
+        self._thread = threading.Thread(target=self._export_loop, name="metrics-export", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop exporting and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+            self.export()
+
+    def export(self):
+        """Write the current snapshot to the configured files."""
+        data = self.snapshot()
+        if self.json_path:
+            _write_atomic(self.json_path, json.dumps(data, indent=2))
+        if self.prometheus_path:
+            _write_atomic(self.prometheus_path, to_prometheus(data))
+
+    def _export_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.export()
+            except Exception as e:
+                logger.error(f"Error exporting metrics: {e}")
+
+
+def to_prometheus(data: Dict, prefix: str = "gesture") -> str:
+    """Render a metrics snapshot in the Prometheus text exposition format."""
+    lines = [
+        f"# TYPE {prefix}_frames_total counter",
+        f"{prefix}_frames_total {data['frames']}",
+        f"# TYPE {prefix}_fps gauge",
+        f"{prefix}_fps {data['fps']}",
+        f"# TYPE {prefix}_stage_latency_ms summary",
+    ]
+    series = dict(data["stages"], end_to_end=data["end_to_end"])
+    for stage, summary in series.items():
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'{prefix}_stage_latency_ms{{stage="{stage}",quantile="{quantile}"}} {summary[key]:.3f}')
+        lines.append(f'{prefix}_stage_latency_ms_count{{stage="{stage}"}} {summary["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str):
+    """Write ``text`` to ``path`` so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,230 @@
+import time
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY = "frame"
+
+
+class MjpegStream:
+    """
+    Latest frame of one view, JPEG-encoded on a worker thread.
+
+    The frame loop calls ``publish`` every frame and says whether the view changed. Frames
+    are only copied and re-encoded when they changed (or a new viewer needs one), at most
+    ``max_fps`` times a second, and not at all while nobody is watching. Publishing copies
+    into a preallocated back buffer that is swapped with the encoder's front buffer.
+    """
+
+    def __init__(self, name: str, quality: int = 80, max_fps: float = 15.0):
+        """Create the stream and start its encoder thread."""
+        self.name = name
+        self.quality = quality
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+        self.jpeg: Optional[bytes] = None
+        self.sequence = 0
+        self.clients = 0
+        self.published = 0
+        self.encoded = 0
+
+        self._cond = threading.Condition()
+        self._back: Optional[np.ndarray] = None
+        self._front: Optional[np.ndarray] = None
+        self._has_new = False
+        self._deferred = False
+        self._next_due = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._encode_loop, name=f"mjpeg-{name}", daemon=True)
+        self._thread.start()
+
+    def publish(self, img: np.ndarray, changed: bool = True):
+        """Offer the current view; it is encoded only if it changed and someone needs it."""
+        if not (changed or self._deferred):
+            return
+        now = time.perf_counter()
+        if (not self.clients and self.jpeg is not None) or now < self._next_due:
+            # Keep the change pending: the next publish sends the view as it is then
+            self._deferred = True
+            return
+        self._deferred = False
+        self._next_due = now + self.min_interval
+
+        with self._cond:
+            if self._back is None or self._back.shape != img.shape:
+                self._back = np.empty_like(img)
+            np.copyto(self._back, img)
+            self._has_new = True
+            self.published += 1
+            self._cond.notify_all()
+
+    def wait_frame(self, last_sequence: int, timeout: float) -> Tuple[int, Optional[bytes]]:
+        """Wait up to ``timeout`` seconds for a frame newer than ``last_sequence``."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.sequence != last_sequence or self._closed, timeout)
+            return self.sequence, self.jpeg
+
+    def add_client(self):
+        """Register a viewer; it gets a fresh frame even if the view does not change."""
+        with self._cond:
+            self.clients += 1
+            self._deferred = True
+
+    def remove_client(self):
+        """Unregister a viewer."""
+        with self._cond:
+            self.clients -= 1
+
+    def close(self):
+        """Stop the encoder thread and wake up all viewers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> Dict[str, int]:
+        """Return viewer and encoder counters."""
+        return {"clients": self.clients, "published": self.published, "encoded": self.encoded}
+
+    def _encode_loop(self):
+        """Encode the newest published frame whenever there is one."""
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._has_new or self._closed)
+                if self._closed:
+                    return
+                self._front, self._back = self._back, self._front
+                self._has_new = False
+                frame = self._front
+
+            success, buffer = cv2.imencode(".jpg", frame, params)
+            if not success:
+                logger.error(f"Failed to encode {self.name} frame")
+                continue
+            with self._cond:
+                self.jpeg = buffer.tobytes()
+                self.sequence += 1
+                self.encoded += 1
+                self._cond.notify_all()
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    """Serve ``/<view>.mjpg`` streams, ``/<view>.jpg`` snapshots and an index page."""
+
+    def do_GET(self):
+        streams: Dict[str, MjpegStream] = self.server.streams
+        path = self.path.split("?", 1)[0].strip("/")
+        name, _, extension = path.partition(".")
+        if path == "":
+            self._send_index(streams)
+        elif name in streams and extension == "mjpg":
+            self._send_stream(streams[name])
+        elif name in streams and extension == "jpg":
+            self._send_snapshot(streams[name])
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_index(self, streams: Dict[str, MjpegStream]):
+        body = "".join(
+            f'<h3>{name}</h3><img src="/{name}.mjpg" style="max-width:100%">' for name in streams
+        )
+        data = f"<!doctype html><html><body style='margin:0;background:#000;color:#fff'>{body}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_snapshot(self, stream: MjpegStream):
+        # Without other viewers the last frame may be stale, so wait briefly for a fresh one
+        sequence, stale = stream.sequence, stream.clients == 0
+        stream.add_client()
+        try:
+            jpeg = stream.jpeg
+            if stale or jpeg is None:
+                _, jpeg = stream.wait_frame(sequence, 1.0)
+        finally:
+            stream.remove_client()
+        if jpeg is None:
+            self.send_error(503, "No frame yet")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(jpeg)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(jpeg)
+
+    def _send_stream(self, stream: MjpegStream):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        sequence = stream.sequence if stream.clients == 0 else -1
+        stream.add_client()
+        try:
+            while not stream.closed and not self.server.stopping:
+                # Re-send the current frame now and then so idle viewers notice a dead connection
+                sequence, jpeg = stream.wait_frame(sequence, 5.0)
+                if jpeg is None:
+                    continue
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                    + jpeg + b"\r\n"
+                )
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stream.remove_client()
+
+
+class MjpegServer:
+    """Small HTTP server exposing each stream at ``/<name>.mjpg`` and ``/<name>.jpg``."""
+
+    def __init__(self, streams: Dict[str, MjpegStream], host: str = "127.0.0.1", port: int = 8090):
+        """Create a server for ``streams``; it listens once ``start`` is called."""
+        self.streams = streams
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Bind the port and serve on a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.streams = self.streams
+        self._server.stopping = False
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mjpeg-server", daemon=True)
+        self._thread.start()
+        logger.info(f"MJPEG output on http://{self.host}:{self.port}/ ({', '.join(self.streams)})")
+
+    def stop(self):
+        """Stop serving and close all streams."""
+        if self._server is not None:
+            self._server.stopping = True
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for stream in self.streams.values():
+            stream.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return per-stream counters."""
+        return {name: stream.stats() for name, stream in self.streams.items()}
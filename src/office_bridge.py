@@ -0,0 +1,92 @@
+"""
+UNO bridge to a listening LibreOffice, run by ``OfficeWorker`` as a child process.
+
+LibreOffice's Python bindings (``import uno``) are built for the interpreter LibreOffice
+ships with, usually the system ``python3`` with the ``python3-uno`` package, not for the
+app's virtualenv. This script runs under that interpreter, connects to the listener once
+and then converts documents on request. Requests and replies are JSON lines on stdin
+and stdout; the first reply says whether the connection was made.
+
+Usage: python3 office_bridge.py PORT CONNECT_TIMEOUT
+"""
+import os
+import sys
+import json
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def prop(name, value):
+    """Build a UNO property value."""
+    p = PropertyValue()
+    p.Name = name
+    p.Value = value
+    return p
+
+
+def connect(port, timeout):
+    """Resolve the remote desktop object, retrying until the listener accepts connections."""
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            ctx = resolver.resolve(f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext")
+            return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        except Exception:
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.25)
+
+
+def convert(desktop, src_path, pdf_path):
+    """Load the document hidden, export it as PDF and close it."""
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(os.path.abspath(src_path)), "_blank", 0,
+        (prop("Hidden", True), prop("ReadOnly", True))
+    )
+    if doc is None:
+        raise RuntimeError(f"LibreOffice could not open {src_path}")
+    try:
+        doc.storeToURL(
+            uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+            (prop("FilterName", "impress_pdf_Export"),)
+        )
+    finally:
+        doc.close(True)
+
+
+def reply(message):
+    """Write one reply line."""
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    port, timeout = int(sys.argv[1]), float(sys.argv[2])
+    try:
+        desktop = connect(port, timeout)
+    except Exception as e:
+        reply({"error": f"could not connect to LibreOffice: {e}"})
+        return 1
+    reply({"ok": True})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            if request["op"] == "ping":
+                desktop.getFrames().getCount()
+            elif request["op"] == "convert":
+                convert(desktop, request["src"], request["pdf"])
+            else:
+                raise ValueError(f"unknown request '{request['op']}'")
+            reply({"ok": True})
+        except Exception as e:
+            reply({"error": str(e)})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
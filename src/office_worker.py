@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import shutil
+import atexit
+import tempfile
+import threading
+import subprocess
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BRIDGE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "office_bridge.py")
+# Interpreters that usually carry the UNO bindings: the system one with python3-uno
+# installed, and the one bundled with LibreOffice on some platforms
+UNO_PYTHON_CANDIDATES = ["/usr/bin/python3", "/usr/lib/libreoffice/program/python",
+                         "/opt/libreoffice/program/python"]
+
+
+def find_uno_python() -> Optional[str]:
+    """Return a Python interpreter that can import LibreOffice's UNO bindings, or None."""
+    for candidate in [sys.executable] + UNO_PYTHON_CANDIDATES:
+        if not os.path.exists(candidate):
+            continue
+        try:
+            result = subprocess.run([candidate, "-c", "import uno"], capture_output=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            return candidate
+    return None
+
+
+class OfficeWorker:
+    """
+    Long-lived headless LibreOffice used to convert presentations to PDF.
+
+    The worker starts ``soffice`` once, listening on a local socket with its own profile
+    directory, and converts documents over a UNO bridge. Each conversion then costs only the
+    document render time. The process is health-checked before every job, restarted when
+    it has died, and killed and restarted when a job exceeds ``job_timeout``.
+
+    The bridge is ``office_bridge.py`` running under ``uno_python``, an interpreter that can
+    import the UNO bindings (by default the first one found by ``find_uno_python``), since
+    the app's own interpreter usually cannot. Without one, jobs fall back to a one-shot
+    ``--convert-to pdf`` run that still uses the private profile, so it never collides
+    with another LibreOffice instance.
+    """
+
+    def __init__(self, binary: str = "libreoffice", port: int = 2002,
+                 profile_dir: str = "data/cache/office_profile",
+                 start_timeout: float = 30.0, job_timeout: float = 60.0,
+                 uno_python: Optional[str] = None):
+        """Configure the worker; the listener is started lazily by the first job."""
+        self.binary = binary
+        self.port = port
+        self.profile_dir = os.path.abspath(profile_dir)
+        self.start_timeout = start_timeout
+        self.job_timeout = job_timeout
+        self.uno_python = uno_python or find_uno_python()
+        self.use_uno = self.uno_python is not None
+        if not self.use_uno:
+            logger.warning("No Python with LibreOffice's UNO bindings found (install python3-uno); "
+                           "every conversion will start LibreOffice from scratch")
+
+        self._process: Optional[subprocess.Popen] = None
+        self._bridge: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+        self.jobs = 0
+        atexit.register(self.stop)
+
+    @property
+    def profile_url(self) -> str:
+        """The profile directory as the file URL LibreOffice expects."""
+        return Path(self.profile_dir).as_uri()
+
+    def status(self) -> Dict:
+        """Return a summary of the worker state for display."""
+        return {
+            "mode": "uno" if self.use_uno else "one-shot",
+            "uno_python": self.uno_python,
+            "running": self._process is not None and self._process.poll() is None,
+            "pid": self._process.pid if self._process is not None else None,
+            "jobs": self.jobs,
+            "restarts": self.restarts,
+        }
+
+    def healthy(self) -> bool:
+        """Check that the listener process is alive and answers over the UNO bridge."""
+        if self._process is None or self._process.poll() is not None:
+            return False
+        if self._bridge is None or self._bridge.poll() is not None:
+            return False
+        try:
+            return "ok" in self._request({"op": "ping"}, 5.0)
+        except Exception:
+            return False
+
+    def start(self):
+        """Start the LibreOffice listener and connect to it."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._process = subprocess.Popen(
+            [
+                self.binary,
+                "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", "--nolockcheck",
+                f"-env:UserInstallation={self.profile_url}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
+        # The bridge retries until the listener accepts connections, then reports in
+        self._bridge = subprocess.Popen(
+            [self.uno_python, BRIDGE_SCRIPT, str(self.port), str(self.start_timeout)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        try:
+            ready = self._request(None, self.start_timeout + 5)
+        except TimeoutError:
+            self.stop()
+            raise RuntimeError("Timed out waiting for LibreOffice to accept connections")
+        if "error" in ready:
+            code = self._process.poll()
+            self.stop()
+            if code is not None:
+                raise RuntimeError(f"LibreOffice exited during startup with code {code}")
+            raise RuntimeError(f"LibreOffice worker failed to start: {ready['error']}")
+        logger.info(f"LibreOffice worker listening on port {self.port} (pid {self._process.pid})")
+
+    def stop(self):
+        """Terminate the bridge and the listener process."""
+        for process in (self._bridge, self._process):
+            if process is not None and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        self._bridge = None
+        self._process = None
+
+    def restart(self):
+        """Kill the current listener, if any, and start a fresh one."""
+        logger.warning("Restarting LibreOffice worker")
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def convert(self, src_path: str, pdf_path: str):
+        """
+        Convert ``src_path`` to a PDF at ``pdf_path``.
+
+        Raises TimeoutError when the job exceeds ``job_timeout`` and RuntimeError on failure.
+        """
+        with self._lock:
+            self.jobs += 1
+            if not self.use_uno:
+                self._convert_one_shot(src_path, pdf_path)
+                return
+
+            if not self.healthy():
+                if self._process is None:
+                    self.start()
+                else:
+                    self.restart()
+
+            try:
+                result = self._request({"op": "convert", "src": os.path.abspath(src_path),
+                                        "pdf": os.path.abspath(pdf_path)}, self.job_timeout)
+            except TimeoutError:
+                # The blocked bridge call fails once its peer is gone; start clean for the next job
+                self.restart()
+                raise TimeoutError(f"LibreOffice conversion timed out after {self.job_timeout:.0f}s")
+            if "error" in result:
+                raise RuntimeError(f"LibreOffice conversion failed: {result['error']}")
+
+    def _request(self, message: Optional[Dict], timeout: float) -> Dict:
+        """
+        Send ``message`` to the bridge (None only reads) and return its reply.
+
+        Raises TimeoutError when no reply arrives within ``timeout`` seconds.
+        """
+        bridge = self._bridge
+        result: Dict = {}
+
+        def exchange():
+            try:
+                if message is not None:
+                    bridge.stdin.write(json.dumps(message) + "\n")
+                    bridge.stdin.flush()
+                line = bridge.stdout.readline()
+                result.update(json.loads(line) if line else {"error": "the UNO bridge exited"})
+            except Exception as e:
+                result["error"] = str(e)
+
+        job = threading.Thread(target=exchange, name="office-job", daemon=True)
+        job.start()
+        job.join(timeout)
+        if job.is_alive():
+            raise TimeoutError(f"No reply from the UNO bridge within {timeout:.0f}s")
+        return result
+
+    def _convert_one_shot(self, src_path: str, pdf_path: str):
+        """Convert with a single ``--convert-to pdf`` run using the private profile."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as out_dir:
+            cmd = [
+                self.binary,
+                "--headless", "--norestore", "--nolockcheck",
+                f"-env:UserInstallation={self.profile_url}",
+                "--convert-to", "pdf",
+                "--outdir", out_dir,
+                src_path,
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.job_timeout)
+            except subprocess.TimeoutExpired:
+                raise TimeoutError(f"LibreOffice conversion timed out after {self.job_timeout:.0f}s")
+            expected_pdf = os.path.join(out_dir, os.path.splitext(os.path.basename(src_path))[0] + ".pdf")
+            if result.returncode != 0 or not os.path.exists(expected_pdf):
+                raise RuntimeError(f"LibreOffice conversion failed: {result.stderr.strip()}")
+            shutil.move(expected_pdf, pdf_path)
@@ -0,0 +1,210 @@
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class FrameBuffer:
+    """
+    Bounded ring buffer between two pipeline stages.
+
+    When full, the oldest item is dropped to make room. Consumers normally take the
+    newest item and discard anything older, so a slow stage never works on stale frames.
+    """
+
+    def __init__(self, name: str, capacity: int = 1):
+        """Create a buffer holding at most ``capacity`` items."""
+        self.name = name
+        self.capacity = max(1, capacity)
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item: Any):
+        """Add an item, dropping the oldest one if the buffer is full."""
+        with self._cond:
+            if len(self._items) >= self.capacity:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None, latest: bool = True) -> Optional[Any]:
+        """
+        Wait for an item and return it, or None on timeout or when closed.
+
+        With ``latest=True`` the newest item is returned and older ones are dropped.
+        """
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            if latest:
+                self.dropped += len(self._items) - 1
+                item = self._items.pop()
+                self._items.clear()
+                return item
+            return self._items.popleft()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the producer has closed the buffer."""
+        return self._closed
+
+    def depth(self) -> int:
+        """Number of items currently waiting in the buffer."""
+        with self._cond:
+            return len(self._items)
+
+    def close(self):
+        """Wake up any waiting consumer; further gets return None once drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue depth and drop counters for this buffer."""
+        with self._cond:
+            return {"depth": len(self._items), "put": self.put_count, "dropped": self.dropped}
+
+
+class PipelinedRunner:
+    """
+    Runs a GestureController as a capture -> inference -> render pipeline.
+
+    Capture and inference run on worker threads. Rendering (``cv2.imshow``/``cv2.waitKey``)
+    stays on the calling thread, because HighGUI windows must be driven from one thread.
+    """
+
+    def __init__(self, controller, buffer_size: int = 1, stats_interval: float = 5.0,
+                 headless: bool = False):
+        """Create a pipeline around ``controller`` with buffers of ``buffer_size`` frames."""
+        self.controller = controller
+        self.stats_interval = stats_interval
+        self.headless = headless
+
+        self.capture_buffer = FrameBuffer("capture", buffer_size)
+        self.render_buffer = FrameBuffer("render", buffer_size)
+        self.stop_event = threading.Event()
+
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="pipeline-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="pipeline-inference", daemon=True),
+        ]
+
+    def submit(self, command: Callable[[], None]):
+        """Run ``command`` on the inference thread before its next frame."""
+        self.controller.submit(command)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return per-stage queue depth and drop counts."""
+        return {
+            "capture": self.capture_buffer.stats(),
+            "render": self.render_buffer.stats(),
+        }
+
+    def run(self):
+        """Start the worker threads and drive the render stage until quit."""
+        for thread in self._threads:
+            thread.start()
+
+        last_stats = time.time()
+        try:
+            while not self.stop_event.is_set():
+                item = self.render_buffer.get(timeout=0.1)
+                if item is not None:
+                    capture_time, img_current, img = item
+                    if not self.headless:
+                        t = time.perf_counter()
+                        cv2.imshow("Slides", img_current)
+                        cv2.imshow("Camera Feed", img)
+                        self.controller._windows_shown = True
+                        self.controller.metrics.lap('display', t)
+                    self.controller.metrics.frame_done(capture_time)
+
+                if self.controller.paused:
+                    self.controller._hide_windows()
+                elif not self.headless:
+                    key = cv2.waitKey(1)
+                    if key != -1:
+                        self.submit(lambda key=key: self._apply_key(key))
+
+                if time.time() - last_stats >= self.stats_interval:
+                    self._log_stats()
+                    last_stats = time.time()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop all stages and wait for the worker threads to exit."""
+        self.stop_event.set()
+        self.capture_buffer.close()
+        self.render_buffer.close()
+        for thread in self._threads:
+            if thread.is_alive() and thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        self._log_stats()
+
+    def _apply_key(self, key: int):
+        """Apply a key press on the inference thread, where controller state lives."""
+        if not self.controller._handle_key(key):
+            self.stop_event.set()
+
+    def _capture_loop(self):
+        """Read camera frames as fast as the camera delivers them."""
+        metrics = self.controller.metrics
+        while not self.stop_event.is_set():
+            t = time.perf_counter()
+            success, img = self.controller.cap.read()
+            capture_time = metrics.lap('capture', t)
+            if not success:
+                if self.controller.cap.exhausted:
+                    logger.info("Frame source exhausted")
+                    # Let inference finish the frames already captured
+                    self.capture_buffer.close()
+                else:
+                    logger.error("Failed to read frame from camera")
+                    self.stop_event.set()
+                break
+            self.capture_buffer.put((capture_time, img))
+
+    def _inference_loop(self):
+        """Process the newest captured frame, dropping any that went stale."""
+        try:
+            while not self.stop_event.is_set():
+                self.controller._run_commands()
+                if self.controller.quit_requested:
+                    self.stop_event.set()
+                    break
+                if self.controller.paused:
+                    time.sleep(0.05)
+                    continue
+
+                item = self.capture_buffer.get(timeout=0.1)
+                if item is None:
+                    if self.capture_buffer.closed:
+                        self.stop_event.set()
+                    continue
+                capture_time, img = item
+                img_current, img = self.controller._process_frame(img, capture_time)
+                self.render_buffer.put((capture_time, img_current, img))
+        except Exception as e:
+            logger.error(f"Error in inference stage: {e}")
+            self.stop_event.set()
+
+    def _log_stats(self):
+        """Log queue depth and drop counts for each stage."""
+        for name, stats in self.stats().items():
+            logger.info(
+                f"Pipeline {name}: depth={stats['depth']} "
+                f"frames={stats['put']} dropped={stats['dropped']}"
+            )
@@ -0,0 +1,124 @@
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from hand_backends import draw_hands
+
+logger = logging.getLogger(__name__)
+
+
+class RoiHandDetector:
+    """
+    Wraps a cvzone ``HandDetector`` to run inference on less than the full frame.
+
+    In ``downscale`` mode every frame is shrunk by ``scale`` before detection. In ``roi`` mode
+    detection runs on a crop around the last known hand bounding box (grown by ``margin``)
+    and falls back to a downscaled full-frame search only when the hand is lost.
+    Landmarks, bounding boxes and centres are mapped back to full-resolution coordinates.
+    """
+
+    MIN_ROI_SIZE = 96
+
+    def __init__(self, detector, mode: str = "roi", scale: float = 0.5, margin: float = 0.5,
+                 calibration_interval: int = 300):
+        """Wrap ``detector``; every ``calibration_interval`` calls run a full-frame detection."""
+        if mode not in ("downscale", "roi"):
+            raise ValueError(f"Unknown detection mode: {mode}")
+        self.detector = detector
+        self.mode = mode
+        self.scale = scale
+        self.margin = margin
+        self.calibration_interval = calibration_interval
+
+        self._roi: Optional[Tuple[int, int, int, int]] = None
+        self._calls = 0
+        # Per-kind call counts, total inference time and processed pixel counts
+        self._stats = {kind: [0, 0.0, 0] for kind in ("roi", "search", "full")}
+        self._full_pixels = 0
+
+    def findHands(self, img: np.ndarray, draw: bool = True, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        """Detect hands in ``img`` and return them in full-frame coordinates, like cvzone."""
+        h, w = img.shape[:2]
+        self._calls += 1
+        self._full_pixels += h * w
+
+        hands: List[Dict] = []
+        if self.calibration_interval and self._calls % self.calibration_interval == 0:
+            # Periodic full-resolution pass: measures the baseline cost and re-acquires hands
+            hands = self._detect("full", img, (0, 0), 1.0, flipType)
+        else:
+            if self.mode == "roi" and self._roi is not None:
+                x0, y0, x1, y1 = self._roi
+                hands = self._detect("roi", img[y0:y1, x0:x1], (x0, y0), 1.0, flipType)
+            if not hands:
+                small = cv2.resize(img, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_LINEAR)
+                hands = self._detect("search", small, (0, 0), self.scale, flipType)
+
+        self._roi = self._roi_from(hands[0]["bbox"], w, h) if hands else None
+
+        if draw:
+            draw_hands(img, hands)
+            if self._roi is not None:
+                cv2.rectangle(img, self._roi[:2], self._roi[2:], (255, 255, 0), 1)
+        return hands, img
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        """Delegate to the wrapped detector; landmarks are already in full-frame coordinates."""
+        return self.detector.fingersUp(hand)
+
+    def stats(self) -> Dict:
+        """Report call counts, inference time and CPU saved compared with full-frame detection."""
+        report = {"mode": self.mode, "scale": self.scale, "margin": self.margin}
+        processed_pixels = 0
+        total_time = 0.0
+        for kind, (calls, seconds, pixels) in self._stats.items():
+            report[f"{kind}_calls"] = calls
+            report[f"{kind}_mean_ms"] = 1000 * seconds / calls if calls else 0.0
+            processed_pixels += pixels
+            total_time += seconds
+        if self._full_pixels:
+            report["pixel_fraction"] = processed_pixels / self._full_pixels
+        full_calls, full_time, _ = self._stats["full"]
+        if full_calls and self._calls:
+            # Compare the actual mean cost per frame with the measured full-frame cost
+            report["estimated_cpu_saving"] = 1.0 - (total_time / self._calls) / (full_time / full_calls)
+        return report
+
+    def _detect(self, kind: str, img: np.ndarray, offset: Tuple[int, int], scale: float,
+                flipType: bool) -> List[Dict]:
+        """Run the wrapped detector on ``img`` and map results back to the full frame."""
+        # MediaPipe needs a contiguous buffer; crops are small so the copy is cheap
+        img = np.ascontiguousarray(img)
+        start = time.perf_counter()
+        hands, _ = self.detector.findHands(img, draw=False, flipType=flipType)
+        stats = self._stats[kind]
+        stats[0] += 1
+        stats[1] += time.perf_counter() - start
+        stats[2] += img.shape[0] * img.shape[1]
+
+        ox, oy = offset
+        for hand in hands:
+            hand["lmList"] = [
+                [int(x / scale) + ox, int(y / scale) + oy, int(z / scale)]
+                for x, y, z in hand["lmList"]
+            ]
+            x, y, bw, bh = hand["bbox"]
+            hand["bbox"] = (int(x / scale) + ox, int(y / scale) + oy, int(bw / scale), int(bh / scale))
+            cx, cy = hand["center"]
+            hand["center"] = (int(cx / scale) + ox, int(cy / scale) + oy)
+        return hands
+
+    def _roi_from(self, bbox: Tuple[int, int, int, int], w: int, h: int) -> Tuple[int, int, int, int]:
+        """Grow a hand bounding box by ``margin`` on each side and clip it to the frame."""
+        x, y, bw, bh = bbox
+        # Use a square region so finger extension in any direction stays inside the crop
+        side = max(max(bw, bh) * (1 + 2 * self.margin), self.MIN_ROI_SIZE)
+        cx, cy = x + bw / 2, y + bh / 2
+        x0 = int(max(cx - side / 2, 0))
+        y0 = int(max(cy - side / 2, 0))
+        x1 = int(min(cx + side / 2, w))
+        y1 = int(min(cy + side / 2, h))
+        return x0, y0, x1, y1
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import signal
+import sys
+import argparse
+import threading
+import logging
+from typing import Dict, List, Optional
+
+from gesture import GestureController
+from hand_backends import CvzoneBackend
+from frame_source import parse_source_argument
+from metrics import FrameMetrics
+from stream_scheduler import InferenceScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def _per_room_path(path: str, name: str) -> str:
+    """Give each room its own copy of a file setting, e.g. ``annotations_<name>.npz``."""
+    if not path:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}_{name}{extension}"
+
+
+class RoomHost:
+    """
+    Runs several presentation rooms in one process on a shared pool of hand detectors.
+
+    Every room is a ``GestureController`` with its own frame source, deck, annotations and
+    metrics, running its frame loop on its own thread. None of them loads a model: they
+    detect through an ``InferenceScheduler`` that owns ``detector_workers`` detectors and
+    shares them fairly between the rooms, each up to its ``target_fps``. Rooms run without
+    windows; use ``output_mode: "mjpeg"`` with a distinct ``mjpeg_port`` per room to watch them.
+    """
+
+    def __init__(self, config_file: str, rooms: List[Dict], settings: Dict):
+        """Create the scheduler and a controller for every entry of ``rooms``."""
+        with open(config_file, 'r') as f:
+            base = json.load(f)
+        # The pool uses cvzone: a Tasks landmarker tracks one stream and cannot be shared between rooms
+        self.scheduler = InferenceScheduler(
+            lambda: CvzoneBackend(
+                max_hands=base.get('max_hands', 1),
+                detection_confidence=base.get('detection_confidence', 0.8)
+            ),
+            workers=settings.get('detector_workers', 2)
+        )
+        self.metrics = FrameMetrics(
+            json_path=settings.get('stats_path', 'data/metrics/rooms.json'),
+            interval=settings.get('stats_interval', 5.0)
+        )
+        self.metrics.add_source('scheduler', self.scheduler.stats)
+        self.metrics.add_source('rooms', self.room_stats)
+
+        self.controllers: Dict[str, GestureController] = {}
+        try:
+            for index, room in enumerate(rooms):
+                name = room.get('name') or f"room-{index + 1}"
+                self.controllers[name] = self._create_room(config_file, base, name, room, settings)
+        except Exception:
+            for controller in self.controllers.values():
+                controller.cleanup()
+            self.cleanup()
+            raise
+
+    def _create_room(self, config_file: str, base: Dict, name: str, room: Dict, settings: Dict) -> GestureController:
+        """Build one room's controller on a scheduler handle."""
+        overrides = {
+            'headless': True,
+            'annotations_path': _per_room_path(base.get('annotations_path', 'data/slides/annotations.npz'), name),
+            'metrics_path': _per_room_path(base.get('metrics_path', 'data/metrics/gesture_metrics.json'), name),
+            'metrics_prometheus_path': _per_room_path(base.get('metrics_prometheus_path', ''), name),
+        }
+        overrides.update(room.get('config', {}))
+        if room.get('slides'):
+            overrides['folder_path'] = room['slides']
+        if room.get('source') is not None:
+            source = room['source']
+            overrides['frame_source'] = parse_source_argument(str(source)) if not isinstance(source, dict) else source
+        detector = self.scheduler.register(
+            name,
+            target_fps=room.get('target_fps', settings.get('target_fps', 30)),
+            max_wait=settings.get('max_wait_ms', 100) / 1000.0
+        )
+        logger.info(f"Setting up room '{name}'")
+        controller = GestureController(config_file, overrides, detector=detector)
+        controller.metrics.add_source('scheduler', detector.stats)
+        return controller
+
+    def room_stats(self) -> Dict:
+        """Return fps, frame count and end-to-end p95 of every room."""
+        return {
+            name: {
+                "fps": round(controller.metrics.fps, 2),
+                "frames": controller.metrics.frames,
+                "end_to_end_p95_ms": round(controller.metrics.end_to_end.summary()["p95_ms"], 2),
+            }
+            for name, controller in self.controllers.items()
+        }
+
+    def run(self):
+        """Run every room until all frame sources are exhausted or the host is interrupted."""
+        threads = [
+            threading.Thread(target=controller.run, name=f"room-{name}", daemon=True)
+            for name, controller in self.controllers.items()
+        ]
+        self.metrics.start()
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user")
+            for controller in self.controllers.values():
+                controller.submit(controller.request_quit)
+            for thread in threads:
+                thread.join(timeout=5.0)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self._log_summary(elapsed)
+            self.cleanup()
+
+    def _log_summary(self, elapsed: float):
+        """Log per-room and aggregate throughput."""
+        if elapsed <= 0:
+            return
+        total = 0
+        for name, controller in self.controllers.items():
+            frames = controller.metrics.frames
+            total += frames
+            logger.info(f"Room '{name}': {frames} frames ({frames / elapsed:.1f} fps)")
+        stats = self.scheduler.stats()
+        logger.info(
+            f"{len(self.controllers)} rooms on {stats['workers']} detector workers: "
+            f"{total / elapsed:.1f} fps in total, pool utilization {stats['utilization']:.0%}"
+        )
+
+    def cleanup(self):
+        """Stop the scheduler and write a final stats snapshot."""
+        self.metrics.stop()
+        self.scheduler.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options for the multi-room host."""
+    parser = argparse.ArgumentParser(description="Run several presentation rooms on shared hand detectors")
+    parser.add_argument("--config", default="config/gesture_config.json",
+                        help="Path to the gesture configuration file (rooms are listed under 'rooms')")
+    parser.add_argument("--replicate", type=int,
+                        help="Instead of the configured rooms, run this many copies of --source")
+    parser.add_argument("--source", help="Frame source for --replicate rooms")
+    parser.add_argument("--slides", help="Slide folder for --replicate rooms")
+    parser.add_argument("--pacing", choices=["realtime", "fast"],
+                        help="Replay file sources at their frame rate or as fast as possible")
+    parser.add_argument("--workers", type=int, help="Number of detector workers (overrides detector_workers)")
+    parser.add_argument("--fps", type=float, help="Target fps of every room (overrides target_fps)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    args = parse_args(argv)
+    with open(args.config, 'r') as f:
+        settings = dict(json.load(f).get('rooms', {}))
+    if args.workers is not None:
+        settings['detector_workers'] = args.workers
+    if args.fps is not None:
+        settings['target_fps'] = args.fps
+
+    if args.replicate:
+        if args.source is None:
+            raise SystemExit("--replicate needs a --source")
+        rooms = [{'name': f"room-{i + 1}", 'source': args.source, 'slides': args.slides}
+                 for i in range(args.replicate)]
+    else:
+        rooms = [dict(room) for room in settings.get('streams', [])]
+    if not rooms:
+        raise SystemExit("No rooms configured; list them under rooms.streams or use --replicate")
+    for room in rooms:
+        if args.fps is not None:
+            room.pop('target_fps', None)
+        if args.pacing:
+            source = room.get('source', {'type': 'camera'})
+            source = parse_source_argument(str(source)) if not isinstance(source, dict) else dict(source)
+            source['pacing'] = args.pacing
+            room['source'] = source
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    RoomHost(args.config, rooms, settings).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import threading
+import queue
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SlideCache:
+    """
+    In-memory LRU cache of decoded slides with background prefetch of neighbouring slides.
+    """
+
+    def __init__(self, loader: Callable[[int], Optional[np.ndarray]],
+                 max_bytes: int = 256 * 1024 * 1024, prefetch_radius: int = 1):
+        """Create a cache that decodes slides through ``loader(index)``."""
+        self._loader = loader
+        self.max_bytes = max_bytes
+        self.prefetch_radius = prefetch_radius
+
+        self._slides: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._inflight: Dict[int, threading.Event] = {}
+        self._bytes = 0
+        self._pinned = -1
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._prefetch_worker, name="slide-prefetch", daemon=True)
+        self._thread.start()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the decoded slides currently held."""
+        return self._bytes
+
+    def get(self, index: int, copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Return the decoded slide at ``index``.
+
+        With ``copy=True`` the caller gets a private copy it may draw on; otherwise a
+        read-only view of the cached array is returned.
+        """
+        with self._lock:
+            self._pinned = index
+            slide = self._slides.get(index)
+            if slide is not None:
+                self._slides.move_to_end(index)
+                self.hits += 1
+            else:
+                self.misses += 1
+                event = self._inflight.get(index)
+
+        if slide is None:
+            if event is not None:
+                # The prefetch thread is already decoding this slide; wait for it
+                event.wait()
+                with self._lock:
+                    slide = self._slides.get(index)
+            if slide is None:
+                slide = self._load(index)
+            if slide is None:
+                return None
+
+        return slide.copy() if copy else slide
+
+    def prefetch(self, center: int, count: int):
+        """Queue decoding of the slides within ``prefetch_radius`` of ``center``."""
+        for offset in range(1, self.prefetch_radius + 1):
+            for index in (center + offset, center - offset):
+                if 0 <= index < count:
+                    self._queue.put(index)
+
+    def invalidate(self, index: Optional[int] = None):
+        """Drop one slide (or every slide) from the cache."""
+        with self._lock:
+            indices = list(self._slides) if index is None else [index]
+            for i in indices:
+                slide = self._slides.pop(i, None)
+                if slide is not None:
+                    self._bytes -= slide.nbytes
+
+    def close(self):
+        """Stop the prefetch thread and release all cached slides."""
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+        self.invalidate()
+
+    def _load(self, index: int) -> Optional[np.ndarray]:
+        """Decode a slide and insert it into the cache."""
+        with self._lock:
+            if index in self._slides:
+                return self._slides[index]
+            event = self._inflight.get(index)
+            if event is None:
+                event = self._inflight[index] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                return self._slides.get(index)
+
+        slide = None
+        try:
+            slide = self._loader(index)
+        except Exception as e:
+            logger.error(f"Error decoding slide {index}: {e}")
+        finally:
+            with self._lock:
+                if slide is not None:
+                    slide.setflags(write=False)
+                    self._slides[index] = slide
+                    self._bytes += slide.nbytes
+                    self._evict()
+                del self._inflight[index]
+            event.set()
+        return slide
+
+    def _evict(self):
+        """Evict least recently used slides until the cache fits its memory cap."""
+        for index in list(self._slides):
+            if self._bytes <= self.max_bytes or len(self._slides) <= 1:
+                break
+            if index == self._pinned:
+                continue
+            self._bytes -= self._slides.pop(index).nbytes
+
+    def _prefetch_worker(self):
+        """Background loop that decodes queued slides ahead of navigation."""
+        while True:
+            index = self._queue.get()
+            if index is None:
+                break
+            with self._lock:
+                cached = index in self._slides or index in self._inflight
+            if not cached:
+                self._load(index)
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import posixpath
+import zipfile
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_DPI = 24
+_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _rels_path(part: str) -> str:
+    """Path of the relationships part of ``part``, e.g. ``ppt/slides/_rels/slide1.xml.rels``."""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def _relationships(package: zipfile.ZipFile, part: str) -> List[ElementTree.Element]:
+    """The relationship elements of ``part``, or none when it has no relationships part."""
+    try:
+        return list(ElementTree.fromstring(package.read(_rels_path(part))).iter(_REL_NS + "Relationship"))
+    except KeyError:
+        return []
+
+
+def _target(part: str, relationship: ElementTree.Element) -> str:
+    """Resolve a relationship target relative to the part that references it."""
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), relationship.get("Target")))
+
+
+def _slide_parts(package: zipfile.ZipFile) -> List[str]:
+    """The slide parts of a presentation in presentation order."""
+    presentation = "ppt/presentation.xml"
+    targets = {rel.get("Id"): _target(presentation, rel) for rel in _relationships(package, presentation)}
+    root = ElementTree.fromstring(package.read(presentation))
+    return [targets[slide.get(_R_ID)] for slide in root.iter(_P_NS + "sldId")]
+
+
+def pptx_slide_fingerprints(pptx_path: str) -> List[str]:
+    """
+    Fingerprint every visible slide of a PPTX file, in presentation order.
+
+    A slide's fingerprint hashes its XML part and every part reachable through its
+    relationships: media, charts, its layout, master and theme. Slides on which nothing was edited keep
+    their fingerprint across saves. Hidden slides are left out, as they are not exported
+    to the PDF.
+    """
+    digests: Dict[str, str] = {}
+
+    with zipfile.ZipFile(pptx_path) as package:
+        names = set(package.namelist())
+
+        def part_digest(part: str) -> str:
+            if part not in digests:
+                digests[part] = hashlib.sha256(package.read(part)).hexdigest() if part in names else ""
+            return digests[part]
+
+        def slide_digest(slide: str) -> str:
+            # Parts are hashed by content and linked by relationship ID, not by name, since
+            # PowerPoint renumbers slide and media parts on save. Collecting the reachable
+            # parts as a set keeps masters and layouts that reference each other stable.
+            entries = set()
+            seen = {slide}
+            pending = [slide]
+            while pending:
+                part = pending.pop()
+                links = []
+                for rel in _relationships(package, part):
+                    if rel.get("TargetMode") == "External":
+                        links.append(f"{rel.get('Id')}>{rel.get('Target', '')}")
+                        continue
+                    target = _target(part, rel)
+                    links.append(f"{rel.get('Id')}>{part_digest(target)}")
+                    # Other slides (and notes pointing back to this one) are not part of its look
+                    if target not in seen and not target.startswith("ppt/slides/"):
+                        seen.add(target)
+                        pending.append(target)
+                entries.add(part_digest(part) + "|" + ",".join(sorted(links)))
+            digest = hashlib.sha256()
+            for entry in sorted(entries):
+                digest.update(entry.encode() + b";")
+            return digest.hexdigest()
+
+        fingerprints = []
+        for part in _slide_parts(package):
+            if ElementTree.fromstring(package.read(part)).get("show") == "0":
+                continue
+            fingerprints.append(slide_digest(part))
+    return fingerprints
+
+
+def pdf_page_fingerprints(pdf_path: str, dpi: int = FINGERPRINT_DPI) -> List[str]:
+    """
+    Fingerprint every page of ``pdf_path`` by hashing a low resolution grayscale render.
+
+    This catches what the PPTX parts do not show, such as slide numbers that moved
+    after slides were inserted. All pages are rendered by a single pdftocairo call.
+    """
+    from pdf2image import convert_from_path
+
+    fingerprints = []
+    for image in convert_from_path(pdf_path, dpi=dpi, grayscale=True, use_cropbox=False, use_pdftocairo=True):
+        digest = hashlib.sha256(f"{image.width}x{image.height};".encode())
+        digest.update(image.tobytes())
+        fingerprints.append(digest.hexdigest())
+        image.close()
+    return fingerprints
+
+
+def match_slides(old_meta: Optional[Dict], new_meta: Optional[Dict]) -> Optional[Dict[int, int]]:
+    """
+    Map slide indices of a new deck to the unchanged slides of an old one.
+
+    Both arguments are ``deck.json`` metadata. Slides match when both their PPTX and page
+    fingerprints are equal. Returns ``{new index: old index}`` (0-based), or None when
+    either deck carries no fingerprints.
+    """
+    old_slides = (old_meta or {}).get("slide_fingerprints")
+    old_pages = (old_meta or {}).get("page_fingerprints")
+    new_slides = (new_meta or {}).get("slide_fingerprints")
+    new_pages = (new_meta or {}).get("page_fingerprints")
+    if not (old_slides and old_pages and new_slides and new_pages):
+        return None
+
+    old_index = {}
+    for index, key in enumerate(zip(old_slides, old_pages)):
+        old_index.setdefault(key, index)
+    matches = {}
+    for index, key in enumerate(zip(new_slides, new_pages)):
+        if key in old_index:
+            matches[index] = old_index[key]
+    return matches
@@ -0,0 +1,108 @@
+import time
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupPhases:
+    """
+    Runs the independent parts of controller startup concurrently and times them.
+
+    Every phase records when it started and how long it took, relative to the moment the
+    controller began starting, so the report shows both the critical path and how much
+    the phases overlapped. ``first_frame_ms`` is the time from the start (or the latest
+    ``expect_frame``, e.g. a resume) to the first processed frame after it.
+    """
+
+    def __init__(self, imports_ms: Optional[float] = None):
+        """Start the clock; ``imports_ms`` is how long the module imports took, if known."""
+        self.start = time.perf_counter()
+        self.imports_ms = imports_ms
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.ready_ms: Optional[float] = None
+        self.first_frame_ms: Optional[float] = None
+        self._frame_clock = self.start
+        self._awaiting_frame = True
+        self._pending: List[Tuple[str, Future]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def awaiting_frame(self) -> bool:
+        """Whether the next processed frame should be timed."""
+        return self._awaiting_frame
+
+    def run(self, name: str, fn: Callable, *args) -> Future:
+        """Run ``fn(*args)`` as phase ``name`` on its own thread."""
+        future: Future = Future()
+
+        def phase():
+            began = time.perf_counter()
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._record(name, began)
+
+        self._pending.append((name, future))
+        threading.Thread(target=phase, name=f"startup-{name}", daemon=True).start()
+        return future
+
+    def call(self, name: str, fn: Callable, *args):
+        """Run ``fn(*args)`` as phase ``name`` on the calling thread and return its result."""
+        began = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record(name, began)
+
+    def wait(self):
+        """Wait for every phase; raise the error of the first one that failed, in start order."""
+        error = None
+        for name, future in self._pending:
+            try:
+                future.result()
+            except Exception as e:
+                if error is None:
+                    logger.error(f"Startup phase '{name}' failed: {e}")
+                    error = e
+        self._pending.clear()
+        self.ready_ms = round(1000 * (time.perf_counter() - self.start), 2)
+        if error is not None:
+            raise error
+        logger.info(f"Started in {self.ready_ms:.0f} ms: " + ", ".join(
+            f"{name} {phase['duration_ms']:.0f} ms" for name, phase in self.phases.items()))
+
+    def expect_frame(self):
+        """Time the next processed frame from now."""
+        self._frame_clock = time.perf_counter()
+        self._awaiting_frame = True
+
+    def frame_done(self):
+        """Record that the awaited frame was processed."""
+        self.first_frame_ms = round(1000 * (time.perf_counter() - self._frame_clock), 2)
+        self._awaiting_frame = False
+
+    def report(self) -> Dict:
+        """Timings in milliseconds for the status and the metrics file."""
+        with self._lock:
+            phases = {name: dict(phase) for name, phase in
+                      sorted(self.phases.items(), key=lambda item: item[1]["start_ms"])}
+        return {
+            "imports_ms": self.imports_ms,
+            "phases": phases,
+            "ready_ms": self.ready_ms,
+            "first_frame_ms": self.first_frame_ms,
+        }
+
+    def _record(self, name: str, began: float):
+        """Store the timing of a finished phase."""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases[name] = {
+                "start_ms": round(1000 * (began - self.start), 2),
+                "duration_ms": round(1000 * (now - began), 2),
+            }
@@ -0,0 +1,186 @@
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    """One frame waiting for an inference slot."""
+
+    __slots__ = ("stream", "img", "draw", "flip_type", "queued", "done", "hands")
+
+    def __init__(self, stream: "ScheduledDetector", img: np.ndarray, draw: bool, flip_type: bool):
+        self.stream = stream
+        self.img = img
+        self.draw = draw
+        self.flip_type = flip_type
+        self.queued = time.perf_counter()
+        self.done = threading.Event()
+        self.hands: List[Dict] = []
+
+
+class ScheduledDetector:
+    """
+    One stream's handle on an ``InferenceScheduler``, usable wherever a cvzone
+    ``HandDetector`` is expected.
+
+    ``findHands`` blocks until a pool worker has run detection on the frame. It waits at
+    most until the stream's next slot at ``target_fps``, plus ``max_wait`` seconds for a
+    free worker; past that the frame is shed and the stream's last hands are returned.
+    """
+
+    def __init__(self, scheduler: "InferenceScheduler", name: str, target_fps: float, max_wait: float):
+        """Create the handle; use ``InferenceScheduler.register`` instead."""
+        self.scheduler = scheduler
+        self.name = name
+        self.interval = 1.0 / target_fps if target_fps > 0 else 0.0
+        self.max_wait = max_wait
+        self.next_due = 0.0
+        self.last_grant = 0.0
+        self.last_hands: List[Dict] = []
+        self.served = 0
+        self.shed = 0
+        self.wait_total = 0.0
+        self.busy_total = 0.0
+
+    def findHands(self, img: np.ndarray, draw: bool = True, flipType: bool = True) -> Tuple[List[Dict], np.ndarray]:
+        """Run detection on ``img`` through the shared pool, like cvzone's ``findHands``."""
+        request = _Request(self, img, draw, flipType)
+        timeout = max(self.next_due - request.queued, 0.0) + self.max_wait
+        self.scheduler.enqueue(request)
+        if not request.done.wait(timeout) and self.scheduler.withdraw(request):
+            self.shed += 1
+            return self.last_hands, img
+        request.done.wait()
+        # Shed frames reuse these hands, which must keep the time of the frame they came from
+        for hand in request.hands:
+            hand.setdefault("timestamp", request.queued)
+        self.last_hands = request.hands
+        return request.hands, img
+
+    def fingersUp(self, hand: Dict) -> List[int]:
+        """Delegate to one of the pool's detectors; cvzone's implementation is stateless."""
+        return self.scheduler.detectors[0].fingersUp(hand)
+
+    def stats(self) -> Dict:
+        """Report served and shed frames and the mean slot wait and inference time."""
+        return {
+            "target_fps": round(1.0 / self.interval, 2) if self.interval else 0,
+            "served": self.served,
+            "shed": self.shed,
+            "mean_wait_ms": 1000 * self.wait_total / self.served if self.served else 0.0,
+            "mean_inference_ms": 1000 * self.busy_total / self.served if self.served else 0.0,
+        }
+
+
+class InferenceScheduler:
+    """
+    Fixed pool of hand detectors shared by several frame streams.
+
+    Each of the ``workers`` threads owns one detector made by ``detector_factory`` (MediaPipe
+    graphs are not shared between threads). Streams submit at most one frame at a time and
+    block until it is processed, so a slow pool slows the streams instead of queueing
+    frames. A stream is eligible once its next slot at ``target_fps`` has come; among
+    eligible streams the one served least recently goes first, so every stream gets a fair
+    share of the workers when they are all busy.
+    """
+
+    def __init__(self, detector_factory: Callable[[], object], workers: int = 2):
+        """Create ``workers`` detectors and start one worker thread per detector."""
+        self.detectors = [detector_factory() for _ in range(max(1, workers))]
+        self.streams: Dict[str, ScheduledDetector] = {}
+        self._pending: List[_Request] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = [0.0] * len(self.detectors)
+        self._started = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._work, args=(i,), name=f"detector-{i}", daemon=True)
+            for i in range(len(self.detectors))
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Inference scheduler started with {len(self.detectors)} detector workers")
+
+    def register(self, name: str, target_fps: float = 30.0, max_wait: float = 0.1) -> ScheduledDetector:
+        """Add a stream and return the detector handle it should use."""
+        if name in self.streams:
+            raise ValueError(f"Stream '{name}' is already registered")
+        stream = ScheduledDetector(self, name, target_fps, max_wait)
+        self.streams[name] = stream
+        return stream
+
+    def enqueue(self, request: _Request):
+        """Queue a frame for the next free worker once its stream is due."""
+        with self._cond:
+            self._pending.append(request)
+            self._cond.notify_all()
+
+    def withdraw(self, request: _Request) -> bool:
+        """Take a request back if no worker has picked it up yet."""
+        with self._cond:
+            if request in self._pending:
+                self._pending.remove(request)
+                return True
+            return False
+
+    def close(self):
+        """Stop the workers; requests still queued are answered with no hands."""
+        with self._cond:
+            self._closed = True
+            for request in self._pending:
+                request.done.set()
+            self._pending.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def stats(self) -> Dict:
+        """Report pool utilization and per-stream counters."""
+        elapsed = time.perf_counter() - self._started
+        return {
+            "workers": len(self.detectors),
+            "utilization": round(sum(self._busy) / (elapsed * len(self._busy)), 3) if elapsed > 0 else 0.0,
+            "pending": len(self._pending),
+            "streams": {name: stream.stats() for name, stream in self.streams.items()},
+        }
+
+    def _next_request(self) -> Optional[_Request]:
+        """Wait for an eligible request and take it; returns None once closed."""
+        with self._cond:
+            while not self._closed:
+                now = time.perf_counter()
+                due = [request for request in self._pending if request.stream.next_due <= now]
+                if due:
+                    request = min(due, key=lambda r: r.stream.last_grant)
+                    self._pending.remove(request)
+                    stream = request.stream
+                    stream.last_grant = now
+                    stream.next_due = now + stream.interval
+                    stream.wait_total += now - request.queued
+                    return request
+                wake = min((request.stream.next_due for request in self._pending), default=None)
+                self._cond.wait(None if wake is None else wake - now)
+            return None
+
+    def _work(self, index: int):
+        """Run detection for eligible requests on detector ``index``."""
+        detector = self.detectors[index]
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            start = time.perf_counter()
+            try:
+                request.hands, _ = detector.findHands(request.img, draw=request.draw, flipType=request.flip_type)
+            except Exception as e:
+                logger.error(f"Detection failed for stream '{request.stream.name}': {e}")
+            elapsed = time.perf_counter() - start
+            self._busy[index] += elapsed
+            request.stream.busy_total += elapsed
+            request.stream.served += 1
+            request.done.set()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+WIDTH, HEIGHT = 320, 180
+
+
+class MirroringDetector:
+    """Hand backend stand-in that, like the MediaPipe tasks one, mirrors landmarks itself."""
+
+    mirrors_landmarks = True
+
+    def findHands(self, img, draw=True, flipType=True):
+        return [], img
+
+
+def write_slides(folder, count):
+    """Write ``count`` plain slide images named ``1.png`` ... into ``folder``."""
+    os.makedirs(folder, exist_ok=True)
+    for i in range(1, count + 1):
+        cv2.imwrite(os.path.join(folder, f"{i}.png"), np.full((HEIGHT, WIDTH, 3), 40 * i, np.uint8))
+    return str(folder)
+
+
+@pytest.fixture
+def make_controller(tmp_path):
+    """Build headless controllers that replay frames from ``tmp_path`` and clean them up."""
+    from gesture import GestureController
+
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for i in range(3):
+        cv2.imwrite(str(frames / f"{i}.png"), np.full((HEIGHT, WIDTH, 3), 60 * i, np.uint8))
+    config = tmp_path / "gesture_config.json"
+    config.write_text("{}")
+    controllers = []
+
+    def make(detector=None, **overrides):
+        settings = {
+            "width": WIDTH,
+            "height": HEIGHT,
+            "gesture_threshold": HEIGHT // 2,
+            "folder_path": write_slides(tmp_path / "slides", 2),
+            "frame_source": {"type": "images", "path": str(frames), "pacing": "fast", "preload": True},
+            "headless": True,
+            "metrics_enabled": False,
+            "annotations_path": str(tmp_path / "annotations.npz"),
+            "inference_governor": {"enabled": False},
+        }
+        settings.update(overrides)
+        controller = GestureController(str(config), settings, detector=detector or MirroringDetector())
+        controllers.append(controller)
+        return controller
+
+    yield make
+    for controller in controllers:
+        controller.cleanup()
@@ -0,0 +1,8 @@
+from conversion import page_chunks
+
+
+def test_page_chunks_are_consecutive_ranges():
+    assert page_chunks([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    # Reused pages leave gaps; a chunk never spans one, so it renders as a single range
+    assert page_chunks([2, 3, 4, 7, 9, 10], 4) == [[2, 3, 4], [7], [9, 10]]
+    assert page_chunks([1, 2], 0) == [[1], [2]]
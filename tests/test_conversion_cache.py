@@ -0,0 +1,54 @@
+import os
+import threading
+
+from conversion import render_settings
+from conversion_cache import ConversionCache, ENTRY_FILE
+
+
+def make_conversion(folder, pages=2):
+    images = folder / "images"
+    images.mkdir(parents=True)
+    for page in range(1, pages + 1):
+        (images / f"{page}.png").write_bytes(b"png" * page)
+    pdf = folder / "presentation.pdf"
+    pdf.write_bytes(b"%PDF")
+    return str(pdf), str(images)
+
+
+def test_half_built_entries_are_not_listed(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    building = tmp_path / "cache" / ("a" * 64 + ".tmp-123")
+    (building / "images").mkdir(parents=True)
+    (building / ENTRY_FILE).write_text("{}")
+    assert cache.entries() == []
+
+
+def test_concurrent_stores_keep_one_complete_entry(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    pdf, images = make_conversion(tmp_path / "job")
+    errors = []
+
+    def store():
+        try:
+            cache.store("k" * 64, pdf, images)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [key for _, _, key in cache.entries()] == ["k" * 64]
+    restored = tmp_path / "restored"
+    assert cache.restore("k" * 64, str(restored))
+    assert sorted(os.listdir(restored)) == ["1.png", "2.png"]
+
+
+def test_thumbnail_width_is_part_of_the_key():
+    data = b"pptx"
+    small = ConversionCache.key_for(data, render_settings({"thumbnail_width": 160}))
+    large = ConversionCache.key_for(data, render_settings({"thumbnail_width": 320}))
+    assert small != large
@@ -0,0 +1,41 @@
+import os
+import time
+
+from conversion_cache import ConversionCache
+from conversion_jobs import ConversionJob, ConversionQueue, DONE, IMAGES_DIR
+
+
+def make_queue(tmp_path, **kwargs):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    return ConversionQueue(None, cache, {}, root=str(tmp_path / "jobs"), max_workers=1, **kwargs)
+
+
+def finished_job(queue, name, finished):
+    job = ConversionJob(name, "deck.pptx", os.path.join(queue.root, name))
+    os.makedirs(job.images_dir)
+    job.status = DONE
+    job.finished = finished
+    queue._jobs[job.id] = job
+    return job
+
+
+def test_orphaned_job_folders_are_swept_at_start(tmp_path):
+    jobs = tmp_path / "jobs"
+    (jobs / "old" / IMAGES_DIR).mkdir(parents=True)
+    (jobs / "presented" / IMAGES_DIR).mkdir(parents=True)
+    presented = str(jobs / "presented" / IMAGES_DIR)
+
+    make_queue(tmp_path, in_use=lambda: {presented})
+    assert sorted(os.listdir(jobs)) == ["presented"]
+
+
+def test_finished_jobs_expire(tmp_path):
+    queue = make_queue(tmp_path, retention=3600, max_finished=1)
+    stale = finished_job(queue, "stale", time.time() - 7200)
+    older = finished_job(queue, "older", time.time() - 60)
+    newest = finished_job(queue, "newest", time.time())
+
+    queue.prune()
+    assert [job.id for job in queue.jobs()] == [newest.id]
+    assert not os.path.exists(stale.workdir) and not os.path.exists(older.workdir)
+    assert os.path.exists(newest.workdir)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from hand_backends import HandBackend
+
+from conftest import MirroringDetector, write_slides
+
+
+def test_process_frame_leaves_source_frame_untouched(make_controller):
+    controller = make_controller(MirroringDetector())
+    assert not controller.flip_camera_view
+
+    success, frame = controller.cap.read()
+    assert success
+    before = frame.copy()
+    controller._process_frame(frame)
+
+    # Preloaded frames are handed out as they are, so drawing on them would corrupt the replay
+    assert np.array_equal(frame, before)
+    assert controller.cap.frames[0] is frame
+
+
+def draw_stroke(controller, slide, points):
+    controller.annotations.begin_stroke(slide)
+    for point in points:
+        controller.annotations.add_point(point)
+    controller.annotations.end_stroke()
+
+
+def test_annotations_survive_switching_decks(make_controller, tmp_path):
+    deck_a = write_slides(tmp_path / "deck_a", 2)
+    deck_b = write_slides(tmp_path / "deck_b", 3)
+    controller = make_controller(folder_path=deck_a)
+    draw_stroke(controller, 1, [(10, 10), (50, 50), (90, 20)])
+
+    controller.load_deck(deck_b)
+    assert controller.annotations.stroke_count(1) == 0
+    draw_stroke(controller, 0, [(20, 20), (60, 60)])
+
+    controller.load_deck(deck_a)
+    assert controller.annotations.stroke_count(1) == 1
+    assert controller.annotations.stroke_count(0) == 0
+
+    controller.load_deck(deck_b)
+    assert controller.annotations.stroke_count(0) == 1
+
+
+class ClosingBackend(HandBackend):
+    mirrors_landmarks = True
+
+    def __init__(self):
+        self.closed = False
+
+    def findHands(self, img, draw=False, flipType=True):
+        return [], img
+
+    def close(self):
+        self.closed = True
+
+
+def test_failed_startup_closes_the_other_phases(make_controller, tmp_path, monkeypatch):
+    import slide_cache
+
+    caches = []
+    original_init = slide_cache.SlideCache.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        caches.append(self)
+
+    monkeypatch.setattr(slide_cache.SlideCache, "__init__", tracking_init)
+    backend = ClosingBackend()
+    missing = {"type": "images", "path": str(tmp_path / "no_frames"), "pacing": "fast"}
+    with pytest.raises(FileNotFoundError):
+        make_controller(backend, frame_source=missing)
+
+    # The camera failed, but the model and the slide cache prefetch thread were still released
+    assert backend.closed
+    assert len(caches) == 1 and not caches[0]._thread.is_alive()
@@ -0,0 +1,70 @@
+import types
+
+import numpy as np
+
+from hand_backends import TasksHandLandmarker
+
+
+class FakeLandmarker:
+    def detect_for_video(self, image, timestamp):
+        return types.SimpleNamespace(hand_landmarks=[], handedness=[])
+
+    def close(self):
+        pass
+
+
+def test_video_mode_counts_every_frame(tmp_path, monkeypatch):
+    from mediapipe.tasks.python import vision
+
+    model = tmp_path / "hand_landmarker.task"
+    model.write_bytes(b"")
+    monkeypatch.setattr(vision.HandLandmarker, "create_from_options", lambda options: FakeLandmarker())
+    backend = TasksHandLandmarker(str(model), running_mode="video")
+
+    img = np.zeros((48, 64, 3), np.uint8)
+    for _ in range(3):
+        hands, out = backend.findHands(img)
+        assert hands == [] and out is img
+
+    stats = backend.stats()
+    assert (stats["submitted"], stats["results"], stats["dropped"]) == (3, 3, 0)
+
+
+class AsyncLandmarker:
+    def __init__(self):
+        self.pending = []
+
+    def detect_async(self, image, timestamp):
+        self.pending.append((image, timestamp))
+
+    def close(self):
+        pass
+
+
+def landmarker_result():
+    landmarks = [types.SimpleNamespace(x=0.25, y=0.5, z=0.0) for _ in range(21)]
+    return types.SimpleNamespace(hand_landmarks=[landmarks],
+                                 handedness=[[types.SimpleNamespace(category_name="Right")]])
+
+
+def test_live_stream_hands_carry_their_frame_time(tmp_path, monkeypatch):
+    from mediapipe.tasks.python import vision
+
+    model = tmp_path / "hand_landmarker.task"
+    model.write_bytes(b"")
+    landmarker = AsyncLandmarker()
+    monkeypatch.setattr(vision.HandLandmarker, "create_from_options", lambda options: landmarker)
+    backend = TasksHandLandmarker(str(model), running_mode="live_stream")
+
+    img = np.zeros((48, 64, 3), np.uint8)
+    backend.findHands(img)
+    image, first = landmarker.pending[0]
+    submitted_at = backend._submitted[first]
+    backend.findHands(img)
+    backend._on_result(landmarker_result(), image, first)
+
+    # The third frame gets the first frame's result, timed from when that frame was submitted
+    hands, _ = backend.findHands(img)
+    assert len(hands) == 1
+    assert hands[0]["timestamp"] == submitted_at
+    assert hands[0]["lmList"][0][:2] == [48, 24]
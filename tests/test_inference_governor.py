@@ -0,0 +1,67 @@
+import threading
+import time
+
+import numpy as np
+
+from inference_governor import InferenceGovernor
+
+
+class CountingDetector:
+    def findHands(self, img, draw=True, flipType=True):
+        return [{"center": (0, 0)}], img
+
+
+def test_rate_counts_recent_detections():
+    governor = InferenceGovernor(CountingDetector())
+    img = np.zeros((36, 64, 3), np.uint8)
+    for _ in range(10):
+        governor.findHands(img, draw=False)
+    assert governor.rate == 10 / InferenceGovernor.RATE_WINDOW
+    assert len(governor._detections) == 10
+
+
+def test_rate_can_be_read_while_detecting():
+    governor = InferenceGovernor(CountingDetector())
+    img = np.zeros((36, 64, 3), np.uint8)
+    errors = []
+    stop = time.perf_counter() + 0.5
+
+    def detect():
+        try:
+            while time.perf_counter() < stop:
+                governor.findHands(img, draw=False)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=detect)
+    thread.start()
+    while thread.is_alive():
+        governor.rate
+    thread.join()
+    assert errors == []
+    assert governor.rate > 0
+
+
+def test_reused_hands_keep_their_detection_time():
+    governor = InferenceGovernor(CountingDetector(), max_rate=0.5)
+    img = np.zeros((36, 64, 3), np.uint8)
+    first, _ = governor.findHands(img, draw=False)
+    reused, _ = governor.findHands(img, draw=False)
+    assert reused is first
+    assert reused[0]["timestamp"] < time.perf_counter()
+    assert governor._counts["reused"] == 1
+
+
+def test_reused_hands_are_drawn_like_fresh_ones():
+    from hand_backends import draw_hands
+
+    class BoxDetector:
+        def findHands(self, img, draw=True, flipType=True):
+            return [{"bbox": (20, 10, 16, 12), "lmList": [[28, 16, 0]], "center": (28, 16)}], img
+
+    governor = InferenceGovernor(BoxDetector(), max_rate=0.5)
+    governor.findHands(np.zeros((60, 80, 3), np.uint8), draw=False)
+    reused, img = governor.findHands(np.zeros((60, 80, 3), np.uint8), draw=True)
+    expected = np.zeros((60, 80, 3), np.uint8)
+    draw_hands(expected, reused)
+    assert img.any() and np.array_equal(img, expected)